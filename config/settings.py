@@ -1,5 +1,142 @@
+import os
+
 # Global config vars
 API_KEY = ''
 DB_PATH = "sqlite:///D:/Python Practice/IndexIQ/db/IndexIQ.db"
 # config/settings.py
 
+
+# Process-wide quote cache (core/quote_cache.py)
+QUOTE_CACHE_TTL = 5  # seconds before a live quote is served stale
+QUOTE_CACHE_MAX_ENTRIES = 5000
+HISTORY_CACHE_TTL = {  # seconds, keyed by bar interval
+    "1m": 30,
+    "5m": 60,
+    "1h": 300,
+    "1d": 900,
+    "default": 300,
+}
+FUNDAMENTALS_CACHE_TTL = 6 * 3600  # seconds, fundamentals change at most daily
+
+# Background market data poller (core/market_poller.py)
+MARKET_POLL_INTERVAL = 5  # seconds between upstream refreshes
+MARKET_SUBSCRIPTION_TTL = 120  # seconds a symbol stays tracked after a page last asked for it
+
+# Market data providers (core/providers.py)
+MARKET_DATA_PROVIDER = "mock"  # "mock", "yfinance" or "angelone"
+MARKET_TIMEZONE = "Asia/Kolkata"
+PROVIDER_MAX_CONCURRENCY = {  # concurrent upstream requests per backend
+    "mock": 200,
+    "yfinance": 8,
+    "angelone": 10,
+}
+MOCK_PROVIDER_LATENCY = 0.1  # seconds of simulated latency per mock request
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE = 20
+HTTP_TIMEOUT = 10  # seconds
+ANGEL_API_KEY = API_KEY
+ANGEL_JWT_TOKEN = ''
+ANGEL_EXCHANGE = "NSE"
+ANGEL_INSTRUMENT_CSV_URL = "https://github.com/angel-one/smartapi-python/raw/main/instrument_files/NSE.csv"
+
+# Local data files (bar store, snapshots, news)
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Columnar OHLCV bar store (core/bar_store.py)
+BAR_STORE_DIR = os.path.join(DATA_DIR, "bars")
+BAR_STORE_MIN_CAPACITY = 1024  # rows preallocated per file for in-place appends
+
+# Instrument master (core/instruments.py)
+INSTRUMENT_CSV_PATH = os.path.join(DATA_DIR, "instruments", "NSE.csv")  # used instead of the download when present
+INSTRUMENT_INDEX_PATH = os.path.join(DATA_DIR, "instruments", "NSE.idx.npz")
+
+# Live tick -> OHLCV aggregation (core/bar_aggregator.py)
+LIVE_BAR_INTERVALS = ("1m", "5m", "15m", "1h")
+MARKET_SESSION_OPEN = "09:15"  # intraday bars are aligned to the session open (NSE)
+MARKET_SESSION_CLOSE = "15:30"  # ticks outside the session (or on weekends) make no bars
+LIVE_BAR_STORE_SUFFIX = "-live"  # finished live bars go to their own store, e.g. data/bars/yfinance-live
+
+# Screener (core/screener.py)
+SCREENER_HISTORY_PERIOD = "1y"  # daily bars loaded per symbol
+SCREENER_HISTORY_BARS = 260  # columns in the aligned universe arrays
+# Sharding has not yet been measured faster than one process; raise only once
+# experiment/bench_parallel_scan.py shows a speedup on the host
+SCREENER_SCAN_WORKERS = 0  # processes a full scan is sharded across (capped at the CPU count); 0 or 1 scans in-process
+
+# End-of-day screener snapshot (core/screener_snapshot.py)
+SCREENER_SNAPSHOT_PATH = os.path.join(DATA_DIR, "snapshots", "screener.arrow")
+SCREENER_SNAPSHOT_POLL_INTERVAL = 30  # seconds between checks for a newer snapshot file
+
+# Price forecasting (core/predictions.py)
+FORECAST_MODEL = "holt"  # default model, a key of core.predictions.MODELS
+FORECAST_HISTORY_PERIOD = "2y"  # daily bars a model is fitted on
+FORECAST_HISTORY_BARS = 600  # columns in batch forecast panels, enough to hold FORECAST_HISTORY_PERIOD
+FORECAST_HORIZON = 10  # trading days forecast
+FORECAST_REFIT_BARS = 20  # new bars a warm start absorbs before parameters are re-estimated
+FORECAST_WORKERS = 2  # background fitting threads
+FORECAST_CACHE_MAX_ENTRIES = 500  # fitted models (and forecasts) kept per engine
+FORECAST_POLL_INTERVAL = 2  # seconds between checks for a finished refit on the Predictions page
+
+# Dashboard (pages/1_Dashboard.py)
+DASHBOARD_WATCHLIST = [  # symbols with forecast tiles
+    "RELIANCE", "TCS", "INFY", "HDFCBANK", "ICICIBANK", "SBIN", "ITC", "HINDUNILVR", "BHARTIARTL",
+]
+DASHBOARD_NEWS_ITEMS = 3  # latest stories listed
+
+# Forecast model backtests (core/backtest.py)
+BACKTEST_RESULTS_PATH = os.path.join(DATA_DIR, "backtests", "forecast_models.csv")
+BACKTEST_STEP_BARS = 5  # bars between walk-forward forecast origins
+BACKTEST_MIN_TRAIN_BARS = 120  # bars before the first origin
+
+# Fitted forecast model files (core/model_store.py)
+MODEL_STORE_DIR = os.path.join(DATA_DIR, "models")
+MODEL_STORE_MAX_RESIDENT = 200  # models kept mapped per process
+
+# News ingestion (core/news.py)
+NEWS_STORE_PATH = os.path.join(DATA_DIR, "news", "articles.jsonl")
+NEWS_FIXTURE_DIR = os.path.join(os.path.dirname(DATA_DIR), "fixtures", "news")
+NEWS_FEEDS = [  # {"type": "fixture", "path": ...} for offline runs, {"type": "rss", "url": ..., "source": ...} live
+    {"type": "fixture", "path": NEWS_FIXTURE_DIR},
+]
+NEWS_POLL_INTERVAL = 300  # seconds between feed polls
+NEWS_BATCH_SIZE = 100  # items stored (and handed to listeners) per batch while a feed streams
+NEWS_DUPLICATE_THRESHOLD = 0.7  # estimated Jaccard similarity of two articles' words above which one is a copy
+NEWS_DUPLICATE_WINDOW = "2D"  # only articles published this close together can be copies
+NEWS_SYMBOL_ALIASES = {  # company names in headlines -> symbol
+    "reliance": "RELIANCE", "jio": "RELIANCE",
+    "tata consultancy": "TCS", "infosys": "INFY",
+    "hdfc bank": "HDFCBANK", "icici bank": "ICICIBANK",
+    "state bank of india": "SBIN", "sbi": "SBIN",
+    "hindustan unilever": "HINDUNILVR", "hul": "HINDUNILVR",
+    "bharti airtel": "BHARTIARTL", "airtel": "BHARTIARTL",
+    "kotak": "KOTAKBANK",
+    "nifty": "NIFTY50", "sensex": "SENSEX",
+}
+NEWS_PAGE_SIZE = 50  # stories listed on the News page
+NEWS_PAGE_REFRESH_INTERVAL = 30  # seconds between News page re-reads of the store
+
+# News search (core/news.py)
+NEWS_BM25_K1 = 1.2  # term-frequency saturation
+NEWS_BM25_B = 0.75  # document-length normalisation
+NEWS_TITLE_WEIGHT = 2  # a title word counts this many times a summary word
+NEWS_INDEX_COMPACT_EVERY = 5000  # newly indexed articles buffered before their postings are packed
+NEWS_INDEX_SNAPSHOT_EVERY = 5000  # newly indexed articles before the index snapshot next to the log is rewritten
+
+# News sentiment scoring (core/sentiment.py)
+SENTIMENT_CACHE_MAX_ENTRIES = 200_000  # scored texts remembered by content hash
+SENTIMENT_HALF_LIFE = "12h"  # age at which an article counts half as much in the aggregates
+SENTIMENT_NEUTRAL_BAND = 0.05  # scores within +/- this are neutral
+SENTIMENT_NEGATION_SCOPE = 3  # words after "not", "no", ... whose polarity is flipped
+
+# Trending keywords (core/trending.py)
+TRENDING_WINDOWS = {"hour": "1h", "day": "1D"}  # horizon name -> decay time constant
+TRENDING_SKETCH_WIDTH = 2048  # counters per count-min row
+TRENDING_SKETCH_DEPTH = 4  # count-min rows (independent hashes)
+TRENDING_TOP_K = 50  # terms tracked per horizon
+
+# Sentiment time-series rollups (core/rollups.py)
+SENTIMENT_ROLLUP_TIERS = (  # (bucket width, retention) finest first; None keeps a tier forever
+    ("1min", "2D"),
+    ("1h", "90D"),
+    ("1D", None),
+)
@@ -1,33 +1,33 @@
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-def get_live_price(symbol):
+# Shared pool so batched quote requests reuse threads across reruns
+_quote_executor = ThreadPoolExecutor(max_workers=64, thread_name_prefix="angel-quote")
+
+# Mock price data based on symbol
+BASE_PRICES = {
+    'RELIANCE': 2500.00,
+    'TCS': 3200.00,
+    'INFY': 1450.00,
+    'HDFCBANK': 1650.00,
+    'ICICIBANK': 950.00,
+    'SBIN': 580.00,
+    'ITC': 420.00,
+    'HINDUNILVR': 2300.00,
+    'BHARTIARTL': 850.00,
+    'KOTAKBANK': 1800.00,
+    'NIFTY50': 19500.00,
+    'SENSEX': 65000.00
+}
+
+def build_mock_quote(symbol):
     """
-    Dummy function to get live price for a stock symbol
-    Returns mock price data
+    Build a mock quote dict for a symbol without any simulated latency
     """
-    # Simulate some processing time
-    time.sleep(0.1)
-    
-    # Mock price data based on symbol
-    base_prices = {
-        'RELIANCE': 2500.00,
-        'TCS': 3200.00,
-        'INFY': 1450.00,
-        'HDFCBANK': 1650.00,
-        'ICICIBANK': 950.00,
-        'SBIN': 580.00,
-        'ITC': 420.00,
-        'HINDUNILVR': 2300.00,
-        'BHARTIARTL': 850.00,
-        'KOTAKBANK': 1800.00,
-        'NIFTY50': 19500.00,
-        'SENSEX': 65000.00
-    }
-    
     # Get base price or use a random price if symbol not found
-    base_price = base_prices.get(symbol.upper(), random.uniform(100, 3000))
+    base_price = BASE_PRICES.get(symbol.upper(), random.uniform(100, 3000))
     
     # Add some random fluctuation (+/- 2%)
     fluctuation = random.uniform(-0.02, 0.02)
@@ -40,20 +40,49 @@ def get_live_price(symbol):
     return {
         'symbol': symbol.upper(),
         'price': round(current_price, 2),
+        'open': round(base_price, 2),
+        'previous_close': round(base_price, 2),
         'change': round(change, 2),
         'change_percent': round(change_percent, 2),
         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     }
 
+def get_live_price(symbol):
+    """
+    Dummy function to get live price for a stock symbol
+    Returns mock price data
+    """
+    # Simulate some processing time
+    time.sleep(0.1)
+    return build_mock_quote(symbol)
+
+def get_live_prices(symbols):
+    """
+    Fetch live prices for a list of symbols in one batched, concurrent call
+
+    Args:
+        symbols (Iterable[str]): Stock symbols, duplicates are fetched once
+
+    Returns:
+        dict: Quote dicts (same shape as get_live_price) keyed by upper-case symbol
+    """
+    unique_symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+    if not unique_symbols:
+        return {}
+
+    quotes = _quote_executor.map(get_live_price, unique_symbols)
+    return dict(zip(unique_symbols, quotes))
+
 def get_portfolio_data():
     """
     Dummy function to get portfolio data
     """
     stocks = ['RELIANCE', 'TCS', 'INFY', 'HDFCBANK', 'ICICIBANK']
     portfolio = []
+    prices = get_live_prices(stocks)
     
     for stock in stocks:
-        price_data = get_live_price(stock)
+        price_data = prices[stock]
         portfolio.append({
             'symbol': stock,
             'quantity': random.randint(10, 100),
@@ -69,10 +98,7 @@ def get_market_data():
     """
     Dummy function to get market indices data
     """
-    return {
-        'NIFTY50': get_live_price('NIFTY50'),
-        'SENSEX': get_live_price('SENSEX')
-    }
+    return get_live_prices(['NIFTY50', 'SENSEX'])
 
 def authenticate():
     """
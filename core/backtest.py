@@ -0,0 +1,198 @@
+# core/backtest.py
+
+import argparse
+import multiprocessing
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from config.settings import (
+    BACKTEST_MIN_TRAIN_BARS,
+    BACKTEST_RESULTS_PATH,
+    BACKTEST_STEP_BARS,
+    DASHBOARD_WATCHLIST,
+    FORECAST_HISTORY_PERIOD,
+    FORECAST_HORIZON,
+)
+from core.fetch_planner import get_bars_many
+from core.predictions import MODELS
+
+RESULT_COLUMNS = [
+    "run_at", "model", "symbols", "origins", "horizon", "warm_start",
+    "mae", "mape_pct", "hit_rate", "hit_rate_1d",
+    "fit_ms_mean", "fit_ms_p95", "predict_ms_mean", "peak_mem_mb",
+]
+
+
+def walk_forward(model_name, series, horizon, step, min_train, warm_start=True):
+    """
+    Walk one model forward over several symbols' histories
+
+    At every origin (min_train, min_train + step, ... bars) the model is fitted
+    on the bars up to the origin, warm-started from the previous origin's fit
+    like the forecast engine does, and its forecast is scored against the
+    next `horizon` closes.
+
+    Args:
+        model_name (str): Key of core.predictions.MODELS
+        series (list[tuple]): (symbol, ts int64 array, closes float64 array)
+
+    Returns:
+        dict: Error sums and counts plus raw fit/predict timings, to be merged with others
+    """
+    model_class = MODELS[model_name]
+    abs_errors, pct_errors, hits, hits_1d, fit_ms, predict_ms = [], [], [], [], [], []
+    for _, ts, closes in series:
+        warm = None
+        for origin in range(max(min_train, model_class.min_bars), len(closes) - horizon + 1, step):
+            started = time.perf_counter()
+            model = model_class().fit(ts[:origin], closes[:origin], warm=warm if warm_start else None)
+            fitted = time.perf_counter()
+            mean, _, _ = model.forecast(horizon)
+            fit_ms.append((fitted - started) * 1000)
+            predict_ms.append((time.perf_counter() - fitted) * 1000)
+            warm = model
+
+            actual = closes[origin:origin + horizon]
+            last = closes[origin - 1]
+            abs_errors.append(np.abs(mean - actual))
+            pct_errors.append(np.abs(mean - actual) / actual * 100)
+            hits.append(np.sign(mean[-1] - last) == np.sign(actual[-1] - last))
+            hits_1d.append(np.sign(mean[0] - last) == np.sign(actual[0] - last))
+    return {
+        "symbols": len(series),
+        "origins": len(hits),
+        "abs_error": float(np.sum(abs_errors)),
+        "pct_error": float(np.sum(pct_errors)),
+        "errors": int(np.size(abs_errors)),
+        "hits": int(np.sum(hits)),
+        "hits_1d": int(np.sum(hits_1d)),
+        "fit_ms": fit_ms,
+        "predict_ms": predict_ms,
+    }
+
+
+def _run_shard(model_name, series, horizon, step, min_train, warm_start):
+    """
+    Worker: one model over one shard of symbols
+
+    Timings come from an untraced run. Peak memory is measured separately by
+    replaying the shard's first symbol under tracemalloc (numpy reports its
+    buffers to it), since tracing would slow the timed run.
+    """
+    result = walk_forward(model_name, series, horizon, step, min_train, warm_start)
+    tracemalloc.start()
+    try:
+        walk_forward(model_name, series[:1], horizon, step, min_train, warm_start)
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+def _summarize(model_name, parts, horizon, warm_start, run_at):
+    fit_ms = np.concatenate([part["fit_ms"] for part in parts])
+    predict_ms = np.concatenate([part["predict_ms"] for part in parts])
+    errors = sum(part["errors"] for part in parts)
+    origins = sum(part["origins"] for part in parts)
+    return {
+        "run_at": run_at,
+        "model": model_name,
+        "symbols": sum(part["symbols"] for part in parts),
+        "origins": origins,
+        "horizon": horizon,
+        "warm_start": warm_start,
+        "mae": sum(part["abs_error"] for part in parts) / errors if errors else np.nan,
+        "mape_pct": sum(part["pct_error"] for part in parts) / errors if errors else np.nan,
+        "hit_rate": sum(part["hits"] for part in parts) / origins if origins else np.nan,
+        "hit_rate_1d": sum(part["hits_1d"] for part in parts) / origins if origins else np.nan,
+        "fit_ms_mean": fit_ms.mean() if len(fit_ms) else np.nan,
+        "fit_ms_p95": np.percentile(fit_ms, 95) if len(fit_ms) else np.nan,
+        "predict_ms_mean": predict_ms.mean() if len(predict_ms) else np.nan,
+        "peak_mem_mb": max((part["peak_bytes"] for part in parts), default=np.nan) / 2 ** 20,
+    }
+
+
+def run_backtest(symbols, models=None, provider=None, period=FORECAST_HISTORY_PERIOD, horizon=FORECAST_HORIZON,
+                 step=BACKTEST_STEP_BARS, min_train=BACKTEST_MIN_TRAIN_BARS, workers=None, warm_start=True):
+    """
+    Walk-forward evaluation of forecast models in parallel worker processes
+
+    Each model's symbols are split into `workers` shards and every
+    (model, shard) is a task for a pool of spawned processes. Shard results
+    are merged in submission order, so the table does not depend on which
+    worker finishes first.
+
+    Returns:
+        pd.DataFrame: One row per model, columns RESULT_COLUMNS
+
+    Raises:
+        ValueError: If no symbol has min_train + horizon bars in the period
+    """
+    models = list(models or MODELS)
+    workers = workers or os.cpu_count() or 1
+    frames = get_bars_many(list(dict.fromkeys(symbols)), period=period, interval="1d", provider=provider)
+    series = [
+        (symbol, df.index.asi8, df["Close"].to_numpy(dtype=np.float64))
+        for symbol, df in frames.items()
+        if df is not None and len(df) >= min_train + horizon
+    ]
+    if not series:
+        raise ValueError(
+            f"No symbol has enough history: a backtest needs {min_train + horizon} daily bars "
+            f"(--min-train {min_train} + --horizon {horizon}), try a longer --period than {period!r}"
+        )
+    shards = [shard for shard in (series[i::workers] for i in range(workers)) if shard]
+    run_at = pd.Timestamp.now(tz="UTC").floor("s").isoformat()
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        futures = {
+            model: [pool.submit(_run_shard, model, shard, horizon, step, min_train, warm_start) for shard in shards]
+            for model in models
+        }
+        rows = [_summarize(model, [future.result() for future in futures[model]], horizon, warm_start, run_at) for model in models]
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+
+def append_results(table, path=BACKTEST_RESULTS_PATH):
+    """Append a run to the CSV history (one row per model per run)"""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    table.to_csv(path, mode="a", header=not os.path.exists(path), index=False, float_format="%.6g")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the forecast models")
+    parser.add_argument("--models", nargs="*", default=list(MODELS), choices=list(MODELS))
+    parser.add_argument("--symbols", nargs="*", default=DASHBOARD_WATCHLIST)
+    parser.add_argument("--provider", default=None, help="market data backend (default: MARKET_DATA_PROVIDER)")
+    parser.add_argument("--period", default=FORECAST_HISTORY_PERIOD)
+    parser.add_argument("--horizon", type=int, default=FORECAST_HORIZON)
+    parser.add_argument("--step", type=int, default=BACKTEST_STEP_BARS, help="bars between forecast origins")
+    parser.add_argument("--min-train", type=int, default=BACKTEST_MIN_TRAIN_BARS)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--cold", action="store_true", help="refit from scratch at every origin")
+    parser.add_argument("--output", default=BACKTEST_RESULTS_PATH, help="CSV the results are appended to")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        table = run_backtest(
+            args.symbols, args.models, provider=args.provider, period=args.period, horizon=args.horizon,
+            step=args.step, min_train=args.min_train, workers=args.workers, warm_start=not args.cold,
+        )
+    except ValueError as e:
+        parser.exit(1, f"error: {e}\n")
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(table.drop(columns=["run_at"]).to_string(index=False, float_format=lambda value: f"{value:.4g}"))
+    print(f"\nappended to {append_results(table, args.output)} ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
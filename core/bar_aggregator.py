@@ -0,0 +1,293 @@
+# core/bar_aggregator.py
+
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from config.settings import (
+    LIVE_BAR_INTERVALS,
+    LIVE_BAR_STORE_SUFFIX,
+    MARKET_DATA_PROVIDER,
+    MARKET_SESSION_CLOSE,
+    MARKET_SESSION_OPEN,
+    MARKET_TIMEZONE,
+)
+from core.bar_store import COLUMN_DTYPES, COLUMNS, columns_to_frame, get_bar_store, to_ns
+from core.market_poller import get_market_poller
+from core.providers import INTERVAL_SECONDS
+
+# A partial bar is a plain list, updated in place on every tick; COMPLETE says
+# whether the symbol was already being watched when the bar's bucket began
+BUCKET, OPEN, HIGH, LOW, CLOSE, VOLUME, LAST_TICK, COMPLETE = range(8)
+DAY_NS = 86_400 * 1_000_000_000
+
+# Bars are aligned to the session open in market time (09:15, 09:20, ... for 5m;
+# 09:15, 10:15, ... for 1h), the same buckets Yahoo and Angel One use
+SESSION_ORIGIN_NS = to_ns(pd.Timestamp(f"1970-01-01 {MARKET_SESSION_OPEN}", tz=MARKET_TIMEZONE))
+SESSION_LENGTH_NS = int((pd.Timedelta(f"{MARKET_SESSION_CLOSE}:00") - pd.Timedelta(f"{MARKET_SESSION_OPEN}:00")).value)
+
+
+def bucket_start(ts_ns, step_ns):
+    """Start (epoch ns) of the bar that contains ts_ns"""
+    return ts_ns - (ts_ns - SESSION_ORIGIN_NS) % step_ns
+
+def in_session(ts_ns):
+    """Whether ts_ns falls inside a weekday session (holidays are not known here)"""
+    since_open = ts_ns - SESSION_ORIGIN_NS
+    day, offset = divmod(since_open, DAY_NS)
+    return offset < SESSION_LENGTH_NS and (day + 3) % 7 < 5  # day 0 is Thursday 1970-01-01
+
+def tick_ns(value):
+    """
+    Quote timestamp -> epoch ns
+
+    Quotes are stamped with the server's naive local time (datetime.now()),
+    so naive values are read in the server's timezone, not the market's.
+    """
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize(datetime.now().astimezone().tzinfo)
+    return int(ts.value)
+
+def bars_to_frame(bars):
+    """Bar lists -> OHLCV DataFrame in yfinance layout"""
+    columns = {
+        name: np.fromiter((bar[position] for bar in bars), dtype=COLUMN_DTYPES[name], count=len(bars))
+        for position, name in enumerate(COLUMNS)
+    }
+    return columns_to_frame(columns)
+
+
+class BarAggregator:
+    """
+    Rolls live ticks into OHLCV bars for several intervals at once
+
+    Only the bar currently being built is kept per (symbol, interval), so a tick
+    costs a handful of comparisons per interval and memory is bounded by the
+    number of live symbols. When a tick lands in a later bucket the previous bar
+    is finished and handed to `sink`; the bar in progress can be read at any
+    time with partial_bar().
+
+    Only in-session ticks make bars, and only complete bars reach the sink: a
+    bar whose bucket began before the symbol's previous tick, or more than
+    one bar width after it, is missing its opening trades.
+    """
+
+    def __init__(self, intervals=LIVE_BAR_INTERVALS, sink=None):
+        self.intervals = tuple(intervals)
+        self._steps = [INTERVAL_SECONDS[interval] * 1_000_000_000 for interval in self.intervals]
+        self.sink = sink
+        self._bars = {}
+        self._previous_tick = {}  # symbol -> time of its latest tick, in session or not
+        self._lock = threading.Lock()
+        self._last_timestamp = (None, None)
+        self._counters = {
+            "ticks": 0, "off_session_ticks": 0, "late_ticks": 0,
+            "bars_finished": 0, "incomplete_bars": 0, "sink_errors": 0,
+        }
+
+    def _tick_ns(self, value):
+        # Every quote in one poll carries the same timestamp string, parse it once
+        text, ns = self._last_timestamp
+        if value != text:
+            ns = tick_ns(value)
+            self._last_timestamp = (value, ns)
+        return ns
+
+    def on_tick(self, tick):
+        """
+        Fold one tick into every interval
+
+        Args:
+            tick (dict): Quote shaped like get_live_price output (symbol, price,
+                timestamp); an optional "volume" is the quantity traded in this tick
+
+        Returns:
+            list[tuple]: (symbol, interval, bar) for bars this tick finished
+        """
+        symbol = tick["symbol"].upper()
+        price = float(tick["price"])
+        volume = float(tick.get("volume") or 0.0)
+        timestamp = tick.get("timestamp")
+        ts_ns = self._tick_ns(timestamp) if timestamp is not None else time.time_ns()
+
+        finished = []
+        with self._lock:
+            self._counters["ticks"] += 1
+            previous_ns = self._previous_tick.get(symbol)
+            if previous_ns is None or ts_ns > previous_ns:
+                self._previous_tick[symbol] = ts_ns
+            if not in_session(ts_ns):
+                self._counters["off_session_ticks"] += 1
+                return finished
+            bars = self._bars.get(symbol)
+            if bars is None:
+                bars = self._bars[symbol] = [None] * len(self.intervals)
+
+            for position, step in enumerate(self._steps):
+                bucket = bucket_start(ts_ns, step)
+                bar = bars[position]
+                if bar is None or bucket > bar[BUCKET]:
+                    if bar is not None:
+                        finished.append((symbol, self.intervals[position], bar))
+                    complete = previous_ns is not None and bucket - step <= previous_ns < bucket
+                    bars[position] = [bucket, price, price, price, price, volume, ts_ns, complete]
+                elif bucket == bar[BUCKET]:
+                    if price > bar[HIGH]:
+                        bar[HIGH] = price
+                    if price < bar[LOW]:
+                        bar[LOW] = price
+                    if ts_ns >= bar[LAST_TICK]:
+                        bar[CLOSE] = price
+                        bar[LAST_TICK] = ts_ns
+                    bar[VOLUME] += volume
+                else:
+                    # The bar this tick belongs to has already been emitted
+                    self._counters["late_ticks"] += 1
+            self._counters["bars_finished"] += len(finished)
+
+        self._emit(finished)
+        return finished
+
+    def on_ticks(self, quotes):
+        """Fold a batch of quotes (a dict keyed by symbol, or a list) in order"""
+        finished = []
+        for tick in (quotes.values() if isinstance(quotes, dict) else quotes):
+            finished.extend(self.on_tick(tick))
+        return finished
+
+    def on_poll(self, quotes):
+        """Poller listener: fold the published quotes, then finish bars that went quiet"""
+        return self.on_ticks(quotes) + self.close_expired()
+
+    def close_expired(self, now=None):
+        """
+        Finish bars whose time window has passed without a newer tick
+
+        Symbols with no bar left in progress are forgotten, so idle symbols
+        do not hold memory.
+        """
+        now_ns = tick_ns(now) if now is not None else time.time_ns()
+        finished = []
+        with self._lock:
+            for symbol in list(self._bars):
+                bars = self._bars[symbol]
+                for position, step in enumerate(self._steps):
+                    bar = bars[position]
+                    if bar is not None and bar[BUCKET] + step <= now_ns:
+                        finished.append((symbol, self.intervals[position], bar))
+                        bars[position] = None
+                if all(bar is None for bar in bars):
+                    del self._bars[symbol]
+            self._counters["bars_finished"] += len(finished)
+
+        self._emit(finished)
+        return finished
+
+    def _emit(self, finished):
+        if not finished or self.sink is None:
+            return
+        grouped = {}
+        for symbol, interval, bar in finished:
+            if bar[COMPLETE]:
+                grouped.setdefault((symbol, interval), []).append(bar)
+        if len(finished) > sum(map(len, grouped.values())):
+            with self._lock:
+                self._counters["incomplete_bars"] += len(finished) - sum(map(len, grouped.values()))
+        for (symbol, interval), bars in grouped.items():
+            try:
+                self.sink(symbol, interval, bars_to_frame(bars))
+            except Exception:
+                with self._lock:
+                    self._counters["sink_errors"] += 1
+
+    def partial_bar(self, symbol, interval):
+        """
+        Bar currently being built for a symbol, or None
+
+        Returns:
+            dict: start (tz-aware Timestamp) and open/high/low/close/volume
+        """
+        position = self.intervals.index(interval) if interval in self.intervals else None
+        if position is None:
+            return None
+        with self._lock:
+            bars = self._bars.get(symbol.upper())
+            bar = None if bars is None or bars[position] is None else list(bars[position])
+        if bar is None:
+            return None
+        return {
+            "start": pd.Timestamp(bar[BUCKET], tz="UTC").tz_convert(MARKET_TIMEZONE),
+            "open": bar[OPEN],
+            "high": bar[HIGH],
+            "low": bar[LOW],
+            "close": bar[CLOSE],
+            "volume": bar[VOLUME],
+        }
+
+    def with_partial_bar(self, df, symbol, interval):
+        """
+        Finished bars plus the bar in progress, ready for create_candlestick_chart
+
+        The partial bar replaces a stored bar with the same start time, which
+        happens when the provider already returned the current bar.
+        """
+        with self._lock:
+            bars = self._bars.get(symbol.upper())
+            bar = None
+            if bars is not None and interval in self.intervals:
+                bar = bars[self.intervals.index(interval)]
+                bar = None if bar is None else list(bar)
+        if bar is None:
+            return df
+        live = bars_to_frame([bar])
+        if df is None or df.empty:
+            return live
+        return pd.concat([df[df.index < live.index[0]], live])
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, live_symbols=len(self._bars))
+
+
+def store_sink(provider=None):
+    """
+    Sink that appends finished bars to a provider's live bar store
+
+    Live bars are built from sampled quotes, so they are kept apart from the
+    provider's own bars (which the fetch planner treats as authoritative)
+    and never overwrite them.
+    """
+    store = get_bar_store((provider or MARKET_DATA_PROVIDER) + LIVE_BAR_STORE_SUFFIX)
+    return lambda symbol, interval, df: store.append(symbol, interval, df)
+
+
+# Create singleton instances, one aggregator per poller feed
+FEED_PROVIDERS = {
+    "quotes": MARKET_DATA_PROVIDER,
+    "yahoo": "yfinance",
+}
+_aggregators = {}
+_aggregators_lock = threading.Lock()
+
+def get_bar_aggregator(feed="quotes") -> BarAggregator:
+    """
+    Get or create the aggregator for a market poller feed
+
+    On first use it is attached to the poller, so every published quote on the
+    feed becomes a tick and finished bars land in that feed's live bar store.
+    """
+    aggregator = _aggregators.get(feed)
+    if aggregator is None:
+        with _aggregators_lock:
+            aggregator = _aggregators.get(feed)
+            if aggregator is None:
+                aggregator = BarAggregator(sink=store_sink(FEED_PROVIDERS[feed]))
+                get_market_poller().add_listener(feed, aggregator.on_poll)
+                _aggregators[feed] = aggregator
+    return aggregator
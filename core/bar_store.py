@@ -0,0 +1,307 @@
+# core/bar_store.py
+
+import os
+import threading
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+from config.settings import BAR_STORE_DIR, BAR_STORE_MIN_CAPACITY, MARKET_DATA_PROVIDER, MARKET_TIMEZONE
+from core.providers import OHLCV_COLUMNS
+
+# One file per (symbol, interval):
+#   64-byte header, then one contiguous block per column, each `capacity` long.
+# Rows past `rows` are slack for in-place appends; the file is only rewritten
+# when that slack runs out (capacity doubles) or bars arrive out of order.
+# The time ranges already fetched for a file live next to it in a small
+# "<file>.cov" array of [start, end] pairs (see RangeSet).
+HEADER_DTYPE = np.dtype([
+    ("magic", "S8"),
+    ("rows", "<i8"),
+    ("capacity", "<i8"),
+    ("reserved", "<i8", (5,)),
+])
+HEADER_SIZE = HEADER_DTYPE.itemsize
+MAGIC = b"IQBARS1"
+COLUMNS = ("ts", "open", "high", "low", "close", "volume")
+COLUMN_DTYPES = {name: np.dtype("<i8") if name == "ts" else np.dtype("<f8") for name in COLUMNS}
+FRAME_COLUMNS = dict(zip(COLUMNS[1:], OHLCV_COLUMNS))
+
+
+def to_ns(value):
+    """Timestamp-like -> int64 epoch nanoseconds (UTC); integers are taken as epoch ns already"""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize(MARKET_TIMEZONE)
+    return int(ts.value)
+
+def frame_to_columns(df):
+    """OHLCV DataFrame (yfinance layout) -> dict of sorted, de-duplicated column arrays"""
+    if df is None or df.empty:
+        return {name: np.empty(0, dtype=COLUMN_DTYPES[name]) for name in COLUMNS}
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is None:
+        index = index.tz_localize(MARKET_TIMEZONE)
+    columns = {"ts": index.asi8.astype("<i8")}
+    for name, frame_column in FRAME_COLUMNS.items():
+        columns[name] = df[frame_column].to_numpy(dtype="<f8")
+    return _sort_dedupe(columns)
+
+def _sort_dedupe(columns):
+    """Sort by ts and keep the last row for duplicate timestamps (later rows win)"""
+    ts = columns["ts"]
+    order = np.argsort(ts, kind="stable")
+    sorted_ts = ts[order]
+    keep = np.ones(len(sorted_ts), dtype=bool)
+    keep[:-1] = sorted_ts[1:] != sorted_ts[:-1]
+    selected = order[keep]
+    return {name: np.ascontiguousarray(values[selected]) for name, values in columns.items()}
+
+def columns_to_frame(columns):
+    """Column arrays -> OHLCV DataFrame without copying the price columns"""
+    index = pd.DatetimeIndex(columns["ts"].view("datetime64[ns]")).tz_localize("UTC").tz_convert(MARKET_TIMEZONE)
+    data = {frame_column: columns[name] for name, frame_column in FRAME_COLUMNS.items()}
+    return pd.DataFrame(data, index=index.rename("Date"), copy=False)
+
+
+class RangeSet:
+    """Sorted, disjoint, closed [start, end] int64 ranges (epoch ns)"""
+
+    def __init__(self, ranges=None):
+        self.ranges = [] if ranges is None else [(int(a), int(b)) for a, b in ranges]
+
+    def add(self, start, end):
+        """Insert a range, merging anything it overlaps or touches"""
+        merged = []
+        placed = False
+        for a, b in self.ranges:
+            if b < start:
+                merged.append((a, b))
+            elif a > end:
+                if not placed:
+                    merged.append((start, end))
+                    placed = True
+                merged.append((a, b))
+            else:
+                start, end = min(a, start), max(b, end)
+        if not placed:
+            merged.append((start, end))
+        self.ranges = merged
+
+    def missing(self, start, end):
+        """Sub-ranges of [start, end] not covered by the set"""
+        gaps = []
+        cursor = start
+        for a, b in self.ranges:
+            if b < cursor:
+                continue
+            if a > end:
+                break
+            if a > cursor:
+                gaps.append((cursor, a))
+            cursor = max(cursor, b)
+            if cursor >= end:
+                break
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def to_array(self):
+        return np.asarray(self.ranges, dtype="<i8").reshape(-1, 2)
+
+
+class BarStore:
+    """
+    On-disk OHLCV store, one columnar memory-mapped file per (symbol, interval)
+
+    Range reads binary-search the timestamp column and return slices of the
+    mapping, so they do not copy. One writer per file is assumed per process;
+    readers in other processes only ever see fully written rows because the
+    row count in the header is updated after the data.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._maps = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def path_for(self, symbol, interval):
+        return os.path.join(self.root, interval, f"{quote(symbol.upper(), safe='')}.bars")
+
+    def symbols(self, interval):
+        folder = os.path.join(self.root, interval)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(unquote(name[:-5]) for name in os.listdir(folder) if name.endswith(".bars"))
+
+    def _lock_for(self, path):
+        with self._locks_guard:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def _map(self, path):
+        """Read-only mapping of a file, reused until the file is replaced or grown"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        key = (stat.st_ino, stat.st_size)
+        cached = self._maps.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        mapping = np.memmap(path, dtype=np.uint8, mode="r")
+        self._maps[path] = (key, mapping)
+        return mapping
+
+    @staticmethod
+    def _header(mapping):
+        return mapping[:HEADER_SIZE].view(HEADER_DTYPE)[0]
+
+    @staticmethod
+    def _column(mapping, name, capacity):
+        offset = HEADER_SIZE + COLUMNS.index(name) * capacity * 8
+        return mapping[offset:offset + capacity * 8].view(COLUMN_DTYPES[name])
+
+    def _columns(self, mapping):
+        header = self._header(mapping)
+        rows, capacity = int(header["rows"]), int(header["capacity"])
+        return {name: self._column(mapping, name, capacity)[:rows] for name in COLUMNS}
+
+    def info(self, symbol, interval):
+        """Row count, first/last bar and coverage metadata for a file (None if absent)"""
+        mapping = self._map(self.path_for(symbol, interval))
+        if mapping is None:
+            return None
+        header = self._header(mapping)
+        ts = self._columns(mapping)["ts"]
+        return {
+            "rows": int(header["rows"]),
+            "capacity": int(header["capacity"]),
+            "first": int(ts[0]) if len(ts) else None,
+            "last": int(ts[-1]) if len(ts) else None,
+            "coverage": self.coverage(symbol, interval).ranges,
+        }
+
+    def coverage(self, symbol, interval):
+        """RangeSet of time ranges already fetched for a file"""
+        try:
+            return RangeSet(np.load(f"{self.path_for(symbol, interval)}.cov"))
+        except FileNotFoundError:
+            return RangeSet()
+
+    def _save_coverage(self, path, coverage):
+        tmp_path = f"{path}.cov.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, coverage.to_array())
+        os.replace(tmp_path, f"{path}.cov")
+
+    def read_arrays(self, symbol, interval, start=None, end=None):
+        """
+        Zero-copy range read
+
+        Returns:
+            dict: ts (int64 epoch ns) and open/high/low/close/volume arrays,
+            read-only views into the mapped file
+        """
+        mapping = self._map(self.path_for(symbol, interval))
+        if mapping is None:
+            return {name: np.empty(0, dtype=COLUMN_DTYPES[name]) for name in COLUMNS}
+        columns = self._columns(mapping)
+        ts = columns["ts"]
+        lo = np.searchsorted(ts, to_ns(start), side="left") if start is not None else 0
+        hi = np.searchsorted(ts, to_ns(end), side="right") if end is not None else len(ts)
+        return {name: values[lo:hi] for name, values in columns.items()}
+
+    def read_frame(self, symbol, interval, start=None, end=None):
+        """Range read as an OHLCV DataFrame backed by the mapped columns"""
+        return columns_to_frame(self.read_arrays(symbol, interval, start, end))
+
+    def write(self, symbol, interval, df, covered=None):
+        """
+        Merge bars into the store
+
+        Bars after the last stored bar (or replacing it) are appended in place;
+        anything else triggers a merged rewrite where incoming bars win.
+
+        Args:
+            df (pd.DataFrame): OHLCV bars in yfinance layout
+            covered (tuple | None): (start, end) the fetch that produced df was asked for,
+                recorded in the file's coverage once the bars are written
+        """
+        new = frame_to_columns(df)
+        path = self.path_for(symbol, interval)
+        with self._lock_for(path):
+            mapping = self._map(path)
+            header = self._header(mapping) if mapping is not None else None
+            existing = self._columns(mapping) if mapping is not None else None
+
+            if existing is None or len(existing["ts"]) == 0:
+                self._rewrite(path, new)
+            elif len(new["ts"]) == 0 or new["ts"][0] >= existing["ts"][-1]:
+                self._append(path, existing, new, int(header["capacity"]))
+            else:
+                merged = {name: np.concatenate([existing[name], new[name]]) for name in COLUMNS}
+                self._rewrite(path, _sort_dedupe(merged))
+
+            if covered is not None:
+                coverage = self.coverage(symbol, interval)
+                coverage.add(to_ns(covered[0]), to_ns(covered[1]))
+                self._save_coverage(path, coverage)
+
+    def append(self, symbol, interval, df):
+        """Append finished bars (e.g. from a live aggregator) without touching coverage"""
+        self.write(symbol, interval, df)
+
+    def _append(self, path, existing, new, capacity):
+        rows = len(existing["ts"])
+        overlap = 1 if len(new["ts"]) and new["ts"][0] == existing["ts"][-1] else 0
+        needed = rows - overlap + len(new["ts"])
+        if needed > capacity:
+            merged = {name: np.concatenate([existing[name][:rows - overlap], new[name]]) for name in COLUMNS}
+            self._rewrite(path, merged)
+            return
+
+        mapping = np.memmap(path, dtype=np.uint8, mode="r+")
+        start = rows - overlap
+        for name in COLUMNS:
+            self._column(mapping, name, capacity)[start:needed] = new[name]
+        mapping.flush()
+        mapping[:HEADER_SIZE].view(HEADER_DTYPE)["rows"] = needed
+        mapping.flush()
+        del mapping
+
+    def _rewrite(self, path, columns):
+        rows = len(columns["ts"])
+        capacity = max(BAR_STORE_MIN_CAPACITY, 2 * rows)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        mapping = np.memmap(tmp_path, dtype=np.uint8, mode="w+", shape=(HEADER_SIZE + len(COLUMNS) * capacity * 8,))
+        header = mapping[:HEADER_SIZE].view(HEADER_DTYPE)
+        header["magic"] = MAGIC
+        header["rows"] = rows
+        header["capacity"] = capacity
+        for name in COLUMNS:
+            self._column(mapping, name, capacity)[:rows] = columns[name]
+        mapping.flush()
+        del mapping
+        os.replace(tmp_path, path)
+        self._maps.pop(path, None)
+
+
+# Create singleton instances, one store per provider so feeds never mix
+_bar_stores = {}
+_bar_stores_lock = threading.Lock()
+
+def get_bar_store(provider=None) -> BarStore:
+    """Get or create the bar store for a provider (defaults to MARKET_DATA_PROVIDER)"""
+    provider = provider or MARKET_DATA_PROVIDER
+    store = _bar_stores.get(provider)
+    if store is None:
+        with _bar_stores_lock:
+            store = _bar_stores.get(provider)
+            if store is None:
+                store = _bar_stores[provider] = BarStore(os.path.join(BAR_STORE_DIR, provider))
+    return store
@@ -0,0 +1,189 @@
+# core/fetch_planner.py
+
+import asyncio
+import threading
+import time
+
+import pandas as pd
+
+from config.settings import HISTORY_CACHE_TTL, MARKET_DATA_PROVIDER, MARKET_TIMEZONE
+from core.bar_store import to_ns, get_bar_store
+from core.providers import INTERVAL_SECONDS, SESSION_PERIODS, get_async_runner, get_provider, period_to_range, sessions_start
+
+HOLIDAY_MARGIN_SESSIONS = 5  # extra weekdays read for session periods, so holidays do not shorten them
+
+
+def _from_ns(ns):
+    return pd.Timestamp(ns, tz="UTC").tz_convert(MARKET_TIMEZONE)
+
+def _last_sessions(df, sessions):
+    """Bars of the last `sessions` market days present in df"""
+    if df.empty:
+        return df
+    days = df.index.normalize()
+    keep = days.unique()[-sessions:]
+    return df[days >= keep[0]]
+
+def _align_start(ns, interval):
+    """Move a gap start back to the start of its bar so a partial bar is refetched whole"""
+    ts = _from_ns(ns)
+    if interval == "1d":
+        return ts.normalize().value
+    return ts.floor(f"{INTERVAL_SECONDS.get(interval, 60)}s").value
+
+
+class FetchPlanner:
+    """
+    Gap-fill fetching on top of a BarStore
+
+    Each (symbol, interval) file records which time ranges have already been
+    fetched. A request only goes upstream for the holes in that coverage and
+    for the tail since the last fetch, and the tail is skipped while it is
+    younger than HISTORY_CACHE_TTL[interval].
+
+    Only what a fetch actually returned counts as covered: from its first
+    bar to the end of its last one, or to the end of the request once that
+    is older than the TTL (so the tail is asked for again while it can
+    still grow). An empty answer, which is how yfinance reports throttling,
+    errors and delistings, covers nothing; its gap is retried once the TTL
+    has passed.
+    """
+
+    def __init__(self, store, provider_name):
+        self.store = store
+        self.provider_name = provider_name
+        self._lock = threading.Lock()
+        self._empty_until = {}  # (symbol, interval, gap start) -> monotonic time to retry an empty fetch
+        self._counters = {
+            "windows": 0,
+            "windows_from_store": 0,
+            "requests": 0,
+            "request_errors": 0,
+            "empty_results": 0,
+            "bars_fetched": 0,
+        }
+
+    def _ttl_ns(self, interval):
+        return HISTORY_CACHE_TTL.get(interval, HISTORY_CACHE_TTL["default"]) * 1_000_000_000
+
+    def plan(self, symbol, interval, start, end):
+        """
+        Ranges that still need fetching for a window
+
+        Returns:
+            list[tuple[int, int]]: (start, end) epoch-ns pairs, bar-aligned
+        """
+        start_ns, end_ns = to_ns(start), to_ns(end)
+        ttl_ns = self._ttl_ns(interval)
+        now = time.monotonic()
+        planned = []
+        for gap_start, gap_end in self.store.coverage(symbol, interval).missing(start_ns, end_ns):
+            is_recent_tail = gap_end == end_ns and gap_start > start_ns and gap_end - gap_start < ttl_ns
+            if is_recent_tail:
+                continue
+            gap_start = _align_start(gap_start, interval)
+            with self._lock:
+                if self._empty_until.get((symbol, interval, gap_start), 0) > now:
+                    continue
+            planned.append((gap_start, gap_end))
+        return planned
+
+    def _covered(self, df, interval, gap_end):
+        """Range a non-empty fetch result vouches for: its bars, or up to gap_end once that is past the TTL"""
+        index = df.index.asi8
+        if time.time_ns() - gap_end > self._ttl_ns(interval):
+            end = gap_end
+        else:
+            end = min(int(index[-1]) + INTERVAL_SECONDS.get(interval, 60) * 1_000_000_000, gap_end)
+        return _from_ns(int(index[0])), _from_ns(end)
+
+    def fill(self, symbols, interval, start, end):
+        """Fetch every planned gap for symbols concurrently and merge it into the store"""
+        tasks = [
+            (symbol, gap_start, gap_end)
+            for symbol in dict.fromkeys(symbols)
+            for gap_start, gap_end in self.plan(symbol, interval, start, end)
+        ]
+        with self._lock:
+            self._counters["windows"] += len(symbols)
+            self._counters["windows_from_store"] += len(set(symbols) - {symbol for symbol, _, _ in tasks})
+        if not tasks:
+            return
+
+        provider = get_provider(self.provider_name)
+
+        async def fetch_all():
+            return await asyncio.gather(
+                *(
+                    provider.get_history(symbol, interval=interval, start=_from_ns(a), end=_from_ns(b))
+                    for symbol, a, b in tasks
+                ),
+                return_exceptions=True,
+            )
+
+        results = get_async_runner().run(fetch_all())
+        for (symbol, gap_start, gap_end), df in zip(tasks, results):
+            with self._lock:
+                self._counters["requests"] += 1
+                if isinstance(df, BaseException):
+                    self._counters["request_errors"] += 1
+                    continue
+                if df.empty:
+                    # Leave the gap open, but do not ask again until the TTL has passed
+                    self._counters["empty_results"] += 1
+                    now = time.monotonic()
+                    if len(self._empty_until) > 10_000:
+                        self._empty_until = {key: until for key, until in self._empty_until.items() if until > now}
+                    self._empty_until[(symbol, interval, gap_start)] = now + self._ttl_ns(interval) / 1e9
+                    continue
+                self._counters["bars_fetched"] += len(df)
+            self.store.write(symbol, interval, df, covered=self._covered(df, interval, gap_end))
+
+    def get_bars_many(self, symbols, start, end, interval="1d"):
+        self.fill(symbols, interval, start, end)
+        return {symbol: self.store.read_frame(symbol, interval, start, end) for symbol in symbols}
+
+    def stats(self):
+        """Upstream request and bar counters, to check how much a window cost"""
+        with self._lock:
+            return dict(self._counters)
+
+
+# Create singleton instances, one planner per provider
+_planners = {}
+_planners_lock = threading.Lock()
+
+def get_fetch_planner(provider=None) -> FetchPlanner:
+    """Get or create the fetch planner for a provider (defaults to MARKET_DATA_PROVIDER)"""
+    provider = provider or MARKET_DATA_PROVIDER
+    planner = _planners.get(provider)
+    if planner is None:
+        with _planners_lock:
+            planner = _planners.get(provider)
+            if planner is None:
+                planner = _planners[provider] = FetchPlanner(get_bar_store(provider), provider)
+    return planner
+
+def get_bars(symbol, period="1mo", interval="1d", provider=None):
+    """
+    OHLCV bars for a period, served from the bar store
+
+    Only the ranges the store does not already hold are fetched from the
+    provider, so switching periods on a known symbol is nearly free.
+    """
+    return get_bars_many([symbol], period=period, interval=interval, provider=provider)[symbol]
+
+def get_bars_many(symbols, period="1mo", interval="1d", provider=None):
+    """
+    get_bars for many symbols, filling all their gaps concurrently
+
+    "1d" and "5d" mean the last one or five sessions with bars, as in
+    yfinance, so they are not empty on weekends, holidays or before the open.
+    """
+    start, end = period_to_range(period)
+    sessions = SESSION_PERIODS.get(period)
+    if sessions is None:
+        return get_fetch_planner(provider).get_bars_many(symbols, start, end, interval=interval)
+    start = sessions_start(end, sessions + HOLIDAY_MARGIN_SESSIONS)
+    frames = get_fetch_planner(provider).get_bars_many(symbols, start, end, interval=interval)
+    return {symbol: _last_sessions(df, sessions) for symbol, df in frames.items()}
@@ -0,0 +1,236 @@
+# core/indicators.py
+
+import numpy as np
+
+# Default indicator periods (daily bars)
+SMA_FAST = 20
+SMA_SLOW = 50
+EMA_PERIOD = 20
+RSI_PERIOD = 14
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+VOLUME_AVERAGE = 20
+
+# Every recurrence below is a sequence of element-wise float64 operations on
+# arrays with one entry per symbol. Stepping N symbols at once or one symbol at
+# a time therefore gives bit-identical results, which is what lets the batch
+# screener and incremental updates share this code.
+
+
+class RollingMean:
+    """
+    Simple moving average over `period` values, kept as a running sum plus a ring buffer
+
+    NaN inputs are skipped like invalid rows (a missing volume on a bar with a
+    close), so one gap cannot poison the running sum for good.
+    """
+
+    def __init__(self, rows, period):
+        self.period = period
+        self.count = np.zeros(rows, dtype=np.int64)
+        self.total = np.zeros(rows)
+        self.window = np.full((rows, period), np.nan)
+        self.value = np.full(rows, np.nan)
+
+    def update(self, x, valid):
+        valid = valid & ~np.isnan(x)
+        rows = np.arange(len(self.count))
+        slot = self.count % self.period
+        outgoing = self.window[rows, slot]
+        full = self.count >= self.period
+        total = np.where(full, self.total + x - outgoing, self.total + x)
+        self.total = np.where(valid, total, self.total)
+        self.window[rows, slot] = np.where(valid, x, outgoing)
+        self.count = self.count + valid
+        self.value = np.where(valid & (self.count >= self.period), self.total / self.period, self.value)
+        return self.value
+
+
+class Smoother:
+    """
+    Exponential smoothing seeded with the mean of the first `period` values
+
+    kind="ema" uses alpha = 2 / (period + 1); kind="wilder" uses alpha = 1 / period
+    (Wilder's smoothing, as in RSI and ATR).
+    """
+
+    def __init__(self, rows, period, kind="ema"):
+        self.period = period
+        self.kind = kind
+        self.count = np.zeros(rows, dtype=np.int64)
+        self.seed_total = np.zeros(rows)
+        self.value = np.full(rows, np.nan)
+
+    def update(self, x, valid):
+        self.count = self.count + valid
+        self.seed_total = np.where(valid & (self.count <= self.period), self.seed_total + x, self.seed_total)
+
+        if self.kind == "wilder":
+            smoothed = (self.value * (self.period - 1) + x) / self.period
+        else:
+            alpha = 2.0 / (self.period + 1)
+            smoothed = self.value + alpha * (x - self.value)
+
+        value = np.where(self.count == self.period, self.seed_total / self.period, smoothed)
+        self.value = np.where(valid & (self.count >= self.period), value, self.value)
+        return self.value
+
+
+def _take(state, rows):
+    """Copy of a state object holding only `rows` (arrays are per-symbol on axis 0)"""
+    part = object.__new__(type(state))
+    for name, value in vars(state).items():
+        if isinstance(value, np.ndarray):
+            value = value[rows]
+        elif isinstance(value, (RollingMean, Smoother)):
+            value = _take(value, rows)
+        setattr(part, name, value)
+    return part
+
+def _put(state, rows, part):
+    """Write a state produced by _take back into `rows`"""
+    for name, value in vars(state).items():
+        if isinstance(value, np.ndarray):
+            value[rows] = getattr(part, name)
+        elif isinstance(value, (RollingMean, Smoother)):
+            _put(value, rows, getattr(part, name))
+
+def _concat(parts):
+    """Stack states for disjoint row ranges back into one, in the order given"""
+    whole = object.__new__(type(parts[0]))
+    for name, value in vars(parts[0]).items():
+        if isinstance(value, np.ndarray):
+            value = np.concatenate([getattr(part, name) for part in parts])
+        elif isinstance(value, (RollingMean, Smoother)):
+            value = _concat([getattr(part, name) for part in parts])
+        setattr(whole, name, value)
+    return whole
+
+
+class IndicatorState:
+    """
+    Streaming technical indicators for many symbols at once
+
+    Feed one bar per symbol per update() (NaN for symbols with no bar at that
+    step, e.g. before they listed). Values stay NaN until enough bars have been
+    seen. Covers SMA 20/50, EMA 20, RSI 14 (Wilder), MACD 12/26/9, average
+    volume and the one-bar change.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.bars = np.zeros(rows, dtype=np.int64)
+        self.close = np.full(rows, np.nan)
+        self.previous_close = np.full(rows, np.nan)
+        self.volume = np.full(rows, np.nan)
+
+        self.sma_fast = RollingMean(rows, SMA_FAST)
+        self.sma_slow = RollingMean(rows, SMA_SLOW)
+        self.ema = Smoother(rows, EMA_PERIOD)
+        self.avg_gain = Smoother(rows, RSI_PERIOD, kind="wilder")
+        self.avg_loss = Smoother(rows, RSI_PERIOD, kind="wilder")
+        self.ema_fast = Smoother(rows, MACD_FAST)
+        self.ema_slow = Smoother(rows, MACD_SLOW)
+        self.macd_signal = Smoother(rows, MACD_SIGNAL)
+        self.avg_volume = RollingMean(rows, VOLUME_AVERAGE)
+
+    def update(self, close, volume):
+        """Advance every symbol with a bar (non-NaN close) by one step"""
+        close = np.asarray(close, dtype=np.float64)
+        volume = np.asarray(volume, dtype=np.float64)
+        valid = ~np.isnan(close)
+
+        has_previous = valid & (self.bars > 0)
+        change = close - self.close
+        self.previous_close = np.where(valid, self.close, self.previous_close)
+        self.close = np.where(valid, close, self.close)
+        self.volume = np.where(valid, volume, self.volume)
+        self.bars += valid
+
+        self.sma_fast.update(close, valid)
+        self.sma_slow.update(close, valid)
+        self.ema.update(close, valid)
+        self.avg_gain.update(np.where(change > 0, change, 0.0), has_previous)
+        self.avg_loss.update(np.where(change < 0, -change, 0.0), has_previous)
+
+        self.ema_fast.update(close, valid)
+        self.ema_slow.update(close, valid)
+        macd = self.ema_fast.value - self.ema_slow.value
+        self.macd_signal.update(macd, valid & ~np.isnan(macd))
+        self.avg_volume.update(volume, valid)
+
+    def take(self, rows):
+        """Independent copy of the state for a subset of symbols"""
+        part = _take(self, rows)
+        part.rows = len(part.bars)
+        return part
+
+    def put(self, rows, part):
+        _put(self, rows, part)
+
+    @classmethod
+    def concat(cls, parts):
+        """One state from per-shard states, rows in the order of `parts`"""
+        whole = _concat(parts)
+        whole.rows = len(whole.bars)
+        return whole
+
+    def update_rows(self, rows, close, volume):
+        """
+        Advance only `rows` by one bar
+
+        Copies those symbols' state out, steps it with the same update() the
+        batch pass uses and writes it back, so the cost depends on the number
+        of symbols updated, not on history length or universe size.
+        """
+        part = self.take(rows)
+        part.update(close, volume)
+        self.put(rows, part)
+
+    def peek(self, rows, close, volume):
+        """Indicator values for `rows` as if one more bar were applied, without committing it"""
+        part = self.take(rows)
+        part.update(close, volume)
+        return part.values()
+
+    def values(self):
+        """Current indicator values, one array entry per symbol"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gain, loss = self.avg_gain.value, self.avg_loss.value
+            rsi = np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), 100.0 - 100.0 / (1.0 + gain / loss))
+            rsi = np.where(np.isnan(gain) | np.isnan(loss), np.nan, rsi)
+            macd = self.ema_fast.value - self.ema_slow.value
+            change_pct = (self.close - self.previous_close) / self.previous_close * 100
+            volume_ratio = self.volume / self.avg_volume.value
+        return {
+            "close": self.close,
+            "change_pct": change_pct,
+            "sma_20": self.sma_fast.value,
+            "sma_50": self.sma_slow.value,
+            "ema_20": self.ema.value,
+            "rsi_14": rsi,
+            "macd": macd,
+            "macd_signal": self.macd_signal.value,
+            "macd_hist": macd - self.macd_signal.value,
+            "volume_ratio": volume_ratio,
+        }
+
+
+def compute_indicators(close, volume):
+    """
+    Indicators for a whole (symbols x bars) panel in one pass over time
+
+    Args:
+        close (np.ndarray): Shape (N, T), each row right-aligned so its latest
+            bar is in the last column; leading NaN where a symbol has fewer bars
+        volume (np.ndarray): Same shape as close
+
+    Returns:
+        IndicatorState: State after the last column, ready for further updates
+    """
+    state = IndicatorState(close.shape[0])
+    # Walk time-major copies so each step reads contiguous memory
+    for close_t, volume_t in zip(np.ascontiguousarray(close.T), np.ascontiguousarray(volume.T)):
+        state.update(close_t, volume_t)
+    return state
@@ -0,0 +1,215 @@
+# core/instruments.py
+
+import bisect
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import requests
+
+from config.settings import ANGEL_EXCHANGE, ANGEL_INSTRUMENT_CSV_URL, HTTP_TIMEOUT, INSTRUMENT_CSV_PATH, INSTRUMENT_INDEX_PATH
+from core.angel_api import BASE_PRICES
+
+INDEX_VERSION = 1
+TEXT_COLUMNS = ("symbols", "tokens", "names", "exchanges")
+EQUITY_SUFFIX = "-EQ"
+
+
+def display_symbol(symbol):
+    """Trading symbol as used across the app (INFY-EQ -> INFY)"""
+    return symbol[:-len(EQUITY_SUFFIX)] if symbol.endswith(EQUITY_SUFFIX) else symbol
+
+
+class InstrumentMaster:
+    """
+    Parsed instrument list with O(1) symbol lookups and prefix autocomplete
+
+    Rows are kept sorted by symbol so a prefix maps to one contiguous slice
+    found with two binary searches (the same walk a trie would do, without
+    the per-node objects). Names get their own sorted key list so searching
+    "tata" also finds TATAMOTORS, TATASTEEL, etc.
+    """
+
+    def __init__(self, symbols, tokens, names, exchanges, presorted=False, name_order=None):
+        if not presorted:
+            order = np.argsort(np.asarray(symbols, dtype=str), kind="stable").tolist()
+            symbols, tokens, names, exchanges = ([column[row] for row in order] for column in (symbols, tokens, names, exchanges))
+            name_order = None
+        self.symbols = list(symbols)
+        self.tokens = list(tokens)
+        self.names = list(names)
+        self.exchanges = list(exchanges)
+
+        self._rows = dict(zip(map(display_symbol, self.symbols), range(len(self.symbols))))
+        self._rows.update(zip(self.symbols, range(len(self.symbols))))
+
+        if name_order is None:
+            name_order = np.argsort(np.asarray(self.names, dtype=str), kind="stable")
+        self._name_order = np.asarray(name_order, dtype=np.int64)
+        self._name_rows = self._name_order.tolist()
+        self._name_keys = [self.names[row] for row in self._name_rows]
+
+    def __len__(self):
+        return len(self.symbols)
+
+    # -------------------------
+    # Building and persistence
+    # -------------------------
+    @classmethod
+    def from_csv(cls, source):
+        """Parse the Angel One instrument CSV (path, URL or raw bytes)"""
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        df = pd.read_csv(source, dtype=str, keep_default_na=False)
+        df.columns = df.columns.str.strip().str.lower()
+        token_column = "symboltoken" if "symboltoken" in df.columns else "token"
+        exchange = df["exch_seg"] if "exch_seg" in df.columns else df.get("exchange", ANGEL_EXCHANGE)
+        return cls(
+            symbols=df["symbol"].str.strip().str.upper().tolist(),
+            tokens=df[token_column].str.strip().tolist(),
+            names=(df["name"] if "name" in df.columns else df["symbol"]).str.strip().str.upper().tolist(),
+            exchanges=pd.Series(exchange, index=df.index).astype(str).tolist(),
+        )
+
+    @classmethod
+    def from_index(cls, path):
+        """Load a binary index written by save_index"""
+        with np.load(path, allow_pickle=False) as index:
+            if int(index["version"]) != INDEX_VERSION:
+                raise ValueError(f"Unsupported instrument index version in {path}")
+            columns = [index[name].tobytes().decode("utf-8").split("\n") for name in TEXT_COLUMNS]
+            return cls(*columns, presorted=True, name_order=index["name_order"])
+
+    def save_index(self, path):
+        """Write the sorted columns (newline-joined UTF-8) and name order as an uncompressed .npz"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                version=np.int64(INDEX_VERSION),
+                name_order=self._name_order,
+                **{
+                    name: np.frombuffer("\n".join(getattr(self, name)).encode("utf-8"), dtype=np.uint8)
+                    for name in TEXT_COLUMNS
+                },
+            )
+        os.replace(tmp_path, path)
+
+    # -------------------------
+    # Lookups
+    # -------------------------
+    def _record(self, row):
+        return {
+            "symbol": display_symbol(self.symbols[row]),
+            "trading_symbol": self.symbols[row],
+            "token": self.tokens[row],
+            "exchange": self.exchanges[row],
+            "name": self.names[row],
+        }
+
+    def lookup(self, symbol):
+        """Instrument record for a symbol (INFY or INFY-EQ), or None"""
+        row = self._rows.get(symbol.strip().upper())
+        return None if row is None else self._record(row)
+
+    def token_for(self, symbol):
+        row = self._rows.get(symbol.strip().upper())
+        return None if row is None else self.tokens[row]
+
+    @staticmethod
+    def _prefix_slice(keys, prefix):
+        lo = bisect.bisect_left(keys, prefix)
+        hi = bisect.bisect_left(keys, prefix + "\uffff", lo)
+        return lo, hi
+
+    def search(self, prefix, limit=10):
+        """
+        Autocomplete over symbols, then names
+
+        Args:
+            prefix (str): Case-insensitive prefix, e.g. "inf" or "tata mo"
+            limit (int): Maximum number of results
+
+        Returns:
+            list[dict]: Instrument records, symbol matches first
+        """
+        prefix = prefix.strip().upper()
+        if not prefix:
+            return []
+
+        rows = []
+        lo, hi = self._prefix_slice(self.symbols, prefix)
+        rows.extend(range(lo, min(hi, lo + limit)))
+
+        if len(rows) < limit:
+            seen = set(rows)
+            lo, hi = self._prefix_slice(self._name_keys, prefix)
+            for position in range(lo, hi):
+                row = self._name_rows[position]
+                if row not in seen:
+                    rows.append(row)
+                    seen.add(row)
+                if len(rows) >= limit:
+                    break
+
+        return [self._record(row) for row in rows]
+
+    def all_symbols(self, equity_only=True):
+        """Every symbol in display form, optionally only cash-market equities"""
+        if equity_only:
+            return [display_symbol(s) for s in self.symbols if s.endswith(EQUITY_SUFFIX)]
+        return [display_symbol(s) for s in self.symbols]
+
+
+def _mock_master():
+    """Offline fallback built from the mock price universe"""
+    symbols = [f"{symbol}{EQUITY_SUFFIX}" for symbol in BASE_PRICES]
+    return InstrumentMaster(symbols, [""] * len(symbols), list(BASE_PRICES), [ANGEL_EXCHANGE] * len(symbols))
+
+def load_instrument_master(csv_path=INSTRUMENT_CSV_PATH, index_path=INSTRUMENT_INDEX_PATH, url=ANGEL_INSTRUMENT_CSV_URL):
+    """
+    Load the instrument master, preferring the binary index
+
+    The CSV (local file, else the download URL) is only parsed when the index
+    is missing or older than the local CSV; the index is rewritten afterwards.
+    Falls back to the mock universe when neither is reachable.
+    """
+    csv_exists = os.path.exists(csv_path)
+    index_is_current = os.path.exists(index_path) and (
+        not csv_exists or os.path.getmtime(index_path) >= os.path.getmtime(csv_path)
+    )
+    if index_is_current:
+        try:
+            return InstrumentMaster.from_index(index_path)
+        except (OSError, ValueError, KeyError):
+            pass
+
+    try:
+        if csv_exists:
+            master = InstrumentMaster.from_csv(csv_path)
+        else:
+            response = requests.get(url, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+            master = InstrumentMaster.from_csv(response.content)
+    except (OSError, ValueError, KeyError, requests.RequestException):
+        return _mock_master()
+
+    master.save_index(index_path)
+    return master
+
+
+# Create a singleton instance
+_instrument_master = None
+_instrument_master_lock = threading.Lock()
+
+def get_instrument_master() -> InstrumentMaster:
+    """Get or load the process-wide instrument master"""
+    global _instrument_master
+    if _instrument_master is None:
+        with _instrument_master_lock:
+            if _instrument_master is None:
+                _instrument_master = load_instrument_master()
+    return _instrument_master
@@ -0,0 +1,159 @@
+# core/market_poller.py
+
+import threading
+import time
+from datetime import datetime
+
+from config.settings import MARKET_POLL_INTERVAL, MARKET_SUBSCRIPTION_TTL
+from core.providers import fetch_quotes
+
+
+class SnapshotStore:
+    """
+    In-memory latest-quote store
+
+    Writers publish a whole new mapping per feed and swap the reference, so
+    readers never lock and always see a consistent snapshot.
+    """
+
+    def __init__(self):
+        self._feeds = {}
+        self._updated_at = {}
+        self._write_lock = threading.Lock()
+
+    def publish(self, feed, quotes):
+        with self._write_lock:
+            merged = dict(self._feeds.get(feed, {}))
+            merged.update(quotes)
+            self._feeds[feed] = merged
+            self._updated_at[feed] = datetime.now()
+
+    def drop(self, feed, symbols):
+        with self._write_lock:
+            current = self._feeds.get(feed, {})
+            self._feeds[feed] = {s: q for s, q in current.items() if s not in symbols}
+
+    def read(self, feed, symbols=None):
+        snapshot = self._feeds.get(feed, {})
+        if symbols is None:
+            return snapshot
+        return {symbol: snapshot[symbol] for symbol in symbols if symbol in snapshot}
+
+    def updated_at(self, feed):
+        return self._updated_at.get(feed)
+
+
+class MarketDataPoller:
+    """
+    One background thread per process that refreshes every symbol some page
+    currently needs and publishes the results to a SnapshotStore.
+
+    Pages call subscribe() on each rerun to keep their symbols alive and then
+    read the latest snapshot; they never wait on the network themselves.
+    """
+
+    def __init__(self, fetchers, interval=MARKET_POLL_INTERVAL, subscription_ttl=MARKET_SUBSCRIPTION_TTL):
+        self.fetchers = fetchers
+        self.interval = interval
+        self.subscription_ttl = subscription_ttl
+        self.store = SnapshotStore()
+        self._subscriptions = {feed: {} for feed in fetchers}
+        self._listeners = {feed: [] for feed in fetchers}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="market-poller", daemon=True)
+                self._thread.start()
+
+    def subscribe(self, feed, symbols):
+        """Mark symbols as needed on a feed, new symbols wake the poller immediately"""
+        if feed not in self.fetchers:
+            raise ValueError(f"Unknown market data feed: {feed}")
+        now = time.monotonic()
+        with self._lock:
+            subscriptions = self._subscriptions[feed]
+            new_symbols = [s for s in symbols if s not in subscriptions]
+            for symbol in symbols:
+                subscriptions[symbol] = now
+        if new_symbols:
+            self._wake.set()
+
+    def add_listener(self, feed, callback):
+        """Call callback(quotes) from the poller thread after every publish on a feed"""
+        if feed not in self.fetchers:
+            raise ValueError(f"Unknown market data feed: {feed}")
+        with self._lock:
+            self._listeners[feed].append(callback)
+
+    def latest(self, feed, symbols=None):
+        """Latest published quotes for a feed (symbols not yet polled are omitted)"""
+        return self.store.read(feed, symbols)
+
+    def updated_at(self, feed):
+        return self.store.updated_at(feed)
+
+    def tracked_symbols(self, feed):
+        with self._lock:
+            return list(self._subscriptions[feed])
+
+    def _expire_subscriptions(self):
+        cutoff = time.monotonic() - self.subscription_ttl
+        expired = {}
+        with self._lock:
+            for feed, subscriptions in self._subscriptions.items():
+                stale = [s for s, seen in subscriptions.items() if seen < cutoff]
+                for symbol in stale:
+                    del subscriptions[symbol]
+                if stale:
+                    expired[feed] = set(stale)
+        for feed, symbols in expired.items():
+            self.store.drop(feed, symbols)
+
+    def poll_once(self):
+        """Fetch every tracked symbol once and publish the results"""
+        self._expire_subscriptions()
+        for feed, fetch in self.fetchers.items():
+            symbols = self.tracked_symbols(feed)
+            if not symbols:
+                continue
+            try:
+                quotes = fetch(symbols)
+            except Exception:
+                continue
+            if quotes:
+                self.store.publish(feed, quotes)
+                for callback in list(self._listeners[feed]):
+                    try:
+                        callback(quotes)
+                    except Exception:
+                        pass
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            self.poll_once()
+            self._wake.wait(self.interval)
+
+
+# Create a singleton instance
+_market_poller = None
+_market_poller_lock = threading.Lock()
+
+def get_market_poller() -> MarketDataPoller:
+    """Get or create the process-wide poller, starting its thread on first use"""
+    global _market_poller
+    if _market_poller is None:
+        with _market_poller_lock:
+            if _market_poller is None:
+                _market_poller = MarketDataPoller({
+                    # Equity quotes from the configured provider (MARKET_DATA_PROVIDER)
+                    "quotes": fetch_quotes,
+                    # Yahoo tickers such as ^NSEI, always served by yfinance
+                    "yahoo": lambda symbols: fetch_quotes(symbols, provider="yfinance"),
+                })
+                _market_poller.start()
+    return _market_poller
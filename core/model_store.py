@@ -0,0 +1,201 @@
+# core/model_store.py
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import quote
+
+import numpy as np
+
+from config.settings import MARKET_DATA_PROVIDER, MODEL_STORE_DIR, MODEL_STORE_MAX_RESIDENT
+
+# One file per (symbol, model):
+#   8-byte magic, 8-byte header length, JSON header, then every array of the
+#   fitted model's state, each starting on a 64-byte boundary.
+# The header names the model class and holds its scalar attributes, plus the
+# dtype/shape/offset of each array. Readers map the whole file read-only and
+# take arrays as views into the mapping, so loading costs one mmap and a JSON
+# parse, and every process on the host shares the same page-cache pages.
+MAGIC = b"IQMODEL1"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def _scalar(value):
+    """Plain JSON value for a model attribute, or None if it is not a scalar"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot store attribute of type {type(value).__name__}")
+
+
+def write_model(path, model):
+    """Write a fitted model's state, atomically replacing any file at path"""
+    scalars, arrays = {}, {}
+    for name, value in vars(model).items():
+        if isinstance(value, np.ndarray):
+            arrays[name] = np.ascontiguousarray(value)
+        else:
+            scalars[name] = _scalar(value)
+
+    specs, offset = {}, 0
+    for name, array in arrays.items():
+        specs[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({"version": FORMAT_VERSION, "model": model.name, "scalars": scalars, "arrays": specs}).encode()
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(np.uint64(len(header)).tobytes())
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + specs[name]["offset"])
+                f.write(array.tobytes())
+            f.truncate(max(f.tell(), data_start))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_model(path, registry):
+    """
+    Map a model file and rebuild the model on top of the mapping
+
+    Args:
+        path (str): File written by write_model
+        registry (dict): Model name -> class (core.predictions.MODELS)
+
+    Returns:
+        ForecastModel: Instance whose array attributes are read-only views of the file
+    """
+    mapping = np.memmap(path, dtype=np.uint8, mode="r")
+    if bytes(mapping[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"Not a model file: {path}")
+    header_size = int(mapping[len(MAGIC):len(MAGIC) + 8].view("<u8")[0])
+    header = json.loads(bytes(mapping[len(MAGIC) + 8:len(MAGIC) + 8 + header_size]))
+    if header["version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model file version in {path}")
+
+    model = object.__new__(registry[header["model"]])
+    vars(model).update(header["scalars"])
+    data_start = _align(len(MAGIC) + 8 + header_size)
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        start = data_start + spec["offset"]
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        view = mapping[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+        setattr(model, name, np.asarray(view))
+    return model
+
+
+def file_version(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class ModelStore:
+    """
+    Fitted forecast models on disk, loaded on first use and kept in an LRU
+
+    get() maps a symbol's model file the first time it is asked for and keeps
+    at most max_resident models mapped; evicted ones are unmapped once no
+    caller holds them. A cached model is reused while the file is unchanged
+    (one stat() per lookup), so a model saved by another process is picked up
+    on the next get(). Loaded arrays are read-only: fitting never mutates a
+    model in place (warm starts copy the state first).
+    """
+
+    def __init__(self, root, registry, max_resident=MODEL_STORE_MAX_RESIDENT):
+        self.root = root
+        self.registry = registry
+        self.max_resident = max_resident
+        self._resident = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "loads": 0, "misses": 0, "saves": 0, "evictions": 0, "load_errors": 0}
+
+    def path(self, symbol, model):
+        return os.path.join(self.root, model, f"{quote(symbol.upper(), safe='')}.iqm")
+
+    def _keep(self, key, version, fitted):
+        """Make a model resident and evict least recently used ones (lock held)"""
+        self._resident[key] = (version, fitted)
+        self._resident.move_to_end(key)
+        while len(self._resident) > self.max_resident:
+            self._resident.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def get(self, symbol, model):
+        """The stored model for (symbol, model), or None if none was saved"""
+        key = (symbol.upper(), model)
+        path = self.path(symbol, model)
+        version = file_version(path)
+        with self._lock:
+            entry = self._resident.get(key)
+            if entry is not None and entry[0] == version:
+                self._resident.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry[1]
+            if version is None:
+                self._resident.pop(key, None)
+                self._counters["misses"] += 1
+                return None
+
+        try:
+            fitted = read_model(path, self.registry)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self._counters["load_errors"] += 1
+            return None
+        with self._lock:
+            self._counters["loads"] += 1
+            self._keep(key, version, fitted)
+        return fitted
+
+    def save(self, symbol, fitted):
+        """
+        Persist a fitted model and return the file-backed copy
+
+        The in-memory model is swapped for the mapped one, so resident models
+        live in the shared page cache rather than in this process's heap.
+        """
+        path = self.path(symbol, fitted.name)
+        write_model(path, fitted)
+        mapped = read_model(path, self.registry)
+        with self._lock:
+            self._counters["saves"] += 1
+            self._keep((symbol.upper(), fitted.name), file_version(path), mapped)
+        return mapped
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, resident=len(self._resident))
+
+
+# Create singleton instances, one store per provider so models fitted on different feeds never mix
+_model_stores = {}
+_model_stores_lock = threading.Lock()
+
+def get_model_store(provider=None) -> ModelStore:
+    """Get or create the model store for a provider (defaults to MARKET_DATA_PROVIDER)"""
+    provider = provider or MARKET_DATA_PROVIDER
+    store = _model_stores.get(provider)
+    if store is None:
+        with _model_stores_lock:
+            store = _model_stores.get(provider)
+            if store is None:
+                from core.predictions import MODELS  # core.predictions imports this module
+                store = _model_stores[provider] = ModelStore(os.path.join(MODEL_STORE_DIR, provider), MODELS)
+    return store
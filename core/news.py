@@ -1,29 +1,896 @@
 # core/news.py
 
-from datetime import datetime
-
-def get_latest_news():
-    # Replace with actual API integration (NewsAPI, NewsCatcher, etc.)
-    return [
-        {
-            "title": "Nifty gains 150 points as IT, Banking stocks rally",
-            "summary": "Indian equity markets opened higher led by gains in IT and private banks as global cues turned positive.",
-            "url": "https://example.com/nifty-gains",
-            "source": "MoneyControl",
-            "published": datetime.now().strftime("%Y-%m-%d %H:%M")
-        },
-        {
-            "title": "RBI keeps repo rate unchanged at 6.5%",
-            "summary": "The Reserve Bank of India decided to maintain the key interest rate citing inflation concerns and global uncertainty.",
-            "url": "https://example.com/rbi-hold",
-            "source": "Economic Times",
-            "published": datetime.now().strftime("%Y-%m-%d %H:%M")
-        },
-        {
-            "title": "Reliance announces Q1 results, profit up 10%",
-            "summary": "Reliance Industries reported a 10% increase in quarterly profits driven by strong retail and energy performance.",
-            "url": "https://example.com/reliance-q1",
-            "source": "Business Standard",
-            "published": datetime.now().strftime("%Y-%m-%d %H:%M")
+import argparse
+import bisect
+import glob
+import hashlib
+import html
+import json
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from xml.etree import ElementTree
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single writer per store is assumed
+    fcntl = None
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from config.settings import (
+    HTTP_TIMEOUT,
+    MARKET_TIMEZONE,
+    NEWS_BATCH_SIZE,
+    NEWS_BM25_B,
+    NEWS_BM25_K1,
+    NEWS_DUPLICATE_THRESHOLD,
+    NEWS_DUPLICATE_WINDOW,
+    NEWS_FEEDS,
+    NEWS_INDEX_COMPACT_EVERY,
+    NEWS_INDEX_SNAPSHOT_EVERY,
+    NEWS_POLL_INTERVAL,
+    NEWS_STORE_PATH,
+    NEWS_SYMBOL_ALIASES,
+    NEWS_TITLE_WEIGHT,
+)
+from core.instruments import get_instrument_master
+
+# The store is one append-only JSON-lines file, one record per ingested item:
+#   id, key (feed guid or url), feed, title, summary, url, source,
+#   published (ISO, market time), published_ns, symbols, duplicate_of
+# Syndicated copies are stored too, with duplicate_of pointing at the first
+# copy seen, so the file is a complete log and any process can rebuild the
+# same view by replaying it. Readers tail the file from the last offset they
+# consumed instead of re-reading it.
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+TAG_RE = re.compile(r"<[^>]+>")
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16  # 4 rows per band: pairs above ~0.5 Jaccard almost always share a band
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+def _hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+def _clean(text):
+    """Plain text from an RSS field that may carry HTML"""
+    return " ".join(html.unescape(TAG_RE.sub(" ", text or "")).split())
+
+def _published(value):
+    """Publish time in MARKET_TIMEZONE (naive values taken as local), or None if unparseable"""
+    try:
+        published = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        return None
+    if pd.isna(published):
+        return None
+    return (published.tz_localize(MARKET_TIMEZONE) if published.tzinfo is None else published).tz_convert(MARKET_TIMEZONE)
+
+
+# -------------------------
+# Near-duplicate detection
+# -------------------------
+_SEEDS = np.random.default_rng(20240601).integers(1, 2 ** 63, size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+def minhash(tokens):
+    """
+    MinHash signature of a token set
+
+    Each of the MINHASH_PERMUTATIONS hash functions is the token hash xor a
+    seed pushed through a 64-bit mixer (splitmix64 finaliser), computed for
+    every token at once as one (tokens, permutations) array.
+    """
+    hashes = np.fromiter((_hash64(token) for token in set(tokens)), dtype=np.uint64)
+    if not len(hashes):
+        return np.full(MINHASH_PERMUTATIONS, np.iinfo(np.uint64).max, dtype=np.uint64)
+    x = hashes[:, None] ^ _SEEDS[None, :]
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return x.min(axis=0)
+
+
+class DuplicateIndex:
+    """
+    Locality-sensitive index over MinHash signatures
+
+    A signature is cut into bands; articles sharing any whole band are
+    candidates, and a candidate is a duplicate when the signatures agree on
+    at least `threshold` of their positions (the estimated Jaccard similarity
+    of the two token sets). Only articles published within `window` of each
+    other are compared, so a recurring headline weeks apart is a new story.
+    """
+
+    def __init__(self, threshold=NEWS_DUPLICATE_THRESHOLD, window=NEWS_DUPLICATE_WINDOW, bands=MINHASH_BANDS):
+        self.threshold = threshold
+        self.window_ns = int(pd.Timedelta(window).value)
+        self.bands = bands
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = {}
+        self._oldest_ns = 0
+
+    def _band_keys(self, signature):
+        data = signature.tobytes()
+        width = len(data) // self.bands
+        return [data[start:start + width] for start in range(0, len(data), width)]
+
+    def find(self, signature, published_ns):
+        """Id of an indexed article this one duplicates, or None"""
+        best, best_similarity = None, self.threshold
+        seen = set()
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            for article_id in bucket.get(key, ()):
+                if article_id in seen:
+                    continue
+                seen.add(article_id)
+                other, other_ns = self._signatures[article_id]
+                if abs(other_ns - published_ns) > self.window_ns:
+                    continue
+                similarity = float(np.mean(other == signature))
+                if similarity >= best_similarity:
+                    best, best_similarity = article_id, similarity
+        return best
+
+    def add(self, article_id, signature, published_ns):
+        self._oldest_ns = min(self._oldest_ns, published_ns) if self._signatures else published_ns
+        self._signatures[article_id] = (signature, published_ns)
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(key, []).append(article_id)
+
+    def prune(self, before_ns):
+        """Forget articles published before before_ns; nothing newer than the window can match them"""
+        if self._oldest_ns >= before_ns:
+            return
+        kept = {article_id: entry for article_id, entry in self._signatures.items() if entry[1] >= before_ns}
+        self._oldest_ns = min((entry[1] for entry in kept.values()), default=before_ns)
+        self._signatures = {}
+        self._buckets = [{} for _ in range(self.bands)]
+        for article_id, (signature, published_ns) in kept.items():
+            self.add(article_id, signature, published_ns)
+
+
+# -------------------------
+# Search
+# -------------------------
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is its of on or that the this to was were will with".split()
+)
+
+def analyze(text):
+    """Index terms of a text: lower-cased words without stopwords"""
+    return [token for token in tokenize(text) if token not in STOPWORDS]
+
+
+INDEX_SNAPSHOT_VERSION = 1
+
+
+class InvertedIndex:
+    """
+    BM25 index over article titles and summaries, built incrementally
+
+    Documents are numbered in the order they are added. A new document's
+    postings go to a write buffer of per-term Python lists; compact() merges
+    the buffer into one packed int32 doc array and float32 term-frequency
+    array per term, so a query gathers a few arrays per term and scores them
+    with numpy instead of looking at every article. Title words count
+    `title_weight` times. Symbols are indexed as "$SYMBOL" terms that filter
+    results but do not score.
+    """
+
+    def __init__(self, k1=NEWS_BM25_K1, b=NEWS_BM25_B, title_weight=NEWS_TITLE_WEIGHT, compact_every=NEWS_INDEX_COMPACT_EVERY):
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self.compact_every = compact_every
+        self.ids = []  # doc number -> article id
+        self._lengths = np.zeros(1024, dtype=np.float32)
+        self._total_length = 0.0
+        self._postings = {}  # term -> (docs int32, tfs float32), docs ascending
+        self._buffer = {}  # term -> ([docs], [tfs]) added since the last compaction
+        self._buffered = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, article_id, title, summary, symbols=()):
+        doc = len(self.ids)
+        self.ids.append(article_id)
+        counts = Counter(analyze(summary))
+        for term in analyze(title):
+            counts[term] += self.title_weight
+        length = sum(counts.values())
+        for symbol in symbols:
+            counts[f"${symbol}"] = 0
+
+        if doc == len(self._lengths):
+            self._lengths = np.concatenate((self._lengths, np.zeros_like(self._lengths)))
+        self._lengths[doc] = length
+        self._total_length += length
+        for term, tf in counts.items():
+            docs, tfs = self._buffer.setdefault(term, ([], []))
+            docs.append(doc)
+            tfs.append(tf)
+        self._buffered += 1
+        if self._buffered >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Merge the write buffer into the packed postings"""
+        for term, (docs, tfs) in self._buffer.items():
+            docs, tfs = np.array(docs, dtype=np.int32), np.array(tfs, dtype=np.float32)
+            packed = self._postings.get(term)
+            if packed is not None:
+                docs, tfs = np.concatenate((packed[0], docs)), np.concatenate((packed[1], tfs))
+            self._postings[term] = (docs, tfs)
+        self._buffer = {}
+        self._buffered = 0
+
+    def save(self, path, offset):
+        """
+        Compact, then write the index to `path` (atomically), tagged with the
+        log offset it covers
+
+        Postings are stored as one flat doc array and one tf array with a
+        start offset per term, so loading needs no per-document work.
+        """
+        self.compact()
+        terms = list(self._postings)
+        sizes = np.fromiter((len(self._postings[term][0]) for term in terms), dtype=np.int64, count=len(terms))
+        arrays = {
+            "version": np.array(INDEX_SNAPSHOT_VERSION),
+            "offset": np.array(offset, dtype=np.int64),
+            "title_weight": np.array(self.title_weight, dtype=np.float64),
+            "ids": np.array(self.ids, dtype=str),
+            "lengths": self._lengths[:len(self.ids)],
+            "terms": np.array(terms, dtype=str),
+            "bounds": np.concatenate(([0], np.cumsum(sizes))),
+            "docs": np.concatenate([self._postings[term][0] for term in terms]) if terms else np.empty(0, dtype=np.int32),
+            "tfs": np.concatenate([self._postings[term][1] for term in terms]) if terms else np.empty(0, dtype=np.float32),
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """
+        Index saved by save(), or None if it is missing, unreadable or built with other settings
+
+        Returns:
+            tuple: (InvertedIndex, log offset it covers) or None
+        """
+        index = cls(**kwargs)
+        try:
+            with np.load(path, allow_pickle=False) as arrays:
+                if int(arrays["version"]) != INDEX_SNAPSHOT_VERSION or float(arrays["title_weight"]) != index.title_weight:
+                    return None
+                ids, lengths, terms, bounds = arrays["ids"], arrays["lengths"], arrays["terms"], arrays["bounds"]
+                docs, tfs, offset = arrays["docs"], arrays["tfs"], int(arrays["offset"])
+        except (OSError, KeyError, ValueError):
+            return None
+        index.ids = ids.tolist()
+        index._lengths = np.zeros(max(1024, 2 * len(ids)), dtype=np.float32)
+        index._lengths[:len(ids)] = lengths
+        index._total_length = float(lengths.sum(dtype=np.float64))
+        index._postings = {
+            term: (docs[start:stop], tfs[start:stop])
+            for term, start, stop in zip(terms.tolist(), bounds[:-1].tolist(), bounds[1:].tolist())
         }
-    ]
+        return index, offset
+
+    def postings(self, term):
+        """(docs, tfs) arrays for a term, packed and buffered together"""
+        packed = self._postings.get(term)
+        buffered = self._buffer.get(term)
+        if buffered is None:
+            return packed if packed is not None else (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32))
+        docs, tfs = np.array(buffered[0], dtype=np.int32), np.array(buffered[1], dtype=np.float32)
+        if packed is None:
+            return docs, tfs
+        return np.concatenate((packed[0], docs)), np.concatenate((packed[1], tfs))
+
+    def search(self, query, symbol=None, limit=20):
+        """
+        Rank documents for a free-text query with BM25
+
+        Args:
+            query (str): Words to look for (any of them may match)
+            symbol (str | None): Only documents tagged with this symbol
+
+        Returns:
+            list[tuple]: (article id, score), best first; newer first on equal scores
+        """
+        count = len(self.ids)
+        terms = list(dict.fromkeys(analyze(query)))
+        if not count or not terms:
+            return []
+        lengths = self._lengths[:count]
+        average_length = self._total_length / count or 1.0
+
+        doc_parts, score_parts = [], []
+        for term in terms:
+            docs, tfs = self.postings(term)
+            if not len(docs):
+                continue
+            idf = np.log1p((count - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths[docs] / average_length)
+            doc_parts.append(docs)
+            score_parts.append(idf * tfs * (self.k1 + 1) / (tfs + norm))
+        if not doc_parts:
+            return []
+        docs, scores = np.concatenate(doc_parts), np.concatenate(score_parts)
+        if symbol is not None:
+            keep = np.isin(docs, self.postings(f"${symbol.upper()}")[0])
+            docs, scores = docs[keep], scores[keep]
+
+        totals = np.bincount(docs, weights=scores)
+        hits = np.flatnonzero(totals)
+        if len(hits) > limit:
+            hits = hits[np.argpartition(-totals[hits], limit - 1)[:limit]]
+        hits = hits[np.lexsort((-hits, -totals[hits]))]
+        return [(self.ids[doc], float(totals[doc])) for doc in hits]
+
+
+# -------------------------
+# Feed sources
+# -------------------------
+class NewsFeed(ABC):
+    """
+    A source of news items
+
+    stream() yields raw items as they are read (dicts with guid, title,
+    summary, url, source and published), so a large feed is processed in
+    batches rather than held in memory. `since_ns` is the newest publish
+    time already stored for this feed; sources may use it to skip old items
+    early, and the store drops repeats either way.
+    """
+
+    name = "feed"
+
+    @abstractmethod
+    def stream(self, since_ns=None):
+        """Yield raw item dicts, optionally skipping those published at or before since_ns"""
+
+
+class FixtureFeed(NewsFeed):
+    """
+    Replays JSON-lines fixture files for offline runs
+
+    With rebase=True timestamps are shifted so the newest fixture item was
+    published "now" (fixed for the life of the feed), which keeps the
+    fixtures useful for recency-based views whenever they are replayed.
+    """
+
+    def __init__(self, path, name="fixtures", rebase=True):
+        self.path = path
+        self.name = name
+        self.rebase = rebase
+        self._offset = None
+
+    def _files(self):
+        if os.path.isdir(self.path):
+            return sorted(glob.glob(os.path.join(self.path, "*.jsonl")))
+        return [self.path]
+
+    def _read(self):
+        for file_path in self._files():
+            with open(file_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def _shift(self):
+        if self._offset is None:
+            newest = max((pd.Timestamp(item["published"]) for item in self._read()), default=None)
+            self._offset = pd.Timestamp.now(tz="UTC") - newest if (self.rebase and newest is not None) else pd.Timedelta(0)
+        return self._offset
+
+    def stream(self, since_ns=None):
+        offset = self._shift()
+        for item in self._read():
+            published = pd.Timestamp(item["published"]) + offset
+            if since_ns is not None and published.value <= since_ns:
+                continue
+            yield dict(item, published=published.isoformat())
+
+
+class RSSFeed(NewsFeed):
+    """
+    RSS 2.0 or Atom feed over HTTP, parsed while the body downloads
+
+    Items are handed on as soon as their closing tag arrives and their
+    elements are cleared afterwards, so memory stays flat however long the
+    feed document is. Polls are conditional (If-None-Match /
+    If-Modified-Since), so an unchanged feed costs a 304 and no parsing, and
+    items published at or before `since_ns` are dropped here, before they
+    are normalized and tagged.
+    """
+
+    def __init__(self, url, source=None, name=None, timeout=HTTP_TIMEOUT):
+        self.url = url
+        self.source = source
+        self.name = name or url
+        self.timeout = timeout
+        self._etag = None
+        self._last_modified = None
+
+    def _conditional_headers(self):
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        return headers
+
+    def _item(self, element):
+        def text(*tags):
+            for tag in tags:
+                child = element.find(tag)
+                if child is not None and child.text:
+                    return child.text.strip()
+            return ""
+
+        link = text("link")
+        if not link:
+            atom_link = element.find(f"{ATOM}link")
+            link = atom_link.get("href", "") if atom_link is not None else ""
+        return {
+            "guid": text("guid", f"{ATOM}id") or link,
+            "title": _clean(text("title", f"{ATOM}title")),
+            "summary": _clean(text("description", f"{ATOM}summary", f"{ATOM}content")),
+            "url": link,
+            "source": self.source or self.name,
+            "published": text("pubDate", f"{ATOM}published", f"{ATOM}updated"),
+        }
+
+    def stream(self, since_ns=None):
+        parser = ElementTree.XMLPullParser(events=("end",))
+        headers = self._conditional_headers()
+        with httpx.stream("GET", self.url, headers=headers, timeout=self.timeout, follow_redirects=True) as response:
+            if response.status_code == 304:
+                return
+            response.raise_for_status()
+            for chunk in response.iter_bytes():
+                parser.feed(chunk)
+                for _, element in parser.read_events():
+                    if element.tag in ("item", f"{ATOM}entry"):
+                        item = self._item(element)
+                        element.clear()
+                        published = _published(item["published"]) if since_ns is not None else None
+                        if published is not None and published.value <= since_ns:
+                            continue
+                        yield item
+            # Only remember the validators once the whole body was read, so
+            # an interrupted poll is retried in full next time
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
+
+
+FEED_TYPES = {"fixture": FixtureFeed, "rss": RSSFeed}
+
+def build_feeds(specs=NEWS_FEEDS):
+    """Feed objects from NEWS_FEEDS-style specs ({"type": ..., **constructor arguments})"""
+    feeds = []
+    for spec in specs:
+        options = dict(spec)
+        feeds.append(FEED_TYPES[options.pop("type")](**options))
+    return feeds
+
+
+# -------------------------
+# Normalisation
+# -------------------------
+class SymbolTagger:
+    """
+    Finds the instruments an article mentions
+
+    A symbol counts when it appears as a word written in capitals (TCS, ITC),
+    which avoids matching ordinary words that happen to be tickers; company
+    names come from NEWS_SYMBOL_ALIASES and match case-insensitively on
+    whole words.
+    """
+
+    def __init__(self, symbols, aliases=NEWS_SYMBOL_ALIASES):
+        self.symbols = set(symbols)
+        self.aliases = {tuple(tokenize(alias)): symbol for alias, symbol in aliases.items()}
+        self.max_words = max((len(words) for words in self.aliases), default=1)
+
+    def tag(self, text):
+        found = {word for word in re.findall(r"\b[A-Z][A-Z0-9&]+\b", text) if word in self.symbols}
+        tokens = tokenize(text)
+        for size in range(1, self.max_words + 1):
+            for start in range(len(tokens) - size + 1):
+                symbol = self.aliases.get(tuple(tokens[start:start + size]))
+                if symbol:
+                    found.add(symbol)
+        return sorted(found)
+
+
+def normalize(raw, feed, tagger):
+    """Store record for a raw feed item, or None when it has no usable title or date"""
+    title = _clean(raw.get("title"))
+    if not title:
+        return None
+    published = _published(raw.get("published"))
+    if published is None:
+        return None
+    summary = _clean(raw.get("summary"))
+    key = raw.get("guid") or raw.get("url") or title
+    return {
+        "id": hashlib.blake2b(f"{feed.name}\0{key}".encode(), digest_size=8).hexdigest(),
+        "key": key,
+        "feed": feed.name,
+        "title": title,
+        "summary": summary,
+        "url": raw.get("url") or "",
+        "source": raw.get("source") or feed.name,
+        "published": published.isoformat(),
+        "published_ns": int(published.value),
+        "symbols": tagger.tag(f"{title} {summary}"),
+        "duplicate_of": None,
+    }
+
+
+# -------------------------
+# Storage
+# -------------------------
+class NewsStore:
+    """
+    Append-only article log with an in-memory view of the unique stories
+
+    add() drops items already stored (same feed and guid/url), checks the
+    rest against the duplicate index and appends them in one write. Every
+    reader method first calls refresh(), which reads only the bytes appended
+    since the last call, so a page process sees what the ingestor (in this
+    or another process) stored without re-reading the file.
+
+    The search index, the bulk of the work when a process first replays the
+    log, is also snapshotted next to the log (`<log>.index.npz`, tagged with
+    the log offset it covers) every NEWS_INDEX_SNAPSHOT_EVERY articles. A new
+    process loads it and indexes only the articles after it; the rest of
+    the log is still read for the article view.
+    """
+
+    def __init__(self, path=NEWS_STORE_PATH):
+        self.path = path
+        self._articles = {}  # id -> canonical article, with "also" listing its syndicated copies
+        self._keys = set()
+        self._watermarks = {}
+        self._timeline = []  # (published_ns, id) of canonical articles, ascending
+        self._order = []  # ids of canonical articles in the order they were stored
+        self._symbol_timelines = {}
+        self._duplicates = DuplicateIndex()
+        self._index_path = f"{path}.index.npz"
+        self._index = InvertedIndex()
+        self._snapshot_docs = 0
+        loaded = InvertedIndex.load(self._index_path)
+        if loaded is not None and os.path.exists(path) and os.path.getsize(path) >= loaded[1]:
+            self._index = loaded[0]
+            self._snapshot_docs = len(self._index)
+        self._newest_ns = 0
+        self._offset = 0
+        self._lock = threading.RLock()
+        self.refresh()
+
+    def __len__(self):
+        return len(self._articles)
+
+    def _apply(self, record, signature=None):
+        """Fold one record into the in-memory view (lock held)"""
+        self._keys.add((record["feed"], record["key"]))
+        self._newest_ns = max(self._newest_ns, record["published_ns"])
+        self._watermarks[record["feed"]] = max(self._watermarks.get(record["feed"], 0), record["published_ns"])
+        canonical = self._articles.get(record["duplicate_of"])
+        if canonical is not None:
+            canonical["also"].append({"source": record["source"], "url": record["url"]})
+            return
+        article = dict(record, also=[])
+        self._articles[record["id"]] = article
+        self._order.append(record["id"])
+        entry = (record["published_ns"], record["id"])
+        bisect.insort(self._timeline, entry)
+        for symbol in record["symbols"]:
+            bisect.insort(self._symbol_timelines.setdefault(symbol, []), entry)
+        self._index_article(article)
+        # Only recent articles can still be copied, older ones need no signature
+        if record["published_ns"] >= self._newest_ns - self._duplicates.window_ns:
+            if signature is None:
+                signature = minhash(tokenize(f"{record['title']} {record['summary']}"))
+            self._duplicates.add(record["id"], signature, record["published_ns"])
+
+    def _index_article(self, article):
+        """Add the newest canonical article to the search index, unless a loaded snapshot already holds it (lock held)"""
+        doc = len(self._order) - 1
+        if doc >= len(self._index):
+            self._index.add(article["id"], article["title"], article["summary"], article["symbols"])
+        elif self._index.ids[doc] != article["id"]:
+            # The snapshot does not match this log (e.g. it was replaced): rebuild from the articles read so far
+            self._index = InvertedIndex()
+            self._snapshot_docs = 0
+            for article_id in self._order:
+                stored = self._articles[article_id]
+                self._index.add(article_id, stored["title"], stored["summary"], stored["symbols"])
+
+    def _snapshot_index(self):
+        """Rewrite the index snapshot once enough articles were indexed since the last one (lock held)"""
+        if len(self._index) - self._snapshot_docs < NEWS_INDEX_SNAPSHOT_EVERY or len(self._index) > len(self._order):
+            return
+        try:
+            self._index.save(self._index_path, self._offset)
+        except OSError:
+            return
+        self._snapshot_docs = len(self._index)
+
+    def refresh(self):
+        """Apply records appended to the file since the last refresh; returns them"""
+        with self._lock:
+            try:
+                with open(self.path, "rb") as f:
+                    f.seek(self._offset)
+                    data = f.read()
+            except FileNotFoundError:
+                return []
+            # A writer may be mid-line: stop at the last complete record
+            end = data.rfind(b"\n") + 1
+            records = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+            self._offset += end
+            # Replaying a long log: skip signatures for articles already outside the duplicate window
+            self._newest_ns = max([self._newest_ns] + [record["published_ns"] for record in records])
+            for record in records:
+                self._apply(record)
+            self._duplicates.prune(self._newest_ns - self._duplicates.window_ns)
+            self._snapshot_index()
+            return records
+
+    def watermark(self, feed):
+        """Newest publish time (ns) stored for a feed, or None"""
+        self.refresh()
+        return self._watermarks.get(feed)
+
+    def add(self, records):
+        """
+        Store new records, collapsing near-duplicates
+
+        Returns:
+            list[dict]: The records appended, in order (duplicates carry duplicate_of)
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # The file lock spans refresh and append, so another process's
+        # ingestor (e.g. `python -m core.news --loop` next to the app) can
+        # neither write between them nor store the same item again
+        with self._lock, open(self.path, "ab") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            self.refresh()
+            added = []
+            for record in records:
+                if (record["feed"], record["key"]) in self._keys:
+                    continue
+                signature = minhash(tokenize(f"{record['title']} {record['summary']}"))
+                record = dict(record, duplicate_of=self._duplicates.find(signature, record["published_ns"]))
+                self._apply(record, signature)
+                added.append(record)
+            self._duplicates.prune(self._newest_ns - self._duplicates.window_ns)
+            if added:
+                f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in added).encode("utf-8"))
+                f.flush()
+                self._offset = f.tell()  # nothing was written since the refresh above
+                self._snapshot_index()
+            return added  # closing the file releases the lock
+
+    def get(self, article_id):
+        self.refresh()
+        return self._articles.get(article_id)
+
+    def latest(self, limit=20, symbol=None):
+        """Newest unique articles first, optionally only those tagged with a symbol"""
+        self.refresh()
+        with self._lock:
+            timeline = self._timeline if symbol is None else self._symbol_timelines.get(symbol.upper(), [])
+            return [self._articles[article_id] for _, article_id in reversed(timeline[-limit:])] if limit else []
+
+    def articles(self):
+        """Every unique article in publish order"""
+        self.refresh()
+        with self._lock:
+            return [self._articles[article_id] for _, article_id in self._timeline]
+
+    def since(self, position=0):
+        """
+        Unique articles stored after the first `position` ones
+
+        Returns:
+            tuple: (list of articles in the order they were stored, position to pass next time)
+        """
+        self.refresh()
+        with self._lock:
+            return [self._articles[article_id] for article_id in self._order[position:]], len(self._order)
+
+    def symbols(self):
+        """Symbols at least one stored article is tagged with"""
+        self.refresh()
+        with self._lock:
+            return sorted(self._symbol_timelines)
+
+    def search(self, query, symbol=None, limit=20):
+        """Unique articles matching a free-text query, best BM25 match first, as (article, score)"""
+        self.refresh()
+        with self._lock:
+            return [(self._articles[article_id], score) for article_id, score in self._index.search(query, symbol, limit)]
+
+    def compact(self):
+        """Pack the search postings buffered since the last compaction"""
+        with self._lock:
+            self._index.compact()
+
+
+# -------------------------
+# Ingestion
+# -------------------------
+class NewsIngestor:
+    """
+    One background thread per process that polls every feed and stores new
+    items, in the same shape as core.market_poller.MarketDataPoller.
+
+    Each poll streams a feed from its watermark and stores items in batches
+    of NEWS_BATCH_SIZE as they arrive. Listeners get every batch of newly
+    stored records (duplicates included, flagged by duplicate_of), which is
+    how derived views stay current without rescanning the store.
+    """
+
+    def __init__(self, feeds, store, interval=NEWS_POLL_INTERVAL, batch_size=NEWS_BATCH_SIZE):
+        self.feeds = feeds
+        self.store = store
+        self.interval = interval
+        self.batch_size = batch_size
+        self.last_poll = None
+        self.errors = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._tagger = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="news-ingestor", daemon=True)
+                self._thread.start()
+
+    def add_listener(self, callback):
+        """Call callback(records) from the ingestor thread after every stored batch"""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def _store(self, batch):
+        added = self.store.add(batch)
+        if added:
+            for callback in list(self._listeners):
+                try:
+                    callback(added)
+                except Exception:
+                    pass
+        return added
+
+    def poll_once(self):
+        """Stream every feed once and store what is new; returns the number of records stored"""
+        with self._poll_lock:
+            if self._tagger is None:
+                self._tagger = SymbolTagger(get_instrument_master().all_symbols(equity_only=False) + list(NEWS_SYMBOL_ALIASES.values()))
+            stored = 0
+            for feed in self.feeds:
+                batch = []
+                try:
+                    for raw in feed.stream(since_ns=self.store.watermark(feed.name)):
+                        record = normalize(raw, feed, self._tagger)
+                        if record is not None:
+                            batch.append(record)
+                        if len(batch) >= self.batch_size:
+                            stored += len(self._store(batch))
+                            batch = []
+                    self.errors.pop(feed.name, None)
+                except Exception as exc:
+                    self.errors[feed.name] = str(exc)
+                stored += len(self._store(batch))
+            self.store.compact()
+            self.last_poll = pd.Timestamp.now(tz=MARKET_TIMEZONE)
+            return stored
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            self.poll_once()
+            self._wake.wait(self.interval)
+
+
+# Create singleton instances, one store per file and one ingestor per process
+_news_stores = {}
+_news_ingestor = None
+_news_lock = threading.Lock()
+
+def get_news_store(path=NEWS_STORE_PATH) -> NewsStore:
+    store = _news_stores.get(path)
+    if store is None:
+        with _news_lock:
+            store = _news_stores.get(path)
+            if store is None:
+                store = _news_stores[path] = NewsStore(path)
+    return store
+
+def get_news_ingestor() -> NewsIngestor:
+    """Get or create the process-wide ingestor, starting its thread on first use"""
+    global _news_ingestor
+    if _news_ingestor is None:
+        store = get_news_store()
+        with _news_lock:
+            if _news_ingestor is None:
+                _news_ingestor = NewsIngestor(build_feeds(), store)
+                _news_ingestor.start()
+    return _news_ingestor
+
+
+def _news_item(article):
+    return {
+        "title": article["title"],
+        "summary": article["summary"],
+        "url": article["url"],
+        "source": article["source"],
+        "published": pd.Timestamp(article["published"]).strftime("%Y-%m-%d %H:%M"),
+        "published_ns": article["published_ns"],
+        "symbols": article["symbols"],
+        "also": [copy["source"] for copy in article["also"]],
+    }
+
+def get_latest_news(limit=20, symbol=None):
+    """Newest stored stories (never fetches; the ingestor keeps the store current)"""
+    return [_news_item(article) for article in get_news_store().latest(limit, symbol)]
+
+def search_news(query, limit=20, symbol=None):
+    """Stored stories matching a query, best match first, each with its BM25 "score" """
+    return [dict(_news_item(article), score=score) for article, score in get_news_store().search(query, symbol, limit)]
+
+
+def time_ago(published_ns, now=None):
+    """Short relative age such as "5m ago", "3h ago" or "2d ago" """
+    seconds = max(0, ((now or time.time_ns()) - published_ns) // 1_000_000_000)
+    if seconds < 3600:
+        return f"{seconds // 60}m ago"
+    if seconds < 86400:
+        return f"{seconds // 3600}h ago"
+    return f"{seconds // 86400}d ago"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Poll the configured news feeds into the local store")
+    parser.add_argument("--loop", action="store_true", help="keep polling every NEWS_POLL_INTERVAL seconds")
+    args = parser.parse_args(argv)
+
+    ingestor = NewsIngestor(build_feeds(), get_news_store())
+    while True:
+        started = time.perf_counter()
+        stored = ingestor.poll_once()
+        errors = "".join(f"\n  {feed}: {error}" for feed, error in ingestor.errors.items())
+        print(f"{stored} new items, {len(ingestor.store)} stories stored ({time.perf_counter() - started:.2f}s){errors}")
+        if not args.loop:
+            break
+        time.sleep(ingestor.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import math
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from core.screener_filters import FilterTable, column_key
+
+PAGE_SIZES = (25, 50, 100, 250)
+
+CellStyle = Callable[[np.ndarray], np.ndarray]
+
+
+def threshold_colors(high: float, low: float, high_css: str = "color: green", low_css: str = "color: red") -> CellStyle:
+    """Vectorized style: high_css above `high`, low_css below `low`"""
+    def style(values):
+        values = np.asarray(values, dtype=np.float64)
+        return np.where(values > high, high_css, np.where(values < low, low_css, ""))
+    return style
+
+def value_colors(colors: Dict[str, str], default: str = "") -> CellStyle:
+    """Vectorized style from an exact value -> CSS mapping"""
+    def style(values):
+        values = np.asarray(values, dtype=object)
+        return np.select([values == value for value in colors], list(colors.values()), default=default)
+    return style
+
+
+def style_page(page: pd.DataFrame, cell_styles: Dict[str, CellStyle]):
+    """
+    Styler for one page, with every column's CSS computed as a whole-column mask
+
+    Replaces per-cell Styler.applymap lambdas: a single apply(axis=None)
+    returns the complete CSS frame.
+    """
+    css = pd.DataFrame("", index=page.index, columns=page.columns)
+    for column, style in cell_styles.items():
+        if column in page.columns:
+            css[column] = style(page[column].to_numpy())
+    return page.style.apply(lambda _: css, axis=None)
+
+
+def paged_table(
+    table: FilterTable,
+    rows: np.ndarray,
+    key: str,
+    columns: Optional[Sequence[str]] = None,
+    cell_styles: Optional[Dict[str, CellStyle]] = None,
+    default_sort: Optional[str] = None,
+    descending: bool = False,
+) -> pd.DataFrame:
+    """
+    Sort and paginate filter results on the server, rendering only the visible page
+
+    Args:
+        table (FilterTable): Indexed table the rows refer to
+        rows (np.ndarray): Positional rows to show, e.g. table.filter(expression)
+        key (str): Widget key prefix, unique per table on a page
+        columns (Sequence[str] | None): Columns to display, defaults to all
+        cell_styles (dict | None): Column -> vectorized CSS function (see threshold_colors)
+        default_sort (str | None): Column sorted by initially
+        descending (bool): Initial sort direction
+
+    Returns:
+        pd.DataFrame: The page that was rendered
+    """
+    frame = table.frame
+    columns = list(columns or frame.columns)
+
+    sort_col, order_col, size_col = st.columns([3, 2, 2])
+    with sort_col:
+        sort_by = st.selectbox(
+            "Sort by",
+            columns,
+            index=columns.index(default_sort) if default_sort in columns else 0,
+            key=f"{key}_sort",
+        )
+    with order_col:
+        direction = st.radio(
+            "Order",
+            ["Ascending", "Descending"],
+            index=1 if descending else 0,
+            horizontal=True,
+            key=f"{key}_order",
+        )
+    with size_col:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+
+    pages = max(1, math.ceil(len(rows) / page_size))
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        # The filter shrank the result below the page the user was on
+        st.session_state[f"{key}_page"] = pages
+    page_number = int(st.number_input("Page", min_value=1, max_value=pages, step=1, key=f"{key}_page"))
+
+    ordered = table.sort(rows, column_key(sort_by), descending=direction == "Descending")
+    start = (page_number - 1) * page_size
+    page = frame.iloc[ordered[start:start + page_size]][columns]
+
+    st.dataframe(style_page(page, cell_styles or {}), use_container_width=True, hide_index=True)
+    st.caption(f"Page {page_number} of {pages} · rows {start + 1 if len(rows) else 0}–{start + len(page)} of {len(rows)}")
+    return page
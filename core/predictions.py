@@ -1,33 +1,618 @@
 # core/predictions.py
 
+import copy
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-import random
-
-def get_prediction_for_stock(symbol: str):
-    today = datetime.today()
-    
-    # Mock historical
-    historical = pd.DataFrame({
-        "Date": [today - timedelta(days=i) for i in range(30)][::-1],
-        "Price": [round(1000 + i + random.uniform(-10, 10), 2) for i in range(30)]
-    })
-
-    # Mock forecast
-    forecast = pd.DataFrame({
-        "Date": [today + timedelta(days=i) for i in range(1, 11)],
-        "Forecast": [round(historical["Price"].iloc[-1] + i*5 + random.uniform(-5, 5), 2) for i in range(1, 11)]
-    })
-
-    return historical, forecast
-
-def get_prediction_summary(symbol: str):
-    return pd.DataFrame({
-        "Metric": ["Next Day", "5-Day Avg", "10-Day Target"],
-        "Forecast Price (₹)": [
-            round(1050 + random.uniform(-10, 10), 2),
-            round(1075 + random.uniform(-10, 10), 2),
-            round(1100 + random.uniform(-10, 10), 2)
-        ],
-        "Confidence": ["High", "Medium", "Medium"]
-    })
+
+from config.settings import (
+    FORECAST_CACHE_MAX_ENTRIES,
+    FORECAST_HISTORY_BARS,
+    FORECAST_HISTORY_PERIOD,
+    FORECAST_HORIZON,
+    FORECAST_MODEL,
+    FORECAST_REFIT_BARS,
+    FORECAST_WORKERS,
+    MARKET_TIMEZONE,
+)
+from core.bar_store import to_ns
+from core.fetch_planner import get_bars, get_bars_many
+from core.model_store import get_model_store
+from core.screener import Universe
+
+# Every model works on log closes, so trends and errors are in relative terms
+# and forecasts can never go negative. Prediction bands are +/- Z_95 standard
+# errors of the one-step residuals, widened with the square root of the horizon.
+Z_95 = 1.96
+HISTORY_BARS_SHOWN = 30
+
+
+class ForecastModel(ABC):
+    """
+    A forecaster fitted to one symbol's daily closes
+
+    fit() estimates parameters on the full history. Given the model fitted on
+    an earlier prefix of the same bars (warm=...), it instead carries that
+    model's state forward over the new bars only, and re-estimates parameters
+    once FORECAST_REFIT_BARS bars have been absorbed that way.
+    """
+
+    name = None
+    label = None
+    min_bars = 30
+
+    def __init__(self):
+        self.last_ts = None
+        self.last_close = np.nan
+        self.bars = 0
+        self.refit_at = 0  # value of `bars` at the last full parameter fit
+        self.sigma = np.nan
+        self.warm_started = False
+
+    def fit(self, ts, closes, warm=None):
+        ts = np.asarray(ts, dtype=np.int64)
+        closes = np.asarray(closes, dtype=np.float64)
+        if len(closes) < self.min_bars:
+            raise ValueError(f"{self.label} needs at least {self.min_bars} bars, got {len(closes)}")
+
+        new = self._bars_after(warm, ts, closes)
+        if new is not None and warm.bars + len(new) - warm.refit_at < FORECAST_REFIT_BARS:
+            vars(self).update(copy.deepcopy(vars(warm)))
+            if len(new):
+                self._extend(np.log(new))
+            self.bars += len(new)
+            self.warm_started = True
+        else:
+            self._fit(np.log(closes))
+            self.bars = self.refit_at = len(closes)
+            self.warm_started = False
+        self.last_ts = int(ts[-1])
+        self.last_close = float(closes[-1])
+        return self
+
+    def _bars_after(self, warm, ts, closes):
+        """Closes after warm's last bar, or None when warm does not continue these bars"""
+        if warm is None or type(warm) is not type(self) or warm.last_ts is None:
+            return None
+        position = np.searchsorted(ts, warm.last_ts)
+        if position >= len(ts) or ts[position] != warm.last_ts or closes[position] != warm.last_close:
+            return None
+        return closes[position + 1:]
+
+    def forecast(self, horizon):
+        """(mean, lower, upper) price arrays for the next `horizon` bars"""
+        steps = np.arange(1, horizon + 1)
+        mean = self._forecast_log(horizon)
+        spread = Z_95 * self.sigma * np.sqrt(steps)
+        return np.exp(mean), np.exp(mean - spread), np.exp(mean + spread)
+
+    @classmethod
+    def forecast_batch(cls, closes, horizon):
+        """
+        Fit and forecast many symbols at once with array operations
+
+        Args:
+            closes (np.ndarray): Shape (N, T), each row right-aligned with
+                leading NaN where a symbol has fewer bars
+            horizon (int): Bars to forecast
+
+        Returns:
+            tuple: (mean, lower, upper) price arrays of shape (N, horizon)
+        """
+        steps = np.arange(1, horizon + 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean, sigma = cls._batch_forecast_log(np.log(closes), horizon)
+            spread = Z_95 * sigma[:, None] * np.sqrt(steps)
+        return np.exp(mean), np.exp(mean - spread), np.exp(mean + spread)
+
+    @abstractmethod
+    def _fit(self, log_closes):
+        """Estimate parameters and state from the full log-close history"""
+
+    @abstractmethod
+    def _extend(self, log_closes):
+        """Carry the fitted state forward over new log closes, keeping parameters"""
+
+    @abstractmethod
+    def _forecast_log(self, horizon):
+        """Mean log price for the next `horizon` bars"""
+
+    @classmethod
+    @abstractmethod
+    def _batch_forecast_log(cls, log_closes, horizon):
+        """(mean log price (N, horizon), one-step sigma (N,)) for a padded (N, T) panel"""
+
+
+class DriftModel(ForecastModel):
+    """Random walk with drift: tomorrow's log price is today's plus the mean daily log return"""
+
+    name = "drift"
+    label = "Random walk + drift"
+
+    def _fit(self, log_closes):
+        returns = np.diff(log_closes)
+        self.count = len(returns)
+        self.total = returns.sum()
+        self.total_sq = np.square(returns).sum()
+        self.last_log = log_closes[-1]
+        self._update_sigma()
+
+    def _extend(self, log_closes):
+        returns = np.diff(np.concatenate([[self.last_log], log_closes]))
+        self.count += len(returns)
+        self.total += returns.sum()
+        self.total_sq += np.square(returns).sum()
+        self.last_log = log_closes[-1]
+        self._update_sigma()
+
+    def _update_sigma(self):
+        self.drift = self.total / self.count
+        self.sigma = np.sqrt(max(self.total_sq / self.count - self.drift ** 2, 0.0))
+
+    def _forecast_log(self, horizon):
+        return self.last_log + self.drift * np.arange(1, horizon + 1)
+
+    @classmethod
+    def _batch_forecast_log(cls, log_closes, horizon):
+        returns = np.diff(log_closes, axis=1)
+        valid = ~np.isnan(returns)
+        count = valid.sum(axis=1)
+        drift = np.where(valid, returns, 0.0).sum(axis=1) / count
+        mean_sq = np.where(valid, np.square(returns), 0.0).sum(axis=1) / count
+        sigma = np.sqrt(np.maximum(mean_sq - drift ** 2, 0.0))
+        return log_closes[:, -1:] + drift[:, None] * np.arange(1, horizon + 1), sigma
+
+
+HOLT_ALPHAS = np.linspace(0.1, 0.9, 9)
+HOLT_BETAS = np.array([0.0, 0.01, 0.02, 0.05, 0.1, 0.2])
+
+def holt_filter(log_closes, level, trend, alpha, beta):
+    """
+    Run Holt's linear trend recurrence over log closes
+
+    level, trend, alpha and beta are arrays of one shape (e.g. one entry per
+    candidate parameter pair); every step is element-wise over them.
+
+    Returns:
+        tuple: (level, trend, sum of squared one-step errors)
+    """
+    sse = np.zeros(np.shape(level))
+    for value in log_closes:
+        predicted = level + trend
+        sse += np.square(value - predicted)
+        new_level = alpha * value + (1 - alpha) * predicted
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        level = new_level
+    return level, trend, sse
+
+def holt_grid_search(log_closes):
+    """
+    Fit Holt's method to every row of an (N, T) panel of log closes at once
+
+    Each row is filtered with every (alpha, beta) on the HOLT_ALPHAS x
+    HOLT_BETAS grid in one pass over time, on (N, grid) arrays. A row starts
+    at its own first two bars (level = first bar, trend = second - first),
+    so leading NaN padding is skipped, and keeps the pair with the smallest
+    sum of squared one-step errors.
+
+    Returns:
+        dict: alpha, beta, level, trend, sse and count (errors summed), one entry per row
+    """
+    alpha, beta = (grid.ravel() for grid in np.meshgrid(HOLT_ALPHAS, HOLT_BETAS))
+    shape = (log_closes.shape[0], len(alpha))
+    level = np.full(shape, np.nan)
+    trend = np.full(shape, np.nan)
+    sse = np.zeros(shape)
+    seen = np.zeros(shape[0], dtype=np.int64)
+    for value in np.ascontiguousarray(log_closes.T):
+        valid = ~np.isnan(value)
+        first = (valid & (seen == 0))[:, None]
+        step = (valid & (seen >= 1))[:, None]
+        value = value[:, None]
+        trend = np.where((valid & (seen == 1))[:, None], value - level, trend)
+        predicted = level + trend
+        new_level = alpha * value + (1 - alpha) * predicted
+        sse = np.where(step, sse + np.square(value - predicted), sse)
+        trend = np.where(step, beta * (new_level - level) + (1 - beta) * trend, trend)
+        level = np.where(first, value, np.where(step, new_level, level))
+        seen += valid
+
+    best = np.argmin(sse, axis=1)[:, None]
+    return {
+        "alpha": alpha[best[:, 0]],
+        "beta": beta[best[:, 0]],
+        "level": np.take_along_axis(level, best, axis=1)[:, 0],
+        "trend": np.take_along_axis(trend, best, axis=1)[:, 0],
+        "sse": np.take_along_axis(sse, best, axis=1)[:, 0],
+        "count": np.maximum(seen - 1, 0),
+    }
+
+
+class HoltModel(ForecastModel):
+    """Holt's linear exponential smoothing, (alpha, beta) picked by grid search on one-step error"""
+
+    name = "holt"
+    label = "Holt exponential smoothing"
+
+    def _fit(self, log_closes):
+        fit = {name: values[0] for name, values in holt_grid_search(log_closes[None, :]).items()}
+        self.alpha, self.beta = float(fit["alpha"]), float(fit["beta"])
+        self.level, self.trend = float(fit["level"]), float(fit["trend"])
+        self.sse, self.count = float(fit["sse"]), int(fit["count"])
+        self.sigma = np.sqrt(self.sse / self.count)
+
+    def _extend(self, log_closes):
+        level, trend, sse = holt_filter(log_closes, self.level, self.trend, self.alpha, self.beta)
+        self.level, self.trend = float(level), float(trend)
+        self.sse += float(sse)
+        self.count += len(log_closes)
+        self.sigma = np.sqrt(self.sse / self.count)
+
+    def _forecast_log(self, horizon):
+        return self.level + self.trend * np.arange(1, horizon + 1)
+
+    @classmethod
+    def _batch_forecast_log(cls, log_closes, horizon):
+        fit = holt_grid_search(log_closes)
+        sigma = np.sqrt(fit["sse"] / fit["count"])
+        return fit["level"][:, None] + fit["trend"][:, None] * np.arange(1, horizon + 1), sigma
+
+
+AR_ORDER = 5
+AR_RIDGE = 1e-8  # keeps the normal equations solvable on flat series
+
+def ar_normal_equations(returns):
+    """
+    X'X, X'y, y'y and row count of the AR regression for each row of (N, R) returns
+
+    Regression rows touching NaN (padding before a symbol's first bar) are left out.
+    """
+    windows = np.lib.stride_tricks.sliding_window_view(returns, AR_ORDER + 1, axis=1)
+    valid = ~np.isnan(windows).any(axis=2)
+    # Row t: [1, r(t-1), ..., r(t-p)] -> r(t)
+    x = np.concatenate([np.ones(windows.shape[:2] + (1,)), windows[..., -2::-1]], axis=2)
+    x = np.where(valid[..., None], x, 0.0)
+    y = np.where(valid, windows[..., -1], 0.0)
+    return np.einsum("nri,nrj->nij", x, x), np.einsum("nri,nr->ni", x, y), np.einsum("nr,nr->n", y, y), valid.sum(axis=1)
+
+def ar_solve(xtx, xty, yty, count):
+    """(coefficients (N, AR_ORDER + 1), residual sigma (N,)) from stacked normal equations"""
+    coef = np.linalg.solve(xtx + AR_RIDGE * np.eye(AR_ORDER + 1), xty[..., None])[..., 0]
+    residual = yty - 2 * np.einsum("ni,ni->n", coef, xty) + np.einsum("ni,nij,nj->n", coef, xtx, coef)
+    return coef, np.sqrt(np.maximum(residual, 0.0) / np.maximum(count - AR_ORDER - 1, 1))
+
+def ar_forecast_log(coef, lags, last_log, horizon):
+    """Iterate the fitted AR forward; lags is (N, AR_ORDER), oldest return first"""
+    path = np.empty((len(coef), horizon))
+    for step in range(horizon):
+        # coef[:, 1] multiplies the latest return
+        path[:, step] = coef[:, 0] + np.einsum("ni,ni->n", coef[:, 1:], lags[:, ::-1])
+        lags = np.concatenate([lags[:, 1:], path[:, step:step + 1]], axis=1)
+    return last_log[:, None] + np.cumsum(path, axis=1)
+
+class ARModel(ForecastModel):
+    """
+    AR(p) on daily log returns, least squares via accumulated normal equations
+
+    X'X and X'y are kept, so a warm start only adds the rows for new bars.
+    """
+
+    name = "ar"
+    label = f"Autoregressive AR({AR_ORDER})"
+    min_bars = 4 * AR_ORDER + 2
+
+    def _fit(self, log_closes):
+        self.xtx = np.zeros((AR_ORDER + 1, AR_ORDER + 1))
+        self.xty = np.zeros(AR_ORDER + 1)
+        self.yty = 0.0
+        self.count = 0
+        self.lags = np.empty(0)
+        self.last_log = log_closes[0]
+        self._extend(log_closes[1:])
+
+    def _extend(self, log_closes):
+        returns = np.concatenate([self.lags, np.diff(np.concatenate([[self.last_log], log_closes]))])
+        if len(returns) > AR_ORDER:
+            xtx, xty, yty, count = ar_normal_equations(returns[None, :])
+            self.xtx += xtx[0]
+            self.xty += xty[0]
+            self.yty += float(yty[0])
+            self.count += int(count[0])
+        self.lags = returns[-AR_ORDER:]
+        self.last_log = log_closes[-1]
+
+        coef, sigma = ar_solve(self.xtx[None], self.xty[None], np.array([self.yty]), np.array([self.count]))
+        self.coef, self.sigma = coef[0], float(sigma[0])
+
+    def _forecast_log(self, horizon):
+        return ar_forecast_log(self.coef[None], self.lags[None], np.array([self.last_log]), horizon)[0]
+
+    @classmethod
+    def _batch_forecast_log(cls, log_closes, horizon):
+        returns = np.diff(log_closes, axis=1)
+        coef, sigma = ar_solve(*ar_normal_equations(returns))
+        return ar_forecast_log(coef, returns[:, -AR_ORDER:], log_closes[:, -1], horizon), sigma
+
+
+MODELS = {model.name: model for model in (HoltModel, ARModel, DriftModel)}
+
+
+class Forecast:
+    """A model's forecast from one symbol's bars up to last_ts"""
+
+    def __init__(self, symbol, model, last_ts, last_close, dates, mean, lower, upper, fit_seconds, warm_started):
+        self.symbol = symbol
+        self.model = model
+        self.last_ts = last_ts
+        self.last_close = last_close
+        self.dates = dates
+        self.mean = mean
+        self.lower = lower
+        self.upper = upper
+        self.fit_seconds = fit_seconds
+        self.warm_started = warm_started
+
+    def frame(self):
+        return pd.DataFrame({
+            "Date": self.dates,
+            "Forecast": self.mean.round(2),
+            "Lower": self.lower.round(2),
+            "Upper": self.upper.round(2),
+        })
+
+    def summary(self):
+        """Next day / 5-day average / horizon target, with confidence from the band width"""
+        targets = [self.mean[0], self.mean[:5].mean(), self.mean[-1]]
+        widths = [
+            (self.upper[0] - self.lower[0]) / self.mean[0],
+            ((self.upper[:5] - self.lower[:5]) / self.mean[:5]).mean(),
+            (self.upper[-1] - self.lower[-1]) / self.mean[-1],
+        ]
+        return pd.DataFrame({
+            "Metric": ["Next Day", "5-Day Avg", f"{len(self.mean)}-Day Target"],
+            "Forecast Price (₹)": np.round(targets, 2),
+            "Change %": np.round((np.array(targets) / self.last_close - 1) * 100, 2),
+            "Confidence": [confidence_label(width) for width in widths],
+        })
+
+
+def confidence_label(relative_width):
+    """High/Medium/Low from the 95% band width as a fraction of the price"""
+    if relative_width < 0.05:
+        return "High"
+    if relative_width < 0.15:
+        return "Medium"
+    return "Low"
+
+def forecast_dates(last_ts, horizon):
+    """The next `horizon` weekdays after the bar at last_ts"""
+    last_day = pd.Timestamp(last_ts, tz="UTC").tz_convert(MARKET_TIMEZONE).tz_localize(None).normalize()
+    return pd.bdate_range(last_day + pd.Timedelta(days=1), periods=horizon)
+
+
+class ForecastEngine:
+    """
+    Fitted models and forecasts cached per (symbol, model, last bar timestamp)
+
+    A lookup for a bar that already has a forecast is a dictionary hit. When a
+    new bar arrives, get() returns the previous forecast straight away (marked
+    stale) and fits in a background thread, warm-started from the previous
+    model; concurrent requests for the same key share that one fit. Forecasts
+    are LRU-bounded by max_entries.
+
+    Fitted models live in the provider's ModelStore rather than in this
+    process: a symbol's model is mapped from disk on first use, so after a
+    restart (or when another server process already fitted the bar) the
+    forecast needs no fit at all.
+    """
+
+    def __init__(self, provider=None, period=FORECAST_HISTORY_PERIOD, horizon=FORECAST_HORIZON,
+                 workers=FORECAST_WORKERS, max_entries=FORECAST_CACHE_MAX_ENTRIES):
+        self.provider = provider
+        self.period = period
+        self.horizon = horizon
+        self.max_entries = max_entries
+        self.models = get_model_store(provider)
+        self._forecasts = OrderedDict()
+        self._latest = {}
+        self._pending = {}
+        self._failed = OrderedDict()  # keys whose fit raised; retried once a new bar arrives
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="forecast")
+        self._counters = {"hits": 0, "stale_hits": 0, "misses": 0, "fits": 0, "warm_fits": 0, "batch_fits": 0, "fit_errors": 0, "save_errors": 0}
+
+    def history(self, symbol):
+        return get_bars(symbol, period=self.period, interval="1d", provider=self.provider)
+
+    def get(self, symbol, model=FORECAST_MODEL, bars=None, wait=False):
+        """
+        Forecast for a symbol's latest bar
+
+        Args:
+            symbol (str): Symbol to forecast
+            model (str): Key of MODELS
+            bars (pd.DataFrame | None): Daily bars to use instead of reading history()
+            wait (bool): Block for the fit when nothing at all is cached for (symbol, model)
+
+        Returns:
+            tuple: (Forecast | None, fresh) where fresh is False while a newer
+                forecast is still being fitted; None with too little history
+                (fewer than the model's min_bars) or when the fit failed
+        """
+        if model not in MODELS:
+            raise ValueError(f"Unknown forecast model: {model}")
+        bars = bars if bars is not None else self.history(symbol)
+        if len(bars) < MODELS[model].min_bars:
+            return None, True
+        key = (symbol, model, to_ns(bars.index[-1]))
+
+        with self._lock:
+            if key in self._failed:
+                return None, True
+            forecast = self._forecasts.get(key)
+            if forecast is not None:
+                self._forecasts.move_to_end(key)
+                self._counters["hits"] += 1
+                return forecast, True
+
+        # The stored model may already cover this bar, or at least serve as the warm start
+        stored = self.models.get(symbol, model)
+        if stored is not None and stored.last_ts == key[2]:
+            return self._remember(key, stored, 0.0), True
+
+        with self._lock:
+            stale = self._forecasts.get(self._latest.get((symbol, model)))
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = self._executor.submit(self._fit, key, bars, stored)
+            self._counters["stale_hits" if stale is not None or stored is not None else "misses"] += 1
+        if stale is None and stored is not None and stored.last_ts < key[2]:
+            stale = self._remember((symbol, model, stored.last_ts), stored, 0.0)
+
+        if stale is None and wait:
+            return (None if future.exception() is not None else future.result()), True
+        return stale, False
+
+    def get_many(self, symbols, model=FORECAST_MODEL, frames=None):
+        """
+        Forecasts for many symbols, fitting every uncached one in a single vectorized batch
+
+        Cached (symbol, model, last bar) forecasts are reused; the rest are
+        fitted together with MODELS[model].forecast_batch, which costs about
+        as much as one symbol's fit plus array work proportional to the count.
+        Symbols with too little history are left out.
+
+        Returns:
+            dict: symbol -> Forecast, in the order of `symbols`
+        """
+        if model not in MODELS:
+            raise ValueError(f"Unknown forecast model: {model}")
+        symbols = list(dict.fromkeys(symbols))
+        frames = frames if frames is not None else get_bars_many(symbols, period=self.period, interval="1d", provider=self.provider)
+        forecasts, missing = {}, {}
+        with self._lock:
+            for symbol in symbols:
+                df = frames.get(symbol)
+                if df is None or len(df) < MODELS[model].min_bars:
+                    continue
+                key = (symbol, model, to_ns(df.index[-1]))
+                forecast = self._forecasts.get(key)
+                if forecast is not None:
+                    self._forecasts.move_to_end(key)
+                    self._counters["hits"] += 1
+                    forecasts[symbol] = forecast
+                else:
+                    self._counters["misses"] += 1
+                    missing[symbol] = df
+
+        if missing:
+            started = time.perf_counter()
+            universe = Universe.from_frames(missing, max_bars=FORECAST_HISTORY_BARS)
+            mean, lower, upper = MODELS[model].forecast_batch(universe.close, self.horizon)
+            elapsed = time.perf_counter() - started
+            last_close = universe.close[:, -1]
+            with self._lock:
+                self._counters["batch_fits"] += 1
+                for row, symbol in enumerate(universe.symbols):
+                    key = (symbol, model, int(universe.last_ts[row]))
+                    forecast = Forecast(
+                        symbol, model, key[2], float(last_close[row]), forecast_dates(key[2], self.horizon),
+                        mean[row], lower[row], upper[row], elapsed, False,
+                    )
+                    self._store_forecast(key, forecast)
+                    forecasts[symbol] = forecast
+        return {symbol: forecasts[symbol] for symbol in symbols if symbol in forecasts}
+
+    def _fit(self, key, bars, warm):
+        symbol, model, _ = key
+        try:
+            started = time.perf_counter()
+            fitted = MODELS[model]().fit(bars.index.asi8, bars["Close"].to_numpy(dtype=np.float64), warm=warm)
+            forecast = self._remember(key, fitted, time.perf_counter() - started)
+        except Exception:
+            with self._lock:
+                self._counters["fit_errors"] += 1
+                self._pending.pop(key, None)
+                self._failed[key] = True
+                while len(self._failed) > self.max_entries:
+                    self._failed.popitem(last=False)
+            raise
+
+        try:
+            self.models.save(symbol, fitted)
+        except OSError:
+            with self._lock:
+                self._counters["save_errors"] += 1
+        with self._lock:
+            self._counters["fits"] += 1
+            self._counters["warm_fits"] += fitted.warm_started
+            self._pending.pop(key, None)
+        return forecast
+
+    def _remember(self, key, fitted, fit_seconds):
+        """Forecast from a fitted model, cached under key"""
+        symbol, model, last_ts = key
+        mean, lower, upper = fitted.forecast(self.horizon)
+        forecast = Forecast(
+            symbol, model, last_ts, fitted.last_close, forecast_dates(last_ts, self.horizon),
+            mean, lower, upper, fit_seconds, fitted.warm_started,
+        )
+        with self._lock:
+            self._store_forecast(key, forecast)
+        return forecast
+
+    def _store_forecast(self, key, forecast):
+        """Insert, evict least recently used forecasts and track the newest bar per (symbol, model) (lock held)"""
+        self._forecasts[key] = forecast
+        self._forecasts.move_to_end(key)
+        while len(self._forecasts) > self.max_entries:
+            self._forecasts.popitem(last=False)
+        latest = self._latest.get(key[:2])
+        if latest is None or latest[2] <= key[2]:
+            self._latest[key[:2]] = key
+
+    def pending(self, symbol, model=FORECAST_MODEL):
+        with self._lock:
+            return any(key[:2] == (symbol, model) for key in self._pending)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, forecasts=len(self._forecasts), pending=len(self._pending))
+
+
+# Create singleton instances, one engine per provider
+_engines = {}
+_engines_lock = threading.Lock()
+
+def get_forecast_engine(provider=None) -> ForecastEngine:
+    """Get or create the forecast engine for a provider (defaults to MARKET_DATA_PROVIDER)"""
+    engine = _engines.get(provider)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(provider)
+            if engine is None:
+                engine = _engines[provider] = ForecastEngine(provider)
+    return engine
+
+
+def historical_frame(bars, count=HISTORY_BARS_SHOWN):
+    """Last `count` closes as a Date/Price frame for charts"""
+    bars = bars.tail(count)
+    return pd.DataFrame({"Date": bars.index.tz_localize(None), "Price": bars["Close"].to_numpy()})
+
+def get_prediction_for_stock(symbol: str, model: str = FORECAST_MODEL):
+    """(historical, forecast) frames, forecast None with too little history; blocks only for the first fit of (symbol, model)"""
+    engine = get_forecast_engine()
+    bars = engine.history(symbol)
+    forecast, _ = engine.get(symbol, model, bars=bars, wait=True)
+    return historical_frame(bars), (forecast.frame() if forecast is not None else None)
+
+def get_prediction_summary(symbol: str, model: str = FORECAST_MODEL):
+    """Forecast.summary() table (pd.DataFrame), or None with too little history"""
+    forecast, _ = get_forecast_engine().get(symbol, model, wait=True)
+    return forecast.summary() if forecast is not None else None
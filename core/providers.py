@@ -0,0 +1,589 @@
+# core/providers.py
+
+import asyncio
+import threading
+import weakref
+import zlib
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+
+import httpx
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from config.settings import (
+    ANGEL_API_KEY,
+    ANGEL_JWT_TOKEN,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE,
+    HTTP_TIMEOUT,
+    MARKET_DATA_PROVIDER,
+    MARKET_SESSION_OPEN,
+    MARKET_TIMEZONE,
+    MOCK_PROVIDER_LATENCY,
+    PROVIDER_MAX_CONCURRENCY,
+)
+from core.angel_api import BASE_PRICES, build_mock_quote
+from core.instruments import get_instrument_master
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+PERIOD_DELTAS = {
+    "1d": timedelta(days=1),
+    "5d": timedelta(days=5),
+    "1mo": timedelta(days=31),
+    "3mo": timedelta(days=92),
+    "6mo": timedelta(days=183),
+    "1y": timedelta(days=366),
+    "2y": timedelta(days=731),
+    "5y": timedelta(days=1827),
+    "10y": timedelta(days=3653),
+    "max": timedelta(days=7305),
+}
+# Like yfinance, these periods count trading sessions rather than calendar days
+SESSION_PERIODS = {"1d": 1, "5d": 5}
+
+INTERVAL_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+
+class MarketDataError(Exception):
+    """Raised when a provider cannot serve a request"""
+
+
+def sessions_start(end, sessions):
+    """
+    Midnight (market time) of the `sessions`-th latest weekday session opened by `end`
+
+    Before the open, or on a weekend, the latest session is the previous
+    weekday's. Exchange holidays are not known here; callers that need
+    exactly N sessions widen the count and trim to the sessions they got.
+    """
+    day = end.normalize()
+    if end < day + pd.Timedelta(f"{MARKET_SESSION_OPEN}:00"):
+        day -= pd.Timedelta(days=1)
+    day = pd.offsets.BDay().rollback(day)
+    return day - pd.offsets.BDay(sessions - 1)
+
+def period_to_range(period, end=None):
+    """Convert a yfinance-style period ("5d", "1y", "ytd") into a (start, end) Timestamp pair"""
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp.now(tz=MARKET_TIMEZONE)
+    if end.tzinfo is None:
+        end = end.tz_localize(MARKET_TIMEZONE)
+    if period in SESSION_PERIODS:
+        return sessions_start(end, SESSION_PERIODS[period]), end
+    if period == "ytd":
+        return end.normalize().replace(month=1, day=1), end
+    if period not in PERIOD_DELTAS:
+        raise ValueError(f"Unsupported period: {period}")
+    return end - PERIOD_DELTAS[period], end
+
+def empty_history():
+    """An empty OHLCV frame with the same layout as yfinance history"""
+    index = pd.DatetimeIndex([], tz=MARKET_TIMEZONE, name="Date")
+    return pd.DataFrame({column: pd.Series(dtype="float64") for column in OHLCV_COLUMNS}, index=index)
+
+def quote_from_daily_bars(symbol, df):
+    """Build a quote dict from the last two daily bars"""
+    price = float(df["Close"].iloc[-1])
+    previous_close = float(df["Close"].iloc[-2]) if len(df) > 1 else price
+    change = price - previous_close
+    return {
+        "symbol": symbol,
+        "price": round(price, 2),
+        "open": round(float(df["Open"].iloc[-1]), 2),
+        "previous_close": round(previous_close, 2),
+        "change": round(change, 2),
+        "change_percent": round((change / previous_close) * 100, 2) if previous_close else 0.0,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+def quotes_from_batch(closes, opens, symbols=None):
+    """
+    Build quote dicts for many tickers at once from wide daily-bar frames
+
+    Args:
+        closes (pd.DataFrame): Close prices, one column per ticker (NaN where a ticker has no bar)
+        opens (pd.DataFrame): Open prices with the same shape
+        symbols (dict | None): Maps column names back to the requested symbols
+
+    Returns:
+        dict: Quote dicts (same shape as quote_from_daily_bars) keyed by symbol
+    """
+    valid = closes.notna()
+    # Valid bars at or after each row: 1 marks a ticker's last bar, 2 the one before it
+    remaining = valid[::-1].cumsum()[::-1]
+    price = closes.where(valid & (remaining == 1)).max()
+    previous_close = closes.where(valid & (remaining == 2)).max().fillna(price)
+    open_price = opens.where(valid & (remaining == 1)).max()
+    change = price - previous_close
+    change_percent = (change / previous_close.where(previous_close != 0)) * 100
+
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    symbols = symbols or {}
+    quotes = {}
+    for column in price.index[price.notna()]:
+        symbol = symbols.get(column, column)
+        quotes[symbol] = {
+            "symbol": symbol,
+            "price": round(float(price[column]), 2),
+            "open": round(float(open_price[column]), 2),
+            "previous_close": round(float(previous_close[column]), 2),
+            "change": round(float(change[column]), 2),
+            "change_percent": round(float(change_percent[column]), 2) if pd.notna(change_percent[column]) else 0.0,
+            "timestamp": timestamp,
+        }
+    return quotes
+
+
+# -------------------------
+# Shared HTTP pool
+# -------------------------
+_http_clients = weakref.WeakKeyDictionary()
+
+def get_http_client() -> httpx.AsyncClient:
+    """Pooled AsyncClient shared by every provider running on the current event loop"""
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_KEEPALIVE),
+        )
+        _http_clients[loop] = client
+    return client
+
+
+class MarketDataProvider(ABC):
+    """
+    Async market data backend
+
+    Every request a backend makes goes through its own semaphore, so fanning
+    out hundreds of symbols never exceeds PROVIDER_MAX_CONCURRENCY[name].
+    """
+
+    name = None
+
+    def __init__(self, max_concurrency=None):
+        self.max_concurrency = max_concurrency or PROVIDER_MAX_CONCURRENCY.get(self.name, 10)
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    @abstractmethod
+    async def get_quote(self, symbol):
+        """Latest quote dict for one symbol, or None if unavailable"""
+
+    @abstractmethod
+    async def get_history(self, symbol, period="1mo", interval="1d", start=None, end=None):
+        """OHLCV DataFrame indexed by bar start time (yfinance layout)"""
+
+    async def get_quotes(self, symbols):
+        """Quotes for many symbols fetched concurrently, keyed by the requested symbol"""
+        symbols = list(dict.fromkeys(symbols))
+        results = await asyncio.gather(*(self.get_quote(s) for s in symbols), return_exceptions=True)
+        return {
+            symbol: quote
+            for symbol, quote in zip(symbols, results)
+            if quote is not None and not isinstance(quote, BaseException)
+        }
+
+    async def get_fundamentals(self, symbol):
+        """Company fundamentals (market cap, P/E, ...); backends without them return {}"""
+        return {}
+
+    async def aclose(self):
+        pass
+
+
+# -------------------------
+# Mock backend (fully offline)
+# -------------------------
+def _hash_uniform(seed, ticks, salt):
+    """Deterministic uniforms in [0, 1) from (seed, tick) pairs using splitmix64"""
+    with np.errstate(over="ignore"):
+        x = ticks.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        x ^= np.uint64((seed * 1000003 + salt) & 0xFFFFFFFFFFFFFFFF)
+        x ^= x >> np.uint64(30)
+        x *= np.uint64(0xBF58476D1CE4E5B9)
+        x ^= x >> np.uint64(27)
+        x *= np.uint64(0x94D049BB133111EB)
+        x ^= x >> np.uint64(31)
+    return (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+def _session_index(start, end, interval):
+    """Bar start times inside NSE sessions (09:15-15:30 IST, weekdays) between start and end"""
+    if interval == "1d":
+        days = pd.bdate_range(start.normalize(), end.normalize(), tz=MARKET_TIMEZONE)
+        return days[(days >= start.normalize()) & (days <= end)]
+
+    step = pd.Timedelta(seconds=INTERVAL_SECONDS[interval])
+    session = pd.timedelta_range(pd.Timedelta(hours=9, minutes=15), pd.Timedelta(hours=15, minutes=30), freq=step, closed="left")
+    days = pd.bdate_range(start.normalize(), end.normalize(), tz=MARKET_TIMEZONE)
+    if len(days) == 0:
+        return pd.DatetimeIndex([], tz=MARKET_TIMEZONE)
+    index = days.repeat(len(session)) + pd.TimedeltaIndex(np.tile(session.values, len(days)))
+    return index[(index >= start) & (index <= end)]
+
+
+class MockProvider(MarketDataProvider):
+    """
+    Offline backend for development and tests
+
+    Quotes reuse the core.angel_api mock. Bars are a deterministic function of
+    (symbol, bar time), so overlapping requests always agree with each other.
+    """
+
+    name = "mock"
+
+    def __init__(self, max_concurrency=None, latency=MOCK_PROVIDER_LATENCY):
+        super().__init__(max_concurrency)
+        self.latency = latency
+
+    async def get_quote(self, symbol):
+        async with self.semaphore:
+            await asyncio.sleep(self.latency)
+            return build_mock_quote(symbol)
+
+    async def get_history(self, symbol, period="1mo", interval="1d", start=None, end=None):
+        if interval not in INTERVAL_SECONDS:
+            raise MarketDataError(f"Unsupported interval for mock data: {interval}")
+        if start is None:
+            start, end = period_to_range(period, end)
+        else:
+            start = pd.Timestamp(start)
+            end = pd.Timestamp(end) if end is not None else pd.Timestamp.now(tz=MARKET_TIMEZONE)
+            start = start.tz_localize(MARKET_TIMEZONE) if start.tzinfo is None else start.tz_convert(MARKET_TIMEZONE)
+            end = end.tz_localize(MARKET_TIMEZONE) if end.tzinfo is None else end.tz_convert(MARKET_TIMEZONE)
+
+        async with self.semaphore:
+            await asyncio.sleep(self.latency)
+            return self.generate_bars(symbol, _session_index(start, end, interval))
+
+    @staticmethod
+    def generate_bars(symbol, index):
+        if len(index) == 0:
+            return empty_history()
+        symbol = symbol.upper()
+        seed = zlib.crc32(symbol.encode())
+        base = BASE_PRICES.get(symbol, 100 + seed % 2900)
+        ticks = index.asi8 // 1_000_000_000
+        days = ticks / 86400.0
+
+        phase = (seed % 360) * np.pi / 180
+        trend = 0.12 * np.sin(2 * np.pi * days / 365 + phase) + 0.04 * np.sin(2 * np.pi * days / 29 + 2 * phase)
+        noise = [_hash_uniform(seed, ticks, salt) - 0.5 for salt in range(4)]
+
+        close = base * (1 + trend) * (1 + 0.02 * noise[0])
+        open_ = close * (1 + 0.01 * noise[1])
+        high = np.maximum(open_, close) * (1 + 0.01 * np.abs(noise[2]))
+        low = np.minimum(open_, close) * (1 - 0.01 * np.abs(noise[3]))
+        volume = np.floor(100_000 * (1 + 9 * _hash_uniform(seed, ticks, 4)))
+
+        frame = pd.DataFrame(
+            {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+            index=index.rename("Date"),
+        )
+        return frame.round({"Open": 2, "High": 2, "Low": 2, "Close": 2})
+
+
+# -------------------------
+# Yahoo Finance backend
+# -------------------------
+def to_yahoo_symbol(symbol):
+    """Map bare NSE symbols to Yahoo tickers (INFY -> INFY.NS), leave indices and suffixed tickers alone"""
+    symbol = symbol.upper().strip()
+    if symbol.startswith("^") or "." in symbol:
+        return symbol
+    return f"{symbol}.NS"
+
+
+YAHOO_FUNDAMENTAL_FIELDS = {
+    "name": "longName",
+    "sector": "sector",
+    "industry": "industry",
+    "market_cap": "marketCap",
+    "pe_ratio": "trailingPE",
+    "eps": "trailingEps",
+    "dividend_yield": "dividendYield",
+    "fifty_two_week_high": "fiftyTwoWeekHigh",
+    "fifty_two_week_low": "fiftyTwoWeekLow",
+}
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Yahoo Finance backend
+
+    yfinance is synchronous, so each call runs in a worker thread; the library
+    keeps one shared HTTP session per process, which pools connections across
+    every request made here.
+    """
+
+    name = "yfinance"
+
+    async def get_quotes(self, symbols):
+        """All quotes from one multi-ticker download instead of a history call per symbol"""
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        tickers = {to_yahoo_symbol(symbol): symbol for symbol in symbols}
+        async with self.semaphore:
+            df = await asyncio.to_thread(
+                yf.download,
+                list(tickers),
+                period="5d",
+                interval="1d",
+                group_by="column",
+                auto_adjust=False,
+                progress=False,
+            )
+        if df is None or df.empty:
+            return {}
+        if not isinstance(df.columns, pd.MultiIndex):
+            df.columns = pd.MultiIndex.from_product([df.columns, list(tickers)])
+        return quotes_from_batch(df["Close"], df["Open"], tickers)
+
+    async def get_quote(self, symbol):
+        # A few daily bars carry both numbers a quote needs; Ticker.info would
+        # pull the whole fundamentals payload for them
+        df = await self.get_history(symbol, period="5d", interval="1d")
+        if df.empty:
+            return None
+        return quote_from_daily_bars(symbol, df)
+
+    async def get_fundamentals(self, symbol):
+        ticker = to_yahoo_symbol(symbol)
+        async with self.semaphore:
+            info = await asyncio.to_thread(lambda: yf.Ticker(ticker).info)
+        return {field: info.get(key) for field, key in YAHOO_FUNDAMENTAL_FIELDS.items() if info.get(key) is not None}
+
+    async def get_history(self, symbol, period="1mo", interval="1d", start=None, end=None):
+        ticker = to_yahoo_symbol(symbol)
+        async with self.semaphore:
+            if start is not None:
+                df = await asyncio.to_thread(yf.Ticker(ticker).history, start=start, end=end, interval=interval)
+            else:
+                df = await asyncio.to_thread(yf.Ticker(ticker).history, period=period, interval=interval)
+        if df is None or df.empty:
+            return empty_history()
+        df = df[OHLCV_COLUMNS]
+        df.index = df.index.rename("Date")
+        return df
+
+
+# -------------------------
+# Angel One SmartAPI backend
+# -------------------------
+ANGEL_BASE_URL = "https://apiconnect.angelone.in/rest/secure/angelbroking"
+ANGEL_QUOTE_BATCH = 50
+ANGEL_INTERVALS = {
+    "1m": "ONE_MINUTE",
+    "5m": "FIVE_MINUTE",
+    "15m": "FIFTEEN_MINUTE",
+    "30m": "THIRTY_MINUTE",
+    "1h": "ONE_HOUR",
+    "1d": "ONE_DAY",
+}
+
+
+class AngelOneProvider(MarketDataProvider):
+    """
+    Angel One SmartAPI backend
+
+    Symbols are resolved to tokens through the instrument master. Quotes are
+    requested in batches of ANGEL_QUOTE_BATCH tokens per exchange.
+    """
+
+    name = "angelone"
+
+    def _headers(self):
+        if not ANGEL_API_KEY or not ANGEL_JWT_TOKEN:
+            raise MarketDataError("Angel One credentials are not configured (ANGEL_API_KEY / ANGEL_JWT_TOKEN)")
+        return {
+            "Authorization": f"Bearer {ANGEL_JWT_TOKEN}",
+            "X-PrivateKey": ANGEL_API_KEY,
+            "X-UserType": "USER",
+            "X-SourceID": "WEB",
+            "X-ClientLocalIP": "127.0.0.1",
+            "X-ClientPublicIP": "127.0.0.1",
+            "X-MACAddress": "00:00:00:00:00:00",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+
+    async def _post(self, path, payload):
+        async with self.semaphore:
+            response = await get_http_client().post(f"{ANGEL_BASE_URL}{path}", json=payload, headers=self._headers())
+        response.raise_for_status()
+        body = response.json()
+        if not body.get("status"):
+            raise MarketDataError(f"Angel One error: {body.get('message')}")
+        return body.get("data")
+
+    async def _instrument(self, symbol):
+        master = await asyncio.to_thread(get_instrument_master)
+        instrument = master.lookup(symbol)
+        return instrument if instrument and instrument["token"] else None
+
+    async def get_quote(self, symbol):
+        quotes = await self.get_quotes([symbol])
+        return quotes.get(symbol)
+
+    async def get_quotes(self, symbols):
+        symbols = list(dict.fromkeys(symbols))
+        by_token = {}
+        tokens_by_exchange = {}
+        for symbol in symbols:
+            instrument = await self._instrument(symbol)
+            if instrument is not None:
+                by_token[instrument["token"]] = symbol
+                tokens_by_exchange.setdefault(instrument["exchange"], []).append(instrument["token"])
+
+        payloads = [
+            {"mode": "OHLC", "exchangeTokens": {exchange: tokens[i:i + ANGEL_QUOTE_BATCH]}}
+            for exchange, tokens in tokens_by_exchange.items()
+            for i in range(0, len(tokens), ANGEL_QUOTE_BATCH)
+        ]
+        responses = await asyncio.gather(*(self._post("/market/v1/quote/", payload) for payload in payloads))
+
+        quotes = {}
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for data in responses:
+            for row in (data or {}).get("fetched", []):
+                symbol = by_token.get(str(row.get("symbolToken")))
+                if symbol is None:
+                    continue
+                price = float(row["ltp"])
+                previous_close = float(row.get("close") or price)
+                change = price - previous_close
+                quotes[symbol] = {
+                    "symbol": symbol,
+                    "price": round(price, 2),
+                    "open": round(float(row.get("open") or price), 2),
+                    "previous_close": round(previous_close, 2),
+                    "change": round(change, 2),
+                    "change_percent": round((change / previous_close) * 100, 2) if previous_close else 0.0,
+                    "timestamp": now,
+                }
+        return quotes
+
+    async def get_history(self, symbol, period="1mo", interval="1d", start=None, end=None):
+        if interval not in ANGEL_INTERVALS:
+            raise MarketDataError(f"Unsupported interval for Angel One: {interval}")
+        instrument = await self._instrument(symbol)
+        if instrument is None:
+            raise MarketDataError(f"Unknown Angel One symbol: {symbol}")
+        if start is None:
+            start, end = period_to_range(period, end)
+        end = end if end is not None else pd.Timestamp.now(tz=MARKET_TIMEZONE)
+
+        rows = await self._post("/historical/v1/getCandleData", {
+            "exchange": instrument["exchange"],
+            "symboltoken": instrument["token"],
+            "interval": ANGEL_INTERVALS[interval],
+            "fromdate": pd.Timestamp(start).strftime("%Y-%m-%d %H:%M"),
+            "todate": pd.Timestamp(end).strftime("%Y-%m-%d %H:%M"),
+        })
+        if not rows:
+            return empty_history()
+        df = pd.DataFrame(rows, columns=["Date"] + OHLCV_COLUMNS)
+        df["Date"] = pd.to_datetime(df["Date"]).dt.tz_convert(MARKET_TIMEZONE)
+        return df.set_index("Date").astype("float64")
+
+
+# -------------------------
+# Event loop for sync callers
+# -------------------------
+class AsyncRunner:
+    """
+    A dedicated event loop on a daemon thread
+
+    Streamlit scripts and worker threads hand coroutines to it instead of
+    running their own loop, so all providers share one loop, one HTTP pool
+    and one set of semaphores.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="market-data-loop", daemon=True)
+        self._thread.start()
+
+    def submit(self, coro):
+        """Schedule a coroutine and return a concurrent.futures.Future without blocking"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the shared loop and wait for its result"""
+        return self.submit(coro).result(timeout)
+
+
+PROVIDERS = {
+    "mock": MockProvider,
+    "yfinance": YFinanceProvider,
+    "angelone": AngelOneProvider,
+}
+
+# Create singleton instances
+_async_runner = None
+_providers = {}
+_singleton_lock = threading.Lock()
+
+def get_async_runner() -> AsyncRunner:
+    """Get or create the process-wide event loop thread"""
+    global _async_runner
+    if _async_runner is None:
+        with _singleton_lock:
+            if _async_runner is None:
+                _async_runner = AsyncRunner()
+    return _async_runner
+
+def get_provider(name=None) -> MarketDataProvider:
+    """Get or create a provider by name, defaulting to MARKET_DATA_PROVIDER"""
+    name = name or MARKET_DATA_PROVIDER
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown market data provider: {name}")
+    provider = _providers.get(name)
+    if provider is None:
+        with _singleton_lock:
+            provider = _providers.get(name)
+            if provider is None:
+                provider = _providers[name] = PROVIDERS[name]()
+    return provider
+
+def fetch_quotes(symbols, provider=None, timeout=None):
+    """Blocking helper: quotes for symbols from a provider, run on the shared loop"""
+    return get_async_runner().run(get_provider(provider).get_quotes(symbols), timeout)
+
+def fetch_history(symbol, period="1mo", interval="1d", provider=None, start=None, end=None, timeout=None):
+    """Blocking helper: OHLCV history for one symbol, run on the shared loop"""
+    coro = get_provider(provider).get_history(symbol, period=period, interval=interval, start=start, end=end)
+    return get_async_runner().run(coro, timeout)
+
+def fetch_fundamentals(symbol, provider=None, timeout=None):
+    """Blocking helper: fundamentals for one symbol, run on the shared loop"""
+    return get_async_runner().run(get_provider(provider).get_fundamentals(symbol), timeout)
+
+def fetch_fundamentals_many(symbols, provider=None, timeout=None):
+    """Blocking helper: fundamentals for many symbols concurrently; failed symbols map to {}"""
+    backend = get_provider(provider)
+
+    async def fetch_all():
+        return await asyncio.gather(*(backend.get_fundamentals(symbol) for symbol in symbols), return_exceptions=True)
+
+    results = get_async_runner().run(fetch_all(), timeout)
+    return {symbol: {} if isinstance(info, BaseException) else info for symbol, info in zip(symbols, results)}
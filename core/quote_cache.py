@@ -0,0 +1,289 @@
+# core/quote_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from config.settings import FUNDAMENTALS_CACHE_TTL, HISTORY_CACHE_TTL, QUOTE_CACHE_MAX_ENTRIES, QUOTE_CACHE_TTL
+from core.bar_store import get_bar_store
+from core.providers import fetch_fundamentals, fetch_history, fetch_quotes, quote_from_daily_bars
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at")
+
+    def __init__(self, value, expires_at):
+        self.value = value
+        self.expires_at = expires_at
+
+
+class QuoteCache:
+    """
+    Process-wide TTL cache with LRU eviction and stale-while-revalidate
+
+    Fresh entries are served directly. Expired entries are still served while
+    a single background refresh reloads them; concurrent misses on the same key
+    share one upstream call. Cached values are shared between sessions and must
+    be treated as read-only.
+    """
+
+    def __init__(self, default_ttl=QUOTE_CACHE_TTL, max_entries=QUOTE_CACHE_MAX_ENTRIES, refresh_workers=4):
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="quote-refresh")
+        self._counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "evictions": 0,
+        }
+
+    def _ttl_for(self, key, ttl):
+        if ttl is None:
+            return self.default_ttl
+        return ttl(key) if callable(ttl) else ttl
+
+    def _store(self, key, value, ttl):
+        """Insert or replace an entry and evict least recently used ones (lock held)"""
+        self._entries[key] = _Entry(value, time.monotonic() + self._ttl_for(key, ttl))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _lookup(self, key, now):
+        """Return (entry, is_fresh) and bump LRU order (lock held)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        self._entries.move_to_end(key)
+        return entry, entry.expires_at > now
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key, loader, ttl=None):
+        """
+        Get a cached value, calling loader() on a miss
+
+        Args:
+            key (Hashable): Cache key
+            loader (Callable[[], Any]): Upstream fetch for this key
+            ttl (float | Callable[[key], float] | None): Seconds before the entry goes stale
+
+        Returns:
+            Any: The cached, stale or freshly loaded value
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry, fresh = self._lookup(key, now)
+            if entry is not None:
+                if fresh:
+                    self._counters["hits"] += 1
+                else:
+                    self._counters["stale_hits"] += 1
+                    self._schedule_refresh([key], lambda keys: {key: loader()}, ttl)
+                return entry.value
+
+            self._counters["misses"] += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._store(key, value, ttl)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def get_many(self, keys, batch_loader, ttl=None):
+        """
+        Get several cached values, loading all misses in one batch_loader call
+
+        Args:
+            keys (Iterable[Hashable]): Cache keys
+            batch_loader (Callable[[list], dict]): Upstream fetch returning values keyed like keys
+            ttl (float | Callable[[key], float] | None): Seconds before an entry goes stale
+
+        Returns:
+            dict: Values keyed by cache key, missing upstream results are omitted
+        """
+        now = time.monotonic()
+        results = {}
+        missing = []
+        waiting = {}
+        stale = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                entry, fresh = self._lookup(key, now)
+                if entry is None:
+                    self._counters["misses"] += 1
+                    if key in self._inflight:
+                        waiting[key] = self._inflight[key]
+                    else:
+                        self._inflight[key] = Future()
+                        missing.append(key)
+                    continue
+                results[key] = entry.value
+                if fresh:
+                    self._counters["hits"] += 1
+                else:
+                    self._counters["stale_hits"] += 1
+                    stale.append(key)
+            if stale:
+                self._schedule_refresh(stale, batch_loader, ttl)
+
+        if missing:
+            try:
+                loaded = batch_loader(missing)
+            except Exception as e:
+                with self._lock:
+                    for key in missing:
+                        self._inflight.pop(key).set_exception(e)
+                raise
+            with self._lock:
+                for key in missing:
+                    if key in loaded:
+                        self._store(key, loaded[key], ttl)
+                    self._inflight.pop(key).set_result(loaded.get(key))
+            results.update(loaded)
+
+        for key, future in waiting.items():
+            value = future.result()
+            if value is not None:
+                results[key] = value
+
+        return results
+
+    def _schedule_refresh(self, keys, batch_loader, ttl):
+        """Start one background reload for keys not already refreshing (lock held)"""
+        keys = [key for key in keys if key not in self._refreshing]
+        if not keys:
+            return
+        self._refreshing.update(keys)
+        self._executor.submit(self._refresh, keys, batch_loader, ttl)
+
+    def _refresh(self, keys, batch_loader, ttl):
+        try:
+            loaded = batch_loader(keys)
+        except Exception:
+            with self._lock:
+                self._counters["refresh_errors"] += 1
+                self._refreshing.difference_update(keys)
+            return
+
+        with self._lock:
+            for key, value in loaded.items():
+                self._store(key, value, ttl)
+            self._counters["refreshes"] += 1
+            self._refreshing.difference_update(keys)
+
+    def stats(self):
+        """Return hit/miss/refresh counters and current size"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["size"] = len(self._entries)
+            stats["max_entries"] = self.max_entries
+            stats["refreshing"] = len(self._refreshing)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["stale_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+# Create a singleton instance
+_quote_cache = None
+_quote_cache_lock = threading.Lock()
+
+def get_quote_cache() -> QuoteCache:
+    """Get or create the process-wide quote cache"""
+    global _quote_cache
+    if _quote_cache is None:
+        with _quote_cache_lock:
+            if _quote_cache is None:
+                _quote_cache = QuoteCache()
+    return _quote_cache
+
+
+def _history_ttl(key):
+    _, _, _, interval, _ = key
+    return HISTORY_CACHE_TTL.get(interval, HISTORY_CACHE_TTL["default"])
+
+def _load_live_prices(keys):
+    prices = fetch_quotes([symbol for _, symbol in keys])
+    return {("live", symbol): prices[symbol] for _, symbol in keys if symbol in prices}
+
+def get_cached_live_prices(symbols):
+    """Cached quotes from the configured provider, keyed by upper-case symbol"""
+    keys = [("live", symbol.upper()) for symbol in symbols]
+    cached = get_quote_cache().get_many(keys, _load_live_prices)
+    return {symbol: quote for (_, symbol), quote in cached.items()}
+
+def get_cached_live_price(symbol):
+    """Cached quote for a single symbol"""
+    return get_cached_live_prices([symbol]).get(symbol.upper())
+
+def get_cached_history(symbol, period="1d", interval="1d", provider="yfinance"):
+    """Cached OHLCV history from a provider (Yahoo by default), treat the result as read-only"""
+    key = ("history", symbol, period, interval, provider)
+    return get_quote_cache().get(
+        key,
+        lambda: fetch_history(symbol, period=period, interval=interval, provider=provider),
+        ttl=_history_ttl,
+    )
+
+def _load_quote(symbol, provider):
+    try:
+        quote = fetch_quotes([symbol], provider=provider).get(symbol)
+    except Exception:
+        quote = None
+    if quote is None:
+        # Upstream unavailable: fall back to the last two daily bars already on disk
+        bars = get_bar_store(provider).read_frame(symbol, "1d")
+        quote = quote_from_daily_bars(symbol, bars.tail(2)) if not bars.empty else None
+    return quote
+
+def get_cached_quote(symbol, provider="yfinance"):
+    """
+    Lightweight quote (price, previous close, change) for one symbol
+
+    Built from a few daily bars rather than Ticker.info, or from the local bar
+    store when the provider cannot be reached. None if neither has data.
+    """
+    return get_quote_cache().get(("quote", provider, symbol), lambda: _load_quote(symbol, provider))
+
+def get_cached_fundamentals(symbol, provider="yfinance"):
+    """Fundamentals for one symbol, fetched on first request and cached for hours"""
+    return get_quote_cache().get(
+        ("fundamentals", provider, symbol),
+        lambda: fetch_fundamentals(symbol, provider=provider),
+        ttl=FUNDAMENTALS_CACHE_TTL,
+    )
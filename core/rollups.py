@@ -0,0 +1,195 @@
+# core/rollups.py
+
+import heapq
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from config.settings import MARKET_TIMEZONE, SENTIMENT_ROLLUP_TIERS
+
+
+class _Tier:
+    __slots__ = ("width", "width_ns", "retention_ns", "series", "expiry")
+
+    def __init__(self, width, retention):
+        self.width = width
+        self.width_ns = int(pd.Timedelta(width).value)
+        self.retention_ns = int(pd.Timedelta(retention).value) if retention is not None else None
+        self.series = {}  # key -> {bucket start ns: [field totals]}
+        self.expiry = []  # (bucket start ns, sequence, key) heap, only for tiers with a retention
+
+
+class TimeRollups:
+    """
+    Pre-aggregated totals of timestamped values at several resolutions
+
+    Every event is added to one bucket per tier (e.g. its minute, hour and
+    day), per series key, so updates cost O(tiers) and each coarse tier is
+    complete on its own. compact() drops fine buckets older than their
+    tier's retention; nothing needs re-aggregating because the coarser
+    tiers already hold those events. Buckets are aligned to local time in
+    `timezone`, so day buckets are market days.
+
+    Args:
+        fields (int): Number of values summed per event
+        tiers (tuple): (bucket width, retention or None) pairs, finest first
+    """
+
+    def __init__(self, fields, tiers=SENTIMENT_ROLLUP_TIERS, timezone=MARKET_TIMEZONE):
+        self.fields = fields
+        self.tiers = [_Tier(width, retention) for width, retention in tiers]
+        self.offset_ns = int(pd.Timedelta(pd.Timestamp.now(tz=timezone).utcoffset()).value)
+        self.newest_ns = None
+        self._counters = {"events": 0, "dropped": 0, "compacted": 0}
+        self._sequence = itertools.count()  # heap tie-break, keys need not be comparable
+
+    def _floor(self, ns, width_ns):
+        local = ns + self.offset_ns
+        return local - local % width_ns - self.offset_ns
+
+    def add(self, key, ns, values):
+        """Add one event's values to every tier's bucket for series `key`"""
+        if self.newest_ns is None or ns > self.newest_ns:
+            self.newest_ns = ns
+        self._counters["events"] += 1
+        for tier in self.tiers:
+            start = self._floor(ns, tier.width_ns)
+            if tier.retention_ns is not None and start + tier.width_ns <= self.newest_ns - tier.retention_ns:
+                self._counters["dropped"] += 1  # late event, already past this tier's retention
+                continue
+            buckets = tier.series.setdefault(key, {})
+            cell = buckets.get(start)
+            if cell is None:
+                cell = buckets[start] = [0.0] * self.fields
+                if tier.retention_ns is not None:
+                    heapq.heappush(tier.expiry, (start, next(self._sequence), key))
+            for i, value in enumerate(values):
+                cell[i] += value
+
+    def compact(self, now_ns=None):
+        """Drop buckets that have fallen out of their tier's retention (by default relative to the newest event)"""
+        now_ns = now_ns if now_ns is not None else self.newest_ns
+        if now_ns is None:
+            return 0
+        dropped = 0
+        for tier in self.tiers:
+            if tier.retention_ns is None:
+                continue
+            cutoff = now_ns - tier.retention_ns
+            while tier.expiry and tier.expiry[0][0] + tier.width_ns <= cutoff:
+                start, _, key = heapq.heappop(tier.expiry)
+                buckets = tier.series.get(key)
+                if buckets is not None and buckets.pop(start, None) is not None:
+                    dropped += 1
+                    if not buckets:
+                        del tier.series[key]
+        self._counters["compacted"] += dropped
+        return dropped
+
+    def _kept_from(self, tier):
+        """Start of the oldest bucket a tier still holds, or None if it keeps everything"""
+        if tier.retention_ns is None or self.newest_ns is None:
+            return None
+        return self._floor(self.newest_ns - tier.retention_ns, tier.width_ns)
+
+    def _retained(self, tier, ns):
+        """Whether the bucket holding ns is still kept by a tier"""
+        kept_from = self._kept_from(tier)
+        return kept_from is None or self._floor(ns, tier.width_ns) >= kept_from
+
+    def span(self, start_ns, end_ns):
+        """
+        The [start, end) that window() answers exactly for a requested window
+
+        The start is rounded down to the finest tier that still holds it. The
+        end is rounded down to the finest tier that, along with every tier
+        above it, still holds the rest of the enclosing coarser bucket (or of
+        the window, if that starts later).
+        """
+        start = next(
+            (self._floor(start_ns, tier.width_ns) for tier in self.tiers if self._retained(tier, start_ns)),
+            self._floor(start_ns, self.tiers[-1].width_ns),
+        )
+        end = self._floor(end_ns, self.tiers[-1].width_ns)
+        for position, tier in enumerate(self.tiers[:-1]):
+            if all(
+                self._retained(coarser, max(start, self._floor(end_ns, above.width_ns)))
+                for coarser, above in zip(self.tiers[position:-1], self.tiers[position + 1:])
+            ):
+                end = self._floor(end_ns, tier.width_ns)
+                break
+        return start, max(start, end)
+
+    def window(self, key, start_ns, end_ns):
+        """
+        Totals over [start_ns, end_ns) from as few buckets as possible
+
+        The window is covered with whole buckets of the coarsest tier that
+        fit inside it, then the leftover edges with the next tier down, and
+        so on; each tier only covers the part it still retains. Edges are
+        rounded as in span().
+
+        Returns:
+            tuple: (np.ndarray of field totals, number of buckets read)
+        """
+        totals = np.zeros(self.fields)
+        segments = [self.span(start_ns, end_ns)]
+        read = 0
+        for tier in reversed(self.tiers):
+            buckets = tier.series.get(key, {})
+            kept_from = self._kept_from(tier)
+            leftover = []
+            for start, end in segments:
+                if kept_from is not None and start < kept_from:
+                    # Split at the retention cutoff; only the recent part can be covered here
+                    leftover.append((start, min(end, kept_from)))
+                    start = kept_from
+                first = self._floor(start, tier.width_ns)
+                if first < start:
+                    first += tier.width_ns
+                last = self._floor(end, tier.width_ns)
+                if first >= last:
+                    if start < end:
+                        leftover.append((start, end))
+                    continue
+                for bucket in range(first, last, tier.width_ns):
+                    cell = buckets.get(bucket)
+                    read += 1
+                    if cell is not None:
+                        totals += cell
+                leftover.extend(segment for segment in ((start, first), (last, end)) if segment[0] < segment[1])
+            segments = leftover
+            if not segments:
+                break
+        return totals, read
+
+    def series(self, key, start_ns, end_ns, width):
+        """
+        One tier's buckets between two times, for charting
+
+        Args:
+            width (str): Bucket width of one of the tiers ("1min", "1h", "1D")
+
+        Returns:
+            tuple: (bucket start ns array, (buckets, fields) totals array, zero where empty)
+        """
+        width_ns = int(pd.Timedelta(width).value)
+        tier = next(tier for tier in self.tiers if tier.width_ns == width_ns)
+        buckets = tier.series.get(key, {})
+        starts = np.arange(self._floor(start_ns, width_ns), end_ns, width_ns, dtype=np.int64)
+        values = np.zeros((len(starts), self.fields))
+        for row, start in enumerate(starts.tolist()):
+            cell = buckets.get(start)
+            if cell is not None:
+                values[row] = cell
+        return starts, values
+
+    def keys(self):
+        return set().union(*(tier.series for tier in self.tiers))
+
+    def stats(self):
+        stats = dict(self._counters)
+        for tier in self.tiers:
+            stats[f"buckets_{tier.width}"] = sum(len(buckets) for buckets in tier.series.values())
+        return stats
@@ -1 +1,446 @@
-# Screener logic placeholder
+# core/screener.py
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from config.settings import HISTORY_CACHE_TTL, MARKET_TIMEZONE, SCREENER_HISTORY_BARS, SCREENER_HISTORY_PERIOD, SCREENER_SCAN_WORKERS
+from core.bar_store import to_ns
+from core.fetch_planner import get_bars_many, get_fetch_planner
+from core.indicators import IndicatorState, compute_indicators
+from core.instruments import get_instrument_master
+from core.providers import period_to_range
+
+WEEKS_52_BARS = 252  # trading days in a year
+UPDATE_PERIOD = "5d"  # daily bars re-read per symbol on an incremental refresh, at least
+BAR_FIELDS = {"close": "Close", "high": "High", "low": "Low", "volume": "Volume"}
+SHARED_FIELDS = ("close", "high", "low", "volume")  # Universe arrays placed in shared memory, in this order
+
+RESULT_COLUMNS = [
+    "close", "change_pct", "sma_20", "sma_50", "ema_20", "rsi_14",
+    "macd", "macd_signal", "macd_hist", "high_52w", "low_52w",
+    "pct_from_52w_high", "volume", "volume_ratio", "signal",
+]
+
+
+class Universe:
+    """
+    Daily bars for many symbols as aligned (N, T) float64 arrays
+
+    Row i holds the last T bars of symbols[i], right-aligned so every symbol's
+    latest bar sits in the last column; symbols with shorter histories are
+    left-padded with NaN. last_ts holds each row's latest bar time (epoch ns).
+    """
+
+    def __init__(self, symbols, close, high, low, volume, last_ts=None, loaded_at=None):
+        self.symbols = list(symbols)
+        self.close = close
+        self.high = high
+        self.low = low
+        self.volume = volume
+        self.last_ts = last_ts if last_ts is not None else np.zeros(len(self.symbols), dtype=np.int64)
+        self.loaded_at = loaded_at if loaded_at is not None else time.time()
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @classmethod
+    def from_frames(cls, frames, max_bars=SCREENER_HISTORY_BARS):
+        """Build from {symbol: OHLCV DataFrame}; symbols without bars are dropped"""
+        symbols = [symbol for symbol, df in frames.items() if df is not None and len(df)]
+        shape = (len(symbols), max_bars)
+        arrays = {column: np.full(shape, np.nan) for column in ("Close", "High", "Low", "Volume")}
+        last_ts = np.zeros(len(symbols), dtype=np.int64)
+        for row, symbol in enumerate(symbols):
+            df = frames[symbol].iloc[-max_bars:]
+            for column, array in arrays.items():
+                array[row, max_bars - len(df):] = df[column].to_numpy(dtype=np.float64)
+            last_ts[row] = to_ns(df.index[-1])
+        return cls(symbols, arrays["Close"], arrays["High"], arrays["Low"], arrays["Volume"], last_ts)
+
+
+def classify_signals(values):
+    """Buy/Hold/Sell from RSI extremes and MACD momentum relative to the 50-day SMA"""
+    rsi, hist = values["rsi_14"], values["macd_hist"]
+    above_trend = values["close"] > values["sma_50"]
+    buy = (rsi < 30) | ((hist > 0) & above_trend)
+    sell = (rsi > 70) | ((hist < 0) & ~above_trend)
+    return np.where(buy & ~sell, "Buy", np.where(sell & ~buy, "Sell", "Hold"))
+
+
+def _finish_columns(values, high_52w, low_52w, volume):
+    """Add the 52-week, volume and signal columns to indicator values"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        values["pct_from_52w_high"] = (values["close"] - high_52w) / high_52w * 100
+    values["high_52w"] = high_52w
+    values["low_52w"] = low_52w
+    values["volume"] = volume
+    values["signal"] = classify_signals(values)
+    return values
+
+
+def _scan_from_state(universe, state):
+    """
+    Screener table given the indicator state before each symbol's last bar
+
+    The last column is applied with peek(), so the state stays committed up to
+    the previous bar (what LiveScan keeps) and the values equal a full pass.
+    """
+    rows = np.arange(len(universe))
+    values = state.peek(rows, universe.close[:, -1], universe.volume[:, -1])
+    window = slice(-WEEKS_52_BARS, None)
+    if len(universe):
+        high_52w = np.fmax.reduce(universe.high[:, window], axis=1)
+        low_52w = np.fmin.reduce(universe.low[:, window], axis=1)
+        volume = universe.volume[:, -1].copy()
+    else:
+        high_52w = low_52w = volume = np.empty(0)
+    values = _finish_columns(values, high_52w, low_52w, volume)
+    return pd.DataFrame({column: values[column] for column in RESULT_COLUMNS}, index=pd.Index(universe.symbols, name="Symbol"))
+
+def _scan_state(universe):
+    """(state committed through the second-to-last bar, screener table)"""
+    state = compute_indicators(universe.close[:, :-1], universe.volume[:, :-1])
+    return state, _scan_from_state(universe, state)
+
+def _custom_columns(universe, columns):
+    return {name: np.asarray(column(universe)) for name, column in (columns or {}).items()}
+
+
+def scan_universe(universe, workers=None, columns=None):
+    """
+    Compute every screener column for the whole universe in one pass
+
+    Args:
+        universe (Universe): Aligned daily bars
+        workers (int | None): Shard across this many processes (see sharded_scan);
+            None or 1 scans in this process
+        columns (dict | None): Extra column name -> function(Universe) returning one
+            value per row, for custom criteria; must be picklable when workers > 1
+
+    Returns:
+        pd.DataFrame: One row per symbol (index "Symbol"), columns RESULT_COLUMNS
+            followed by any custom columns
+    """
+    if workers and workers > 1:
+        return sharded_scan(universe, workers, columns)[1]
+    result = _scan_state(universe)[1]
+    for name, values in _custom_columns(universe, columns).items():
+        result[name] = values
+    return result
+
+
+class SharedUniverse:
+    """
+    A Universe's price arrays copied once into a shared memory block
+
+    Worker processes map the block by name and slice their rows out of it,
+    so shards cost no pickling of the (N, T) arrays.
+    """
+
+    def __init__(self, universe):
+        self.shape = universe.close.shape
+        size = len(SHARED_FIELDS) * self.shape[0] * self.shape[1] * 8
+        self.memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        panel = np.ndarray((len(SHARED_FIELDS),) + self.shape, dtype=np.float64, buffer=self.memory.buf)
+        for position, field in enumerate(SHARED_FIELDS):
+            panel[position] = getattr(universe, field)
+        del panel
+        self.name = self.memory.name
+
+    def close(self):
+        self.memory.close()
+        self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _scan_shard(name, shape, start, stop, symbols, last_ts, columns):
+    """Worker: scan rows [start, stop) of a SharedUniverse"""
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        panel = np.ndarray((len(SHARED_FIELDS),) + shape, dtype=np.float64, buffer=memory.buf)
+        shard = Universe(symbols, *panel[:, start:stop], last_ts=last_ts)
+        state, result = _scan_state(shard)
+        # Copy everything returned: the block is unmapped below, which fails
+        # while any array still views it (e.g. a criterion returning u.close[:, -1])
+        result = result.copy(deep=True)
+        extra = {name: np.array(values, copy=True) for name, values in _custom_columns(shard, columns).items()}
+        del panel, shard
+        return state, result, extra
+    finally:
+        memory.close()
+
+
+def sharded_scan(universe, workers, columns=None):
+    """
+    scan_universe() split into contiguous row shards across a process pool
+
+    Symbols are independent, so each worker runs the same recurrences on its
+    rows and the shards are stitched back together in row order. The merged
+    table and state are identical to the single-process ones whatever order
+    the workers finish in. Workers are capped at the CPU count, since extra
+    processes only add overhead; on a single core the scan runs in-process.
+
+    Returns:
+        tuple: (IndicatorState committed through the second-to-last bar, pd.DataFrame)
+    """
+    workers = min(workers, os.cpu_count() or 1)
+    if workers < 2 or len(universe) < 2 * workers:
+        state, result = _scan_state(universe)
+        for name, values in _custom_columns(universe, columns).items():
+            result[name] = values
+        return state, result
+
+    bounds = np.linspace(0, len(universe), workers + 1).astype(int)
+    pool = get_scan_pool(workers)
+    with SharedUniverse(universe) as shared:
+        try:
+            futures = [
+                pool.submit(
+                    _scan_shard, shared.name, shared.shape, start, stop,
+                    universe.symbols[start:stop], universe.last_ts[start:stop], columns,
+                )
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            parts = [future.result() for future in futures]
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool on the next call
+            with _pools_lock:
+                _pools.pop(workers, None)
+            raise
+
+    state = IndicatorState.concat([part_state for part_state, _, _ in parts])
+    result = pd.concat([part_result for _, part_result, _ in parts])
+    for name in columns or {}:
+        result[name] = np.concatenate([extra[name] for _, _, extra in parts])
+    return state, result
+
+
+# Process pools are created on first use and kept, one per worker count.
+# Workers are spawned rather than forked so they never inherit the app's
+# threads (poller, asyncio loop) mid-operation.
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_scan_pool(workers) -> ProcessPoolExecutor:
+    pool = _pools.get(workers)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(workers)
+            if pool is None:
+                pool = _pools[workers] = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    return pool
+
+
+class LiveScan:
+    """
+    Screener results kept current one bar at a time
+
+    Indicator state is committed up to each symbol's previous bar; the latest
+    bar is "live" and applied on top with IndicatorState.peek(). A revised
+    live bar (the same day, later price) just replaces it, and a bar for a new
+    day commits the old live bar first. Each update therefore costs O(1) per
+    symbol touched, and the table equals scan_universe() over the same bars
+    exactly, since both run the same element-wise recurrences.
+    """
+
+    def __init__(self, universe, workers=None):
+        self.universe = universe
+        self.symbols = universe.symbols
+        self.rows = {symbol: row for row, symbol in enumerate(self.symbols)}
+        if workers and workers > 1:
+            self.state, self.result = sharded_scan(universe, workers)
+        else:
+            self.state, self.result = _scan_state(universe)
+        self.live = {
+            "ts": universe.last_ts.copy(),
+            "close": universe.close[:, -1].copy(),
+            "high": universe.high[:, -1].copy(),
+            "low": universe.low[:, -1].copy(),
+            "volume": universe.volume[:, -1].copy(),
+        }
+        # Ring buffers of the committed bars inside the 52-week window
+        # (NaN-padded when the universe holds fewer bars than the window)
+        self._highs = np.full((len(universe), WEEKS_52_BARS - 1), np.nan)
+        self._lows = np.full((len(universe), WEEKS_52_BARS - 1), np.nan)
+        committed = min(WEEKS_52_BARS - 1, universe.close.shape[1] - 1)
+        if committed:
+            self._highs[:, -committed:] = universe.high[:, -committed - 1:-1]
+            self._lows[:, -committed:] = universe.low[:, -committed - 1:-1]
+        self._slot = np.zeros(len(universe), dtype=np.int64)
+        self._lock = threading.Lock()
+
+    def update_bars(self, bars):
+        """
+        Apply the latest daily bar for some symbols
+
+        Args:
+            bars (dict): symbol -> dict with ts (anything to_ns accepts) and
+                close/high/low/volume. Bars older than a symbol's live bar
+                are ignored.
+
+        Returns:
+            int: Number of symbols whose row changed
+        """
+        updates = []
+        for symbol, bar in bars.items():
+            row = self.rows.get(symbol)
+            if row is None:
+                continue
+            ts = to_ns(bar["ts"])
+            if ts >= self.live["ts"][row]:
+                updates.append((row, ts, bar))
+        if not updates:
+            return 0
+
+        with self._lock:
+            rows = np.array([row for row, _, _ in updates], dtype=np.int64)
+            ts = np.array([ts for _, ts, _ in updates], dtype=np.int64)
+            live = self.live
+
+            new_day = rows[ts > live["ts"][rows]]
+            if len(new_day):
+                self.state.update_rows(new_day, live["close"][new_day], live["volume"][new_day])
+                slot = self._slot[new_day]
+                self._highs[new_day, slot] = live["high"][new_day]
+                self._lows[new_day, slot] = live["low"][new_day]
+                self._slot[new_day] = (slot + 1) % self._highs.shape[1]
+
+            for row, bar_ts, bar in updates:
+                live["ts"][row] = bar_ts
+                for field in BAR_FIELDS:
+                    live[field][row] = bar[field]
+
+            values = self.state.peek(rows, live["close"][rows], live["volume"][rows])
+            high_52w = np.fmax(np.fmax.reduce(self._highs[rows], axis=1), live["high"][rows])
+            low_52w = np.fmin(np.fmin.reduce(self._lows[rows], axis=1), live["low"][rows])
+            values = _finish_columns(values, high_52w, low_52w, live["volume"][rows])
+
+            # Publish a new frame rather than mutating the one readers may hold
+            columns = {column: self.result[column].to_numpy(copy=True) for column in RESULT_COLUMNS}
+            for column in RESULT_COLUMNS:
+                columns[column][rows] = values[column]
+            self.result = pd.DataFrame(columns, index=self.result.index)
+        return len(updates)
+
+    def gaps(self, frames):
+        """
+        Symbols whose new bars do not continue from their live bar
+
+        A frame continues a symbol's history when it still holds the live
+        bar; if it starts later, the days in between would be skipped and
+        the indicator state would drift from a batch scan.
+        """
+        missing = []
+        for symbol, df in frames.items():
+            row = self.rows.get(symbol)
+            if row is None or df is None or df.empty or self.live["ts"][row] <= 0:
+                continue
+            if df.index.asi8[0] > self.live["ts"][row]:
+                missing.append(symbol)
+        return missing
+
+    def update_frames(self, frames):
+        """Apply every bar in {symbol: OHLCV DataFrame} at or after each symbol's live bar"""
+        batches = {}
+        for symbol, df in frames.items():
+            row = self.rows.get(symbol)
+            if row is None or df is None or df.empty:
+                continue
+            index = df.index.asi8  # bar store frames are tz-aware, so these are UTC epoch ns
+            first = np.searchsorted(index, self.live["ts"][row], side="left")
+            columns = {field: df[column].to_numpy(dtype=np.float64)[first:] for field, column in BAR_FIELDS.items()}
+            for position, ts in enumerate(index[first:]):
+                bar = {field: values[position] for field, values in columns.items()}
+                bar["ts"] = int(ts)
+                batches.setdefault(position, {})[symbol] = bar
+        # Oldest bars first so each symbol steps through its days in order
+        return sum(self.update_bars(batches[position]) for position in sorted(batches))
+
+
+class ScreenerEngine:
+    """
+    Screener over the full instrument universe
+
+    The first scan loads a year of daily bars per symbol and computes
+    everything in one vectorized pass. Once that result is older than the
+    daily history TTL, only the bars since the oldest live bar (and at least
+    the last few) are re-read and applied incrementally; a full rebuild
+    happens when the new bars do not continue every symbol's history, when
+    the symbol list changes, or on refresh=True. With workers > 1 full scans are sharded
+    across that many processes.
+    """
+
+    def __init__(self, provider=None, period=SCREENER_HISTORY_PERIOD, max_age=HISTORY_CACHE_TTL["1d"], workers=SCREENER_SCAN_WORKERS):
+        self.provider = provider
+        self.period = period
+        self.max_age = max_age
+        self.workers = workers
+        self._live = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def default_symbols(self):
+        return get_instrument_master().all_symbols(equity_only=True)
+
+    def load_universe(self, symbols=None):
+        """Read (and gap-fill) daily bars for symbols and pack them into a Universe"""
+        symbols = list(dict.fromkeys(symbols if symbols is not None else self.default_symbols()))
+        frames = get_bars_many(symbols, period=self.period, interval="1d", provider=self.provider)
+        return Universe.from_frames(frames)
+
+    def live_scan(self, refresh=False):
+        with self._lock:
+            if refresh or self._live is None:
+                self._live = LiveScan(self.load_universe(), workers=self.workers)
+                self._checked_at = time.time()
+            elif time.time() - self._checked_at > self.max_age:
+                # Re-read from the oldest live bar so a long gap (holidays, a
+                # stopped server) is filled in rather than skipped
+                start, end = period_to_range(UPDATE_PERIOD)
+                live_ts = self._live.live["ts"]
+                if (live_ts > 0).any():
+                    start = min(start, pd.Timestamp(int(live_ts[live_ts > 0].min()), tz="UTC").tz_convert(MARKET_TIMEZONE))
+                frames = get_fetch_planner(self.provider).get_bars_many(self._live.symbols, start, end, interval="1d")
+                if self._live.gaps(frames):
+                    self._live = LiveScan(self.load_universe(self._live.symbols), workers=self.workers)
+                else:
+                    self._live.update_frames(frames)
+                self._checked_at = time.time()
+            return self._live
+
+    def scan(self, refresh=False):
+        """Indicator table for the whole universe, treat the result as read-only"""
+        return self.live_scan(refresh=refresh).result
+
+    def update_bars(self, bars):
+        """Push fresh daily bars (e.g. built from live quotes) into the current scan"""
+        live = self.live_scan()
+        return live.update_bars(bars)
+
+
+# Create singleton instances, one engine per provider
+_engines = {}
+_engines_lock = threading.Lock()
+
+def get_screener(provider=None) -> ScreenerEngine:
+    """Get or create the screener engine for a provider (defaults to MARKET_DATA_PROVIDER)"""
+    engine = _engines.get(provider)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(provider)
+            if engine is None:
+                engine = _engines[provider] = ScreenerEngine(provider)
+    return engine
@@ -0,0 +1,398 @@
+# core/screener_filters.py
+
+import ast
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+FILTER_CACHE_MAX_ENTRIES = 256
+
+_COMPARE_OPS = {ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">=", ast.Eq: "==", ast.NotEq: "!="}
+_FLIPPED = {"<": ">", "<=": ">=", ">": "<", ">=": "<=", "==": "==", "!=": "!="}
+
+
+class FilterError(ValueError):
+    """Raised when a screener expression cannot be parsed or refers to unknown columns"""
+
+
+def column_key(name):
+    """Identifier form of a column name ("Market Cap (Cr)" -> "market_cap_cr")"""
+    return re.sub(r"[^0-9a-z]+", "_", str(name).lower()).strip("_")
+
+
+# -------------------------
+# Plan nodes
+# -------------------------
+class Range:
+    """lo <(=) column <(=) hi, answered from the column's sorted index"""
+
+    def __init__(self, column, lo=-np.inf, hi=np.inf, lo_closed=True, hi_closed=True):
+        self.column = column
+        self.lo, self.hi = float(lo), float(hi)
+        self.lo_closed, self.hi_closed = lo_closed, hi_closed
+        self.key = f"{column}{'[' if lo_closed else '('}{self.lo!r},{self.hi!r}{']' if hi_closed else ')'}"
+
+    def intersect(self, other):
+        lo, lo_closed = max((self.lo, not self.lo_closed), (other.lo, not other.lo_closed))
+        hi, hi_closed = min((self.hi, self.hi_closed), (other.hi, other.hi_closed))  # on a tie the open bound wins
+        return Range(self.column, lo, hi, not lo_closed, hi_closed)
+
+    def _bounds(self, table):
+        values, order = table.sorted_index(self.column)
+        lo = np.searchsorted(values, self.lo, side="left" if self.lo_closed else "right")
+        hi = np.searchsorted(values, self.hi, side="right" if self.hi_closed else "left")
+        return order, lo, max(lo, hi)
+
+    def estimate(self, table):
+        _, lo, hi = self._bounds(table)
+        return hi - lo
+
+    def rows(self, table):
+        order, lo, hi = self._bounds(table)
+        return order[lo:hi]
+
+    def test(self, table, candidates):
+        values = table.numeric(self.column)[candidates]
+        mask = values >= self.lo if self.lo_closed else values > self.lo
+        mask &= values <= self.hi if self.hi_closed else values < self.hi
+        return candidates[mask]
+
+
+class InSet:
+    """column in (...), answered from the column's per-value row lists"""
+
+    def __init__(self, column, values):
+        self.column = column
+        self.values = frozenset(values)
+        self.key = f"{column} in {sorted(map(repr, self.values))}"
+
+    def _codes(self, table):
+        return [code for code in map(table.category_codes(self.column).get, self.values) if code is not None]
+
+    def estimate(self, table):
+        sizes = table.category_sizes(self.column)
+        return int(sum(sizes[code] for code in self._codes(table)))
+
+    def rows(self, table):
+        groups = table.category_rows(self.column)
+        parts = [groups[code] for code in self._codes(table)]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def test(self, table, candidates):
+        codes = self._codes(table)
+        if not codes:
+            return candidates[:0]
+        wanted = np.zeros(len(table.category_sizes(self.column)), dtype=bool)
+        wanted[codes] = True
+        row_codes = table.codes(self.column)[candidates]
+        return candidates[(row_codes >= 0) & wanted[row_codes.clip(0)]]  # missing values have code -1
+
+
+class And:
+    def __init__(self, children):
+        self.children = children
+        self.key = "(" + " and ".join(sorted(child.key for child in children)) + ")"
+
+
+class Or:
+    def __init__(self, children):
+        self.children = children
+        self.key = "(" + " or ".join(sorted(child.key for child in children)) + ")"
+
+
+class Not:
+    def __init__(self, child):
+        self.child = child
+        self.key = f"not {child.key}"
+
+
+# -------------------------
+# Compilation
+# -------------------------
+def _literal(node):
+    try:
+        value = ast.literal_eval(node)
+    except ValueError:
+        raise FilterError(f"Expected a literal value, got: {ast.unparse(node)}") from None
+    return value
+
+def _comparison(column, op, value):
+    if op in ("in", "not in"):
+        values = value if isinstance(value, (tuple, list, set, frozenset)) else (value,)
+        for item in values:
+            if not isinstance(item, (str, int, float)):
+                raise FilterError(f"Unsupported value in {column} {op} {value!r}: {item!r}")
+        node = InSet(column, values)
+        return Not(node) if op == "not in" else node
+    if isinstance(value, str):
+        if op not in ("==", "!="):
+            raise FilterError(f"Only ==, !=, in and not in apply to text values ({column} {op} {value!r})")
+        node = InSet(column, (value,))
+        return Not(node) if op == "!=" else node
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise FilterError(f"Unsupported value for {column}: {value!r}")
+    if op == "<":
+        return Range(column, hi=value, hi_closed=False)
+    if op == "<=":
+        return Range(column, hi=value)
+    if op == ">":
+        return Range(column, lo=value, lo_closed=False)
+    if op == ">=":
+        return Range(column, lo=value)
+    equal = Range(column, lo=value, hi=value)
+    return Not(equal) if op == "!=" else equal
+
+def _compile(node):
+    if isinstance(node, ast.BoolOp):
+        children = [_compile(value) for value in node.values]
+        return _merge_and(children) if isinstance(node.op, ast.And) else Or(children)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return Not(_compile(node.operand))
+    if isinstance(node, ast.Compare):
+        terms = [node.left, *node.comparators]
+        predicates = []
+        for left, op_node, right in zip(terms, node.ops, terms[1:]):
+            if isinstance(op_node, (ast.In, ast.NotIn)):
+                op = "in" if isinstance(op_node, ast.In) else "not in"
+            elif type(op_node) in _COMPARE_OPS:
+                op = _COMPARE_OPS[type(op_node)]
+            else:
+                raise FilterError(f"Unsupported operator in: {ast.unparse(node)}")
+            if isinstance(left, ast.Name) and not isinstance(right, ast.Name):
+                predicates.append(_comparison(left.id.lower(), op, _literal(right)))
+            elif isinstance(right, ast.Name) and not isinstance(left, ast.Name) and op in _FLIPPED:
+                predicates.append(_comparison(right.id.lower(), _FLIPPED[op], _literal(left)))
+            else:
+                raise FilterError(f"Each comparison needs one column and one value: {ast.unparse(node)}")
+        return predicates[0] if len(predicates) == 1 else _merge_and(predicates)
+    raise FilterError(f"Unsupported expression: {ast.unparse(node)}")
+
+def _merge_and(children):
+    """Flatten nested ands and fold range predicates on the same column into one"""
+    flat = []
+    for child in children:
+        flat.extend(child.children if isinstance(child, And) else [child])
+    ranges = {}
+    others = []
+    for child in flat:
+        if isinstance(child, Range):
+            ranges[child.column] = ranges[child.column].intersect(child) if child.column in ranges else child
+        else:
+            others.append(child)
+    merged = list(ranges.values()) + others
+    return merged[0] if len(merged) == 1 else And(merged)
+
+@lru_cache(maxsize=FILTER_CACHE_MAX_ENTRIES)
+def compile_filter(expression):
+    """
+    Compile a screener expression into a plan
+
+    Supports and/or/not, comparisons (including chains like 30 < rsi <= 70),
+    == / != on text, and in / not in with a tuple of values, e.g.
+    `rsi < 30 and market_cap_cr > 50000 and sector in ("IT", "Finance")`.
+    """
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise FilterError(f"Invalid filter expression: {e.msg}") from None
+    return _compile(tree.body)
+
+
+# -------------------------
+# Indexed table
+# -------------------------
+class FilterTable:
+    """
+    A screener DataFrame with lazily built column indexes and a result cache
+
+    Numeric columns get a sorted copy plus the row order, so range predicates
+    become two binary searches. Text columns get per-value row lists. Results
+    of every sub-expression are cached by their canonical form, so when only
+    one slider moves the other predicates are not evaluated again. The table
+    is immutable; build a new one when the data changes.
+    """
+
+    def __init__(self, frame, aliases=None, cache_size=FILTER_CACHE_MAX_ENTRIES):
+        self.frame = frame
+        self.columns = {column_key(name): name for name in frame.columns}
+        for alias, name in (aliases or {}).items():
+            self.columns[alias.lower()] = name
+        self._numeric = {}
+        self._sorted = {}
+        self._categories = {}
+        self._text_order = {}
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0}
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _column(self, key):
+        name = self.columns.get(key)
+        if name is None:
+            raise FilterError(f"Unknown column: {key}")
+        return self.frame[name]
+
+    def numeric(self, key):
+        values = self._numeric.get(key)
+        if values is None:
+            values = self._numeric[key] = pd.to_numeric(self._column(key), errors="coerce").to_numpy(dtype=np.float64)
+        return values
+
+    def sorted_index(self, key):
+        index = self._sorted.get(key)
+        if index is None:
+            values = self.numeric(key)
+            order = np.argsort(values, kind="stable")  # NaN sorts last and never matches a range
+            index = self._sorted[key] = (values[order], order)
+        return index
+
+    def sort_order(self, key):
+        """Row order of the whole table by one column, ascending, missing values last"""
+        name = self.columns.get(key)
+        if name is None:
+            raise FilterError(f"Unknown column: {key}")
+        if pd.api.types.is_numeric_dtype(self.frame[name]):
+            return self.sorted_index(key)[1]
+        order = self._text_order.get(key)
+        if order is None:
+            values = self.frame[name]
+            order = self._text_order[key] = np.lexsort((values.fillna("").astype(str).to_numpy(), values.isna().to_numpy()))
+        return order
+
+    def sort(self, rows, key, descending=False):
+        """
+        Reorder a filter result by a column without sorting it again
+
+        The column's full-table order is computed once; ordering any subset is
+        then a single pass over it. Missing values stay last either way.
+        """
+        order = self.sort_order(key)
+        mask = self._mask(rows)
+        ordered = order[mask[order]]
+        if not descending:
+            return ordered
+        name = self.columns[key]
+        missing = self.frame[name].isna().to_numpy()[ordered].sum()
+        present = len(ordered) - int(missing)
+        return np.concatenate([ordered[:present][::-1], ordered[present:]])
+
+    def _category(self, key):
+        category = self._categories.get(key)
+        if category is None:
+            codes, uniques = pd.factorize(self._column(key))
+            order = np.argsort(codes, kind="stable")
+            sizes = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            starts = np.concatenate([[0], np.cumsum(sizes)])
+            offset = int(np.count_nonzero(codes < 0))  # missing values sort first
+            rows = [order[offset + starts[i]:offset + starts[i + 1]] for i in range(len(uniques))]
+            category = self._categories[key] = (codes, {value: i for i, value in enumerate(uniques)}, sizes, rows)
+        return category
+
+    def codes(self, key):
+        return self._category(key)[0]
+
+    def category_codes(self, key):
+        return self._category(key)[1]
+
+    def category_sizes(self, key):
+        return self._category(key)[2]
+
+    def category_rows(self, key):
+        return self._category(key)[3]
+
+    # -------------------------
+    # Evaluation
+    # -------------------------
+    def _cached(self, key):
+        rows = self._cache.get(key)
+        if rows is not None:
+            self._cache.move_to_end(key)
+        return rows
+
+    def _remember(self, key, rows):
+        self._cache[key] = rows
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return rows
+
+    def _mask(self, rows):
+        mask = np.zeros(len(self), dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def _rows(self, node):
+        """Matching row ids (unordered) for a plan node, cached by its canonical key"""
+        rows = self._cached(node.key)
+        if rows is not None:
+            self._counters["hits"] += 1
+            return rows
+        self._counters["misses"] += 1
+
+        if isinstance(node, (Range, InSet)):
+            rows = node.rows(self)
+        elif isinstance(node, Not):
+            mask = np.ones(len(self), dtype=bool)
+            mask[self._rows(node.child)] = False
+            rows = np.flatnonzero(mask)
+        elif isinstance(node, Or):
+            mask = np.zeros(len(self), dtype=bool)
+            for child in node.children:
+                mask[self._rows(child)] = True
+            rows = np.flatnonzero(mask)
+        else:
+            rows = self._and_rows(node)
+        return self._remember(node.key, rows)
+
+    def _estimate(self, node):
+        cached = self._cached(node.key)
+        if cached is not None:
+            return len(cached)
+        if isinstance(node, (Range, InSet)):
+            return node.estimate(self)
+        return len(self._rows(node))
+
+    def _and_rows(self, node):
+        # Most selective predicate first: its rows become the candidates and
+        # every other predicate only looks at those
+        ranked = sorted(node.children, key=self._estimate)
+        candidates = self._rows(ranked[0])
+        for child in ranked[1:]:
+            if len(candidates) == 0:
+                break
+            if self._cached(child.key) is None and isinstance(child, (Range, InSet)):
+                candidates = child.test(self, candidates)
+            else:
+                candidates = candidates[self._mask(self._rows(child))[candidates]]
+        return candidates
+
+    def filter(self, expression):
+        """
+        Row positions matching an expression, in table order
+
+        Args:
+            expression (str): Screener expression; empty means every row
+
+        Returns:
+            np.ndarray: Sorted positional row indexes into self.frame
+        """
+        if not expression or not expression.strip():
+            return np.arange(len(self))
+        plan = compile_filter(expression)
+        with self._lock:
+            return np.sort(self._rows(plan))
+
+    def select(self, expression):
+        """Matching rows as a DataFrame"""
+        return self.frame.iloc[self.filter(expression)]
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, size=len(self._cache))
@@ -0,0 +1,196 @@
+# core/screener_snapshot.py
+
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from config.settings import MARKET_TIMEZONE, SCREENER_SNAPSHOT_PATH
+from core.providers import fetch_fundamentals_many
+from core.screener import LiveScan, ScreenerEngine
+
+# One uncompressed Arrow IPC file holding the screener table for the whole
+# universe: scan columns (see core.screener.RESULT_COLUMNS) plus fundamentals.
+# Numeric columns are written as plain float64 buffers (NaN stays NaN rather
+# than becoming an Arrow null), so readers memory-map the file and get pandas
+# columns backed by the mapped pages without decoding anything.
+SNAPSHOT_VERSION = 1
+TEXT_FUNDAMENTALS = ("name", "sector", "industry")
+NUMERIC_FUNDAMENTALS = ("market_cap", "pe_ratio", "dividend_yield")
+
+
+class Snapshot:
+    """A screener table read from a snapshot file"""
+
+    def __init__(self, frame, built_at, as_of, path=None, version=None):
+        self.frame = frame
+        self.built_at = built_at
+        self.as_of = as_of
+        self.path = path
+        self.version = version
+
+    def __len__(self):
+        return len(self.frame)
+
+    def describe(self):
+        as_of = pd.Timestamp(self.as_of, tz="UTC").tz_convert(MARKET_TIMEZONE)
+        built = pd.Timestamp(self.built_at, unit="s", tz="UTC").tz_convert(MARKET_TIMEZONE)
+        return f"End-of-day snapshot for {as_of:%d %b %Y}, built {built:%d %b %H:%M}"
+
+
+def build_snapshot(provider=None, symbols=None, fundamentals=True):
+    """
+    Compute the full screener table from scratch
+
+    Args:
+        provider (str | None): Market data backend, defaults to MARKET_DATA_PROVIDER
+        symbols (list[str] | None): Universe, defaults to every equity in the instrument master
+        fundamentals (bool): Also fetch name/sector/market cap/P/E per symbol
+
+    Returns:
+        Snapshot: Table with a "Symbol" column, RESULT_COLUMNS and the fundamentals columns
+    """
+    live = LiveScan(ScreenerEngine(provider).load_universe(symbols))
+    frame = live.result.reset_index()
+
+    info = fetch_fundamentals_many(list(frame["Symbol"]), provider=provider) if fundamentals else {}
+    for column in TEXT_FUNDAMENTALS:
+        frame[column] = [info.get(symbol, {}).get(column) for symbol in frame["Symbol"]]
+    for column in NUMERIC_FUNDAMENTALS:
+        frame[column] = np.array(
+            [info.get(symbol, {}).get(column, np.nan) for symbol in frame["Symbol"]], dtype=np.float64
+        )
+
+    as_of = int(live.universe.last_ts.max()) if len(live.universe) else 0
+    return Snapshot(frame, built_at=time.time(), as_of=as_of)
+
+
+def _to_arrow(frame):
+    arrays, names = [], []
+    for column in frame.columns:
+        values = frame[column]
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            array = pa.array(values.to_numpy())
+        else:
+            array = pa.array([None if pd.isna(value) else str(value) for value in values], type=pa.string())
+        arrays.append(array)
+        names.append(str(column))
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def write_snapshot(snapshot, path=SCREENER_SNAPSHOT_PATH):
+    """
+    Write a snapshot and atomically replace the file at `path`
+
+    The table is written next to the target and renamed over it, so readers
+    see either the old file or the new one, never a partial write. Readers
+    still mapping the old file keep a valid view of it until they let go.
+    """
+    table = _to_arrow(snapshot.frame).replace_schema_metadata({
+        "snapshot_version": str(SNAPSHOT_VERSION),
+        "built_at": repr(snapshot.built_at),
+        "as_of": str(snapshot.as_of),
+    })
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def file_version(path):
+    """Identity of the file currently at path (changes on every replace), or None"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def read_snapshot(path=SCREENER_SNAPSHOT_PATH):
+    """Memory-map a snapshot file; numeric columns are zero-copy views of the mapping"""
+    version = file_version(path)
+    source = pa.memory_map(path, "r")
+    table = pa.ipc.open_file(source).read_all()
+    metadata = {key.decode(): value.decode() for key, value in (table.schema.metadata or {}).items()}
+    if int(metadata.get("snapshot_version", 0)) != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported screener snapshot version in {path}")
+    frame = table.to_pandas(split_blocks=True)
+    return Snapshot(frame, float(metadata["built_at"]), int(metadata["as_of"]), path=path, version=version)
+
+
+class SnapshotReader:
+    """
+    Latest snapshot at a path, swapped in when the file is replaced
+
+    current() costs one stat() while the file is unchanged; after the job
+    renames a new file into place the next call maps it and returns the new
+    Snapshot, while callers holding the old one keep using it undisturbed.
+    """
+
+    def __init__(self, path=SCREENER_SNAPSHOT_PATH):
+        self.path = path
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def version(self):
+        return file_version(self.path)
+
+    def current(self):
+        """Latest snapshot, or None when no job has written one yet"""
+        version = self.version()
+        snapshot = self._snapshot
+        if version is None or (snapshot is not None and snapshot.version == version):
+            return snapshot
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != version:
+                try:
+                    self._snapshot = read_snapshot(self.path)
+                except (OSError, ValueError, pa.ArrowInvalid):
+                    # Keep serving the previous snapshot if the new one cannot be read
+                    pass
+            return self._snapshot
+
+
+# Create singleton instances, one reader per snapshot path
+_readers = {}
+_readers_lock = threading.Lock()
+
+def get_snapshot_reader(path=SCREENER_SNAPSHOT_PATH) -> SnapshotReader:
+    reader = _readers.get(path)
+    if reader is None:
+        with _readers_lock:
+            reader = _readers.get(path)
+            if reader is None:
+                reader = _readers[path] = SnapshotReader(path)
+    return reader
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build the end-of-day screener snapshot (run after market close, e.g. from cron)"
+    )
+    parser.add_argument("--provider", default=None, help="market data backend (default: MARKET_DATA_PROVIDER)")
+    parser.add_argument("--output", default=SCREENER_SNAPSHOT_PATH, help="snapshot file to replace")
+    parser.add_argument("--symbols", nargs="*", default=None, help="limit the universe to these symbols")
+    parser.add_argument("--no-fundamentals", action="store_true", help="skip the per-symbol fundamentals fetch")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    snapshot = build_snapshot(args.provider, symbols=args.symbols, fundamentals=not args.no_fundamentals)
+    path = write_snapshot(snapshot, args.output)
+    print(f"{snapshot.describe()}: {len(snapshot)} symbols -> {path} ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
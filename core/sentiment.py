@@ -1,20 +1,373 @@
 # core/sentiment.py
 
-import random
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+
+from config.settings import (
+    MARKET_TIMEZONE,
+    SENTIMENT_CACHE_MAX_ENTRIES,
+    SENTIMENT_HALF_LIFE,
+    SENTIMENT_NEGATION_SCOPE,
+    SENTIMENT_NEUTRAL_BAND,
+)
+from core.news import get_news_ingestor, get_news_store, tokenize
+from core.rollups import TimeRollups
+
+# Finance-oriented lexicon: word -> polarity weight
+LEXICON = {
+    **dict.fromkeys([
+        "gain", "gains", "gained", "rally", "rallies", "rallied", "surge", "surges", "surged", "rise", "rises",
+        "rose", "higher", "jump", "jumps", "jumped", "rebound", "rebounds", "rebounded", "recovery", "advance",
+        "advances", "lift", "lifts", "lifted", "boost", "boosts", "boosting", "growth", "profit", "profits",
+        "improve", "improves", "improved", "improving", "beat", "beats", "beating", "upgrade", "upgraded",
+        "positive", "optimism", "confidence", "approval", "approved", "wins", "won", "raises", "raised",
+        "eases", "eased", "cooled", "buying", "support", "supports", "high", "highs",
+    ], 1.0),
+    **dict.fromkeys(["strong", "robust", "bullish", "outperform", "momentum"], 1.5),
+    **dict.fromkeys([
+        "fall", "falls", "fell", "falling", "decline", "declines", "declined", "drop", "drops", "dropped",
+        "slip", "slips", "slipped", "lower", "loss", "losses", "losers", "weak", "weaker", "weakened", "miss",
+        "missed", "misses", "downgrade", "downgraded", "concern", "concerns", "worries", "worry", "fear",
+        "fears", "volatility", "sluggish", "pressure", "selling", "sellers", "outflows", "drag", "risk",
+        "risks", "uncertainty", "curbs", "barred", "deficiencies", "cautious", "dump", "cancelled", "narrow",
+        "low", "lows",
+    ], -1.0),
+    **dict.fromkeys(["plunge", "plunged", "slump", "crash", "bearish", "disappoints", "disappointing"], -1.5),
+}
+NEGATORS = ("not", "no", "never", "without", "nor", "hardly", "fails", "failed")
+INTENSIFIERS = {  # scale the polarity of the word before or after them
+    "sharply": 1.5, "strongly": 1.5, "significantly": 1.4, "very": 1.3, "steep": 1.3, "heavily": 1.4, "record": 1.3,
+}
+NEGATION_SCALAR = -0.74  # a negated word keeps most of its strength with the sign flipped
+NORMALIZATION_ALPHA = 15  # raw sum s maps to s / sqrt(s^2 + alpha), in (-1, 1)
+ROLLUP_FIELDS = ("score", "articles", "bullish", "bearish")  # summed per bucket; the market series has key None
+
+
+class LexiconScorer:
+    """
+    Scores whole batches of texts against a word lexicon
+
+    Tokens of every text in the batch are mapped to lexicon ids in one pass
+    and laid end to end; weights, intensifiers (either neighbouring word) and
+    negation (a negator within `scope` words before, in the same text) are
+    then applied as array operations, and one bincount sums each text.
+    """
+
+    def __init__(self, lexicon=LEXICON, negators=NEGATORS, intensifiers=INTENSIFIERS, scope=SENTIMENT_NEGATION_SCOPE):
+        words = sorted(set(lexicon) | set(negators) | set(intensifiers))
+        self.vocabulary = {word: i for i, word in enumerate(words, start=1)}  # 0: any other word
+        self._weights = np.array([0.0] + [lexicon.get(word, 0.0) for word in words])
+        self._negator = np.array([0] + [word in negators for word in words], dtype=np.int64)
+        self._boost = np.array([1.0] + [intensifiers.get(word, 1.0) for word in words])
+        self.scope = scope
+        # Part of every cache key, so editing the lexicon never serves old scores
+        self.version = hashlib.blake2b(
+            repr((sorted(lexicon.items()), sorted(negators), sorted(intensifiers.items()), scope)).encode(), digest_size=8
+        ).hexdigest()
+
+    def score(self, texts):
+        """Polarity of each text in (-1, 1): negative is bearish, positive bullish"""
+        lookup = self.vocabulary.get
+        ids, lengths = [], []
+        for text in texts:
+            tokens = tokenize(text)
+            ids.extend(lookup(token, 0) for token in tokens)
+            lengths.append(len(tokens))
+        ids = np.array(ids, dtype=np.int64)
+        lengths = np.array(lengths, dtype=np.int64)
+        docs = np.repeat(np.arange(len(lengths)), lengths)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.arange(len(ids))
+
+        weights = self._weights[ids]
+        has_previous = positions > starts
+        weights[has_previous] *= self._boost[ids[positions[has_previous] - 1]]
+        has_next = np.ones(len(ids), dtype=bool)
+        has_next[np.cumsum(lengths)[lengths > 0] - 1] = False
+        weights[has_next] *= self._boost[ids[positions[has_next] + 1]]
+        negators_before = np.concatenate(([0], np.cumsum(self._negator[ids])))
+        negated = negators_before[positions] > negators_before[np.maximum(positions - self.scope, starts)]
+        weights[negated] *= NEGATION_SCALAR
+
+        raw = np.bincount(docs, weights=weights, minlength=len(lengths))
+        return raw / np.sqrt(raw * raw + NORMALIZATION_ALPHA)
+
+
+def sentiment_label(score):
+    if score >= SENTIMENT_NEUTRAL_BAND:
+        return "Bullish"
+    if score <= -SENTIMENT_NEUTRAL_BAND:
+        return "Bearish"
+    return "Neutral"
+
+def sentiment_percent(score):
+    """Polarity in (-1, 1) as a 0-100 gauge, 50 being neutral"""
+    return int(round((score + 1) * 50))
+
+def summarize_totals(totals):
+    """Summary (as SentimentAggregate.summary) of ROLLUP_FIELDS totals"""
+    total, articles, bullish, bearish = totals
+    score = total / articles if articles else 0.0
+    return {
+        "score": score,
+        "percent": sentiment_percent(score),
+        "label": sentiment_label(score),
+        "articles": int(articles),
+        "bullish_pct": 100 * bullish / articles if articles else 0.0,
+        "bearish_pct": 100 * bearish / articles if articles else 0.0,
+    }
+
+
+class SentimentAggregate:
+    """
+    Recency-weighted running sentiment for one symbol or the whole market
+
+    An article's weight halves every `half_life` relative to the newest
+    article seen, so the aggregate tracks the current mood in O(1) memory;
+    sums are rescaled when a newer article arrives and older, late-arriving
+    articles simply come in with a smaller weight.
+    """
+
+    __slots__ = ("half_life_ns", "weight", "total", "bullish", "bearish", "articles", "as_of_ns")
+
+    def __init__(self, half_life_ns):
+        self.half_life_ns = half_life_ns
+        self.weight = self.total = self.bullish = self.bearish = 0.0
+        self.articles = 0
+        self.as_of_ns = None
+
+    def add(self, score, published_ns):
+        if self.as_of_ns is None or published_ns > self.as_of_ns:
+            if self.as_of_ns is not None:
+                decay = 0.5 ** ((published_ns - self.as_of_ns) / self.half_life_ns)
+                self.weight *= decay
+                self.total *= decay
+                self.bullish *= decay
+                self.bearish *= decay
+            self.as_of_ns = published_ns
+            weight = 1.0
+        else:
+            weight = 0.5 ** ((self.as_of_ns - published_ns) / self.half_life_ns)
+        self.weight += weight
+        self.total += weight * score
+        self.bullish += weight * (score >= SENTIMENT_NEUTRAL_BAND)
+        self.bearish += weight * (score <= -SENTIMENT_NEUTRAL_BAND)
+        self.articles += 1
+
+    def summary(self):
+        score = self.total / self.weight if self.weight else 0.0
+        return {
+            "score": score,
+            "percent": sentiment_percent(score),
+            "label": sentiment_label(score),
+            "articles": self.articles,
+            "bullish_pct": 100 * self.bullish / self.weight if self.weight else 0.0,
+            "bearish_pct": 100 * self.bearish / self.weight if self.weight else 0.0,
+        }
+
+
+class SentimentEngine:
+    """
+    Scores stored news in batches and keeps per-symbol and market aggregates
+
+    Scores are cached by a hash of the scored text (and the lexicon version),
+    so a story is scored once however many times it is asked for. sync()
+    takes only the articles the news store gained since the previous call,
+    scores them as one batch and folds them into the aggregates and into
+    minute/hour/day rollups (core.rollups), from which any time window or
+    chart is answered.
+    """
+
+    def __init__(self, scorer=None, max_entries=SENTIMENT_CACHE_MAX_ENTRIES, half_life=SENTIMENT_HALF_LIFE):
+        self.scorer = scorer or LexiconScorer()
+        self.max_entries = max_entries
+        self.half_life_ns = int(pd.Timedelta(half_life).value)
+        self.market = SentimentAggregate(self.half_life_ns)
+        self._symbols = {}
+        self.rollups = TimeRollups(len(ROLLUP_FIELDS))
+        self._position = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "batches": 0, "evictions": 0}
+
+    def _key(self, text):
+        return hashlib.blake2b(f"{self.scorer.version}\0{text}".encode(), digest_size=16).digest()
+
+    def score_batch(self, texts):
+        """Scores for a list of texts, scoring only those not seen before (as one batch)"""
+        keys = [self._key(text) for text in texts]
+        scores = np.empty(len(texts))
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                score = self._cache.get(key)
+                if score is None:
+                    missing.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    scores[i] = score
+            self._counters["hits"] += len(texts) - len(missing)
+            self._counters["misses"] += len(missing)
+        if not missing:
+            return scores
+
+        scores[missing] = self.scorer.score([texts[i] for i in missing])
+        with self._lock:
+            self._counters["batches"] += 1
+            for i in missing:
+                self._cache[keys[i]] = float(scores[i])
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+                self._counters["evictions"] += 1
+        return scores
+
+    def score_articles(self, articles):
+        return self.score_batch([f"{article['title']}. {article['summary']}" for article in articles])
+
+    def add(self, articles):
+        """Score articles and fold them into the aggregates; returns their scores"""
+        scores = self.score_articles(articles)
+        with self._lock:
+            for article, score in zip(articles, scores.tolist()):
+                self.market.add(score, article["published_ns"])
+                for symbol in article["symbols"]:
+                    aggregate = self._symbols.get(symbol)
+                    if aggregate is None:
+                        aggregate = self._symbols[symbol] = SentimentAggregate(self.half_life_ns)
+                    aggregate.add(score, article["published_ns"])
+                values = (score, 1, score >= SENTIMENT_NEUTRAL_BAND, score <= -SENTIMENT_NEUTRAL_BAND)
+                self.rollups.add(None, article["published_ns"], values)
+                for symbol in article["symbols"]:
+                    self.rollups.add(symbol, article["published_ns"], values)
+            self.rollups.compact()
+        return scores
+
+    def sync(self, store):
+        """Aggregate the articles a news store gained since the last sync"""
+        with self._sync_lock:
+            articles, position = store.since(self._position)
+            if articles:
+                self.add(articles)
+            self._position = position
+            return len(articles)
+
+    def market_sentiment(self):
+        with self._lock:
+            return self.market.summary()
+
+    def symbol_sentiment(self, symbol):
+        """Aggregate for one symbol, or None when no article mentions it"""
+        with self._lock:
+            aggregate = self._symbols.get(symbol.upper())
+            return aggregate.summary() if aggregate is not None else None
+
+    def symbol_table(self):
+        """Every symbol's aggregate as a frame, most mentioned first"""
+        with self._lock:
+            rows = [dict(aggregate.summary(), symbol=symbol) for symbol, aggregate in self._symbols.items()]
+        frame = pd.DataFrame(rows, columns=["symbol", "score", "percent", "label", "articles", "bullish_pct", "bearish_pct"])
+        return frame.sort_values(["articles", "symbol"], ascending=[False, True], ignore_index=True)
+
+    def window_sentiment(self, start_ns, end_ns, symbol=None):
+        """Summary of the articles published in [start_ns, end_ns), from the rollups"""
+        with self._lock:
+            totals, _ = self.rollups.window(symbol and symbol.upper(), start_ns, end_ns)
+        return summarize_totals(totals)
+
+    def trend(self, start_ns, end_ns, resolution, symbol=None):
+        """Rollup buckets of one resolution as (bucket start ns, ROLLUP_FIELDS totals) arrays"""
+        with self._lock:
+            return self.rollups.series(symbol and symbol.upper(), start_ns, end_ns, resolution)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters, size=len(self._cache), max_entries=self.max_entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+# Create a singleton instance
+_sentiment_engine = None
+_sentiment_engine_lock = threading.Lock()
+
+def get_sentiment_engine() -> SentimentEngine:
+    """
+    Get or create the process-wide engine, attached to the news store
+
+    The engine catches up with the store on creation and after every batch
+    the news ingestor stores; readers below also sync, which picks up
+    articles another process appended to the store.
+    """
+    global _sentiment_engine
+    if _sentiment_engine is None:
+        with _sentiment_engine_lock:
+            if _sentiment_engine is None:
+                engine = SentimentEngine()
+                store = get_news_store()
+                get_news_ingestor().add_listener(lambda records: engine.sync(store))
+                engine.sync(store)
+                _sentiment_engine = engine
+    return _sentiment_engine
+
+def _synced_engine():
+    engine = get_sentiment_engine()
+    engine.sync(get_news_store())
+    return engine
+
 
 def get_overall_sentiment():
-    score = random.randint(40, 80)
-    label = "Bullish" if score >= 60 else "Bearish" if score <= 45 else "Neutral"
-    return score, label
+    """Market-wide sentiment as (0-100 score, "Bullish"/"Neutral"/"Bearish")"""
+    summary = _synced_engine().market_sentiment()
+    return summary["percent"], summary["label"]
+
+def get_symbol_sentiment(symbol):
+    """A symbol's sentiment summary (score, percent, label, articles, ...), or None without coverage"""
+    return _synced_engine().symbol_sentiment(symbol)
+
+def get_symbol_sentiment_table():
+    return _synced_engine().symbol_table()
 
-def get_sentiment_trends():
-    today = datetime.now()
+def get_sentiment_trends(window="7D", resolution="1D", symbol=None):
+    """
+    Sentiment per time bucket over the last `window`, read from the rollups
+
+    Args:
+        window (str): Period to chart, e.g. "1D", "7D", "30D"
+        resolution (str): Bucket width, one of the SENTIMENT_ROLLUP_TIERS widths
+        symbol (str | None): A symbol's stories, or the whole market
+
+    Returns:
+        pd.DataFrame: Date, Sentiment Score (0-100, NaN for buckets without stories), Stories
+    """
+    end = pd.Timestamp.now(tz=MARKET_TIMEZONE)
+    starts, totals = _synced_engine().trend((end - pd.Timedelta(window)).value, end.value, resolution, symbol)
+    articles = totals[:, ROLLUP_FIELDS.index("articles")]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = totals[:, ROLLUP_FIELDS.index("score")] / articles
     return pd.DataFrame({
-        "Date": [today - timedelta(days=i) for i in range(7)][::-1],
-        "Sentiment Score": [random.randint(40, 80) for _ in range(7)]
+        "Date": pd.to_datetime(starts, utc=True).tz_convert(MARKET_TIMEZONE),
+        "Sentiment Score": ((mean + 1) * 50).round(1),
+        "Stories": articles.astype(int),
     })
 
-def get_trending_keywords():
-    return ["Nifty", "Buyback", "Bullish", "Support", "Breakout", "RBI", "Inflation"]
+def get_window_sentiment(window="1D", symbol=None):
+    """Sentiment summary of the stories published over the last `window`"""
+    end = pd.Timestamp.now(tz=MARKET_TIMEZONE)
+    return _synced_engine().window_sentiment((end - pd.Timedelta(window)).value, end.value, symbol)
+
+def get_scored_headlines(limit=10):
+    """Latest stories with their sentiment score, label and 0-100 gauge (served from the score cache)"""
+    engine = _synced_engine()
+    articles = get_news_store().latest(limit)
+    scores = engine.score_articles(articles) if articles else []
+    return [
+        {"title": article["title"], "source": article["source"], "score": score,
+         "percent": sentiment_percent(score), "label": sentiment_label(score)}
+        for article, score in zip(articles, np.asarray(scores).tolist())
+    ]
@@ -0,0 +1,46 @@
+import streamlit as st
+from typing import Optional, Sequence
+
+from core.instruments import get_instrument_master
+
+SEARCH_RESULT_LIMIT = 20
+
+def symbol_picker(
+    label: str,
+    popular: Sequence[str] = (),
+    key: str = "symbol_picker",
+) -> Optional[str]:
+    """
+    Symbol selector that searches the whole instrument master
+
+    Args:
+        label (str): Label for the selectbox
+        popular (Sequence[str]): Options shown before anything is typed
+        key (str): Widget key prefix, unique per picker on a page
+
+    Returns:
+        Optional[str]: Selected symbol (e.g. "INFY"), or None if nothing is selected
+    """
+    query = st.text_input(
+        f"Search {label.lower()}",
+        key=f"{key}_query",
+        placeholder="Type a symbol or company name...",
+    )
+
+    if query.strip():
+        matches = get_instrument_master().search(query, limit=SEARCH_RESULT_LIMIT)
+        options = list(dict.fromkeys(match["symbol"] for match in matches))
+        names = {match["symbol"]: match["name"] for match in matches}
+        if not options:
+            st.caption(f"No instruments match “{query.strip()}”")
+    else:
+        options = list(popular)
+        names = {}
+
+    return st.selectbox(
+        label,
+        options,
+        index=0 if options else None,
+        format_func=lambda symbol: f"{symbol} · {names[symbol].title()}" if names.get(symbol, symbol) != symbol else symbol,
+        key=f"{key}_select",
+    )
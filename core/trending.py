@@ -0,0 +1,221 @@
+# core/trending.py
+
+import hashlib
+import heapq
+import math
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from config.settings import (
+    TRENDING_SKETCH_DEPTH,
+    TRENDING_SKETCH_WIDTH,
+    TRENDING_TOP_K,
+    TRENDING_WINDOWS,
+)
+from core.news import analyze, get_news_ingestor, get_news_store
+
+# Words too generic to be a trend in market news, on top of the search stopwords
+TRENDING_STOPWORDS = frozenset(
+    "about according across after against ahead amid also analysts are around as but can could crore day days "
+    "into it more new out over per cent said says share shares stock stocks market markets than their they up "
+    "week which while year".split()
+)
+RESCALE_EXPONENT = 30.0  # rescale counters before e^(age / tau) grows past e^30
+MIN_DECAYED_COUNT = 0.01  # decayed document counts below this are not trending any more
+
+
+def document_terms(text):
+    """Distinct candidate keywords of a text: no stopwords, numbers or very short words"""
+    return list(dict.fromkeys(
+        term for term in analyze(text)
+        if len(term) > 2 and not term.isdigit() and term not in TRENDING_STOPWORDS
+    ))
+
+
+class DecayedCountMinSketch:
+    """
+    Count-min sketch of exponentially decayed counts
+
+    Uses forward decay: an event at time t adds e^((t - landmark) / tau), and
+    a count read at `now` is divided by e^((now - landmark) / tau), which is
+    exactly the sum of e^(-(now - t) / tau) over the term's events. Nothing
+    is decayed on update, so adding a term touches only its `depth` counters;
+    the landmark moves forward (one pass over the table) whenever the
+    exponent gets large. Estimates never undercount.
+    """
+
+    def __init__(self, tau_ns, width=TRENDING_SKETCH_WIDTH, depth=TRENDING_SKETCH_DEPTH):
+        self.tau_ns = tau_ns
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width))
+        self.landmark_ns = None
+        self._rows = np.arange(depth)
+
+    def columns(self, terms):
+        """(depth, terms) counter positions, by double hashing one 128-bit digest per term"""
+        digests = np.frombuffer(
+            b"".join(hashlib.blake2b(term.encode(), digest_size=16).digest() for term in terms), dtype=np.uint64
+        ).reshape(-1, 2)
+        first, second = digests[:, 0], digests[:, 1] | np.uint64(1)
+        return ((first[None, :] + self._rows[:, None].astype(np.uint64) * second[None, :]) % np.uint64(self.width)).astype(np.intp)
+
+    def weight(self, published_ns):
+        """Forward-decay weight of an event, moving the landmark first if needed; returns (weight, rescale factor)"""
+        factor = 1.0
+        if self.landmark_ns is None:
+            self.landmark_ns = published_ns
+        elif (published_ns - self.landmark_ns) / self.tau_ns > RESCALE_EXPONENT:
+            factor = math.exp(-(published_ns - self.landmark_ns) / self.tau_ns)
+            self.table *= factor
+            self.landmark_ns = published_ns
+        return math.exp((published_ns - self.landmark_ns) / self.tau_ns), factor
+
+    def add(self, columns, weight):
+        """Add a weighted event for each term's counters; returns the terms' new raw estimates"""
+        np.add.at(self.table, (self._rows[:, None], columns), weight)
+        return self.table[self._rows[:, None], columns].min(axis=0)
+
+    def log_scale(self, now_ns):
+        """Log of the divisor that turns raw estimates into decayed counts at now_ns
+
+        Kept in log space: long after the newest event e^(age / tau) overflows.
+        """
+        if self.landmark_ns is None:
+            return 0.0
+        return (now_ns - self.landmark_ns) / self.tau_ns
+
+
+class HeavyHitters:
+    """
+    The k terms with the largest sketch estimates seen so far
+
+    A term enters when its estimate beats the smallest tracked one, which it
+    then replaces. With forward decay every term's raw estimate only grows
+    and all of them are read on one scale, so this ordering is the ordering
+    of decayed counts at any later time.
+    """
+
+    def __init__(self, k=TRENDING_TOP_K):
+        self.k = k
+        self.counts = {}
+        self._heap = []  # (estimate, term), with stale entries skipped lazily
+
+    def _min(self):
+        """Smallest tracked (estimate, term), dropping heap entries that are out of date"""
+        heap = self._heap
+        while self.counts.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0]
+
+    def _push(self, term, estimate):
+        self.counts[term] = estimate
+        heapq.heappush(self._heap, (estimate, term))
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(count, term) for term, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def offer(self, term, estimate):
+        if term in self.counts or len(self.counts) < self.k:
+            self._push(term, estimate)
+        elif estimate > self._min()[0]:
+            del self.counts[heapq.heappop(self._heap)[1]]
+            self._push(term, estimate)
+
+    def scale(self, factor):
+        self.counts = {term: count * factor for term, count in self.counts.items()}
+        self._heap = [(count, term) for term, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+    def top(self, limit):
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+class TrendTracker:
+    """
+    Trending keywords over several decay horizons in bounded memory
+
+    Each horizon ("hour", "day", ... from TRENDING_WINDOWS) has its own
+    decayed count-min sketch and heavy-hitter set, all of the same shape so
+    a document's terms are hashed once; it then costs `depth` counter
+    updates per distinct term and horizon, and no token is stored. top()
+    answers from the k tracked terms only.
+    """
+
+    def __init__(self, windows=TRENDING_WINDOWS, width=TRENDING_SKETCH_WIDTH, depth=TRENDING_SKETCH_DEPTH, k=TRENDING_TOP_K):
+        self.windows = {
+            name: (DecayedCountMinSketch(int(pd.Timedelta(tau).value), width, depth), HeavyHitters(k))
+            for name, tau in windows.items()
+        }
+        self.documents = 0
+        self._position = 0
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    def add(self, text, published_ns):
+        """Count one document's distinct terms at its publish time"""
+        terms = document_terms(text)
+        with self._lock:
+            self.documents += 1
+            if not terms:
+                return
+            columns = None
+            for sketch, hitters in self.windows.values():
+                if columns is None:
+                    columns = sketch.columns(terms)
+                weight, factor = sketch.weight(published_ns)
+                if factor != 1.0:
+                    hitters.scale(factor)
+                for term, estimate in zip(terms, sketch.add(columns, weight).tolist()):
+                    hitters.offer(term, estimate)
+
+    def sync(self, store):
+        """Count the articles a news store gained since the last sync"""
+        with self._sync_lock:
+            articles, position = store.since(self._position)
+            for article in articles:
+                self.add(f"{article['title']} {article['summary']}", article["published_ns"])
+            self._position = position
+            return len(articles)
+
+    def top(self, window="hour", limit=10, now_ns=None):
+        """
+        Most mentioned terms over a horizon
+
+        Returns:
+            list[tuple]: (term, decayed document count at now_ns), largest first;
+                empty once the news has gone quiet for many horizons
+        """
+        with self._lock:
+            sketch, hitters = self.windows[window]
+            log_scale = sketch.log_scale(now_ns or time.time_ns())
+            counts = [(term, math.exp(math.log(count) - log_scale)) for term, count in hitters.top(limit)]
+            return [(term, count) for term, count in counts if count >= MIN_DECAYED_COUNT]
+
+
+# Create a singleton instance
+_trend_tracker = None
+_trend_tracker_lock = threading.Lock()
+
+def get_trend_tracker() -> TrendTracker:
+    """Get or create the process-wide tracker, fed by the news store like the sentiment engine"""
+    global _trend_tracker
+    if _trend_tracker is None:
+        with _trend_tracker_lock:
+            if _trend_tracker is None:
+                tracker = TrendTracker()
+                store = get_news_store()
+                get_news_ingestor().add_listener(lambda records: tracker.sync(store))
+                tracker.sync(store)
+                _trend_tracker = tracker
+    return _trend_tracker
+
+
+def get_trending_keywords(window="hour", limit=7):
+    """Top keywords in the news over a TRENDING_WINDOWS horizon ("hour" or "day")"""
+    tracker = get_trend_tracker()
+    tracker.sync(get_news_store())
+    return [term for term, _ in tracker.top(window, limit)]
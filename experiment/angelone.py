@@ -1,18 +1,20 @@
-import pandas as pd
+import os
+import sys
 
-# Fetch from GitHub (direct raw link)
-csv_url = "https://github.com/angel-one/smartapi-python/raw/main/instrument_files/NSE.csv"
-df = pd.read_csv(csv_url)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Clean column names
-df.columns = df.columns.str.strip().str.lower()
+from core.instruments import get_instrument_master
 
-# Check columns
-print("Available Columns:", df.columns.tolist())
+# Parses the NSE instrument CSV once, later runs load the binary index
+master = get_instrument_master()
+print("Instruments loaded:", len(master))
 
 # Lookup symboltoken for INFY-EQ
-row = df[df["symbol"] == "INFY-EQ"]
-if row.empty:
+row = master.lookup("INFY-EQ")
+if row is None:
     print("Symbol not found.")
 else:
-    print(row[["symboltoken", "symbol", "name"]])
+    print(row["token"], row["trading_symbol"], row["name"])
+
+# Prefix autocomplete
+print([match["symbol"] for match in master.search("INF")])
@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import FORECAST_HISTORY_BARS, FORECAST_HORIZON
+from core.predictions import MODELS
+from core.providers import MockProvider, period_to_range, _session_index
+from core.screener import Universe
+
+WATCHLIST_SIZES = [1, 50, 500]
+
+
+def make_frames(count):
+    """Offline watchlist of mock symbols with two years of daily bars each"""
+    start, end = period_to_range("2y")
+    index = _session_index(start, end, "1d")
+    return {f"SYM{i}": MockProvider.generate_bars(f"SYM{i}", index) for i in range(count)}
+
+
+def time_call(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+if __name__ == "__main__":
+    print(f"{'model':>6} {'symbols':>8} {'per-symbol (ms)':>16} {'batch (ms)':>11} {'speedup':>8} {'max |diff|':>11}")
+    for count in WATCHLIST_SIZES:
+        frames = make_frames(count)
+        universe = Universe.from_frames(frames, max_bars=FORECAST_HISTORY_BARS)
+        for name, model in MODELS.items():
+            looped, expected = time_call(lambda: [
+                model().fit(df.index.asi8, df["Close"].to_numpy()).forecast(FORECAST_HORIZON)[0] for df in frames.values()
+            ])
+            batched, (mean, _, _) = time_call(lambda: model.forecast_batch(universe.close, FORECAST_HORIZON))
+            diff = np.abs(mean - np.array(expected)).max()
+            print(f"{name:>6} {count:>8} {looped:>16.1f} {batched:>11.1f} {looped / batched:>7.1f}x {diff:>11.2e}")
@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+
+import yfinance as yf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.providers import fetch_quotes
+
+SYMBOLS = ["RELIANCE.NS", "TCS.NS", "HDFCBANK.NS", "INFY.NS", "ICICIBANK.NS"]
+
+
+def old_current_price(symbol):
+    """The previous get_current_price: Ticker.info, then a 2-day history fallback"""
+    stock = yf.Ticker(symbol)
+    info = stock.info
+    current_price = info.get("currentPrice", 0)
+    if current_price == 0:
+        data = stock.history(period="2d", interval="1d")
+        if not data.empty:
+            current_price = data["Close"].iloc[-1]
+    return current_price
+
+
+def new_current_price(symbol):
+    """The quote path behind get_cached_quote, without the cache in front"""
+    return fetch_quotes([symbol], provider="yfinance")[symbol]["price"]
+
+
+def time_call(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    print(f"{'symbol':>14} {'Ticker.info (ms)':>17} {'daily bars (ms)':>16}")
+    for symbol in SYMBOLS:
+        before = time_call(lambda: old_current_price(symbol))
+        after = time_call(lambda: new_current_price(symbol))
+        print(f"{symbol:>14} {before:>17.1f} {after:>16.1f}")
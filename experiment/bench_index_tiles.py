@@ -0,0 +1,44 @@
+import os
+import sys
+import time
+
+import yfinance as yf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.providers import fetch_quotes
+
+# Tiles on pages/1_Dashboard.py and the six indices on experiment/stock_dashboard.py
+DASHBOARD_INDICES = ["^NSEI", "^BSESN", "^CNX100"]
+EXPERIMENT_INDICES = ["^NSEI", "^BSESN", "^NSEBANK", "^CNXIT", "^CNXPHARMA", "^CNXAUTO"]
+
+
+def time_call(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def per_ticker_history(symbols):
+    """What the pages used to do on a cold load: one history round trip per index"""
+    quotes = {}
+    for symbol in symbols:
+        data = yf.Ticker(symbol).history(period="1d")
+        if not data.empty:
+            quotes[symbol] = float(data["Close"].iloc[-1])
+    return quotes
+
+
+def per_ticker_info(symbols):
+    """The old experiment dashboard path: Ticker.info per index"""
+    return {symbol: yf.Ticker(symbol).info.get("regularMarketPrice") for symbol in symbols}
+
+
+if __name__ == "__main__":
+    print(f"{'page':>10} {'indices':>8} {'per-ticker (ms)':>16} {'.info (ms)':>11} {'batched (ms)':>13} {'quotes':>7}")
+    for page, symbols in (("dashboard", DASHBOARD_INDICES), ("experiment", EXPERIMENT_INDICES)):
+        # Each row is a cold load: yfinance keeps no response cache between calls
+        before, _ = time_call(lambda: per_ticker_history(symbols))
+        info, _ = time_call(lambda: per_ticker_info(symbols))
+        after, quotes = time_call(lambda: fetch_quotes(symbols, provider="yfinance"))
+        print(f"{page:>10} {len(symbols):>8} {before:>16.1f} {info:>11.1f} {after:>13.1f} {len(quotes):>7}")
@@ -0,0 +1,31 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.angel_api import get_live_price, get_live_prices
+
+SYMBOL_COUNTS = [1, 5, 10, 25, 50]
+
+
+def make_symbols(count):
+    return [f"SYM{i}" for i in range(count)]
+
+
+def time_call(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    # Warm up the shared thread pool so the first row isn't skewed
+    get_live_prices(make_symbols(max(SYMBOL_COUNTS)))
+
+    print(f"{'symbols':>8} {'sequential (ms)':>16} {'batched (ms)':>13}")
+    for count in SYMBOL_COUNTS:
+        symbols = make_symbols(count)
+        sequential = time_call(lambda: [get_live_price(s) for s in symbols])
+        batched = time_call(lambda: get_live_prices(symbols))
+        print(f"{count:>8} {sequential:>16.1f} {batched:>13.1f}")
@@ -0,0 +1,46 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.model_store import ModelStore
+from core.predictions import MODELS
+
+from bench_batch_forecast import make_frames
+
+SYMBOLS = 1000
+MAX_RESIDENT = 100
+
+
+def time_call(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+if __name__ == "__main__":
+    frames = make_frames(SYMBOLS)
+    with tempfile.TemporaryDirectory() as root:
+        store = ModelStore(root, MODELS, max_resident=MAX_RESIDENT)
+        fitted = {symbol: MODELS["ar"]().fit(df.index.asi8, df["Close"].to_numpy()) for symbol, df in frames.items()}
+        elapsed, _ = time_call(lambda: [store.save(symbol, model) for symbol, model in fitted.items()])
+        print(f"save {SYMBOLS} AR models: {elapsed:.0f} ms ({elapsed / SYMBOLS:.3f} ms each)")
+
+        # A new process: nothing is loaded until a symbol is asked for
+        elapsed, fresh = time_call(lambda: ModelStore(root, MODELS, max_resident=MAX_RESIDENT))
+        print(f"open store: {elapsed:.3f} ms, resident models: {fresh.stats()['resident']}")
+        symbols = list(frames)
+        first, _ = time_call(lambda: [fresh.get(symbol, "ar") for symbol in symbols[:MAX_RESIDENT]])
+        again, _ = time_call(lambda: [fresh.get(symbol, "ar") for symbol in symbols[:MAX_RESIDENT]])
+        print(f"first use (map) {first / MAX_RESIDENT:.3f} ms/model, resident hit {again / MAX_RESIDENT:.3f} ms/model")
+
+        expected = fitted[symbols[0]].forecast(10)[0]
+        print("forecast from mapped model identical:", np.array_equal(fresh.get(symbols[0], "ar").forecast(10)[0], expected))
+
+        for symbol in symbols:
+            fresh.get(symbol, "ar")
+        print(f"after touching all {SYMBOLS}: {fresh.stats()}")
@@ -0,0 +1,93 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import NEWS_FIXTURE_DIR
+from core.news import FixtureFeed, NewsStore, tokenize
+
+ARTICLES = 200_000
+BATCH = 1000
+QUERIES = ["rate cut", "infosys guidance", "banking stocks bad loans", "record high nifty", "crude oil rupee", "w123"]
+
+
+def make_records(count, seed=0):
+    """Synthetic articles: fixture words plus a long tail of rare ones, spread over a year"""
+    rng = np.random.default_rng(seed)
+    fixtures = list(FixtureFeed(NEWS_FIXTURE_DIR, rebase=False).stream())
+    vocabulary = sorted({token for item in fixtures for token in tokenize(f"{item['title']} {item['summary']}")})
+    vocabulary = np.array(vocabulary + [f"w{i}" for i in range(20000)])
+    cumulative = np.cumsum(1 / np.arange(1, len(vocabulary) + 1))
+    cumulative /= cumulative[-1]
+    symbols = ["RELIANCE", "TCS", "INFY", "HDFCBANK", "ICICIBANK", "SBIN", "ITC"]
+    start = 1_700_000_000 * 10 ** 9
+    records = []
+    for i in range(count):
+        words = vocabulary[np.searchsorted(cumulative, rng.random(rng.integers(20, 40)))]
+        published_ns = start + i * (365 * 86400 * 10 ** 9 // count)
+        records.append({
+            "id": f"{i:016x}", "key": str(i), "feed": "bench",
+            "title": " ".join(words[:8]), "summary": " ".join(words[8:]),
+            "url": f"https://example.com/{i}", "source": "Bench",
+            "published": "", "published_ns": published_ns,
+            "symbols": list(rng.choice(symbols, size=rng.integers(0, 3), replace=False)),
+            "duplicate_of": None,
+        })
+    return records
+
+
+def time_queries(store, symbol=None, repeats=20):
+    times = []
+    for _ in range(repeats):
+        for query in QUERIES:
+            start = time.perf_counter()
+            store.search(query, symbol=symbol, limit=20)
+            times.append((time.perf_counter() - start) * 1000)
+    return np.percentile(times, 50), np.percentile(times, 95)
+
+
+if __name__ == "__main__":
+    records = make_records(ARTICLES)
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "articles.jsonl")
+        store = NewsStore(path)
+        start = time.perf_counter()
+        for offset in range(0, ARTICLES, BATCH):
+            store.add(records[offset:offset + BATCH])
+        store.compact()
+        elapsed = time.perf_counter() - start
+        print(f"ingest {ARTICLES} articles: {elapsed:.1f}s ({ARTICLES / elapsed:.0f}/s), {len(store)} unique")
+
+        p50, p95 = time_queries(store)
+        print(f"search: p50 {p50:.2f} ms, p95 {p95:.2f} ms")
+        p50, p95 = time_queries(store, symbol="INFY")
+        print(f"search, filtered to INFY: p50 {p50:.2f} ms, p95 {p95:.2f} ms")
+
+        # Incremental: a poll's worth of new articles is searchable straight away, before compaction
+        new = make_records(500, seed=1)
+        for record in new:
+            record["id"], record["key"] = "new" + record["id"], "new" + record["key"]
+            record["published_ns"] += 366 * 86400 * 10 ** 9
+        start = time.perf_counter()
+        store.add(new)
+        print(f"add 500 more: {(time.perf_counter() - start) * 1000:.0f} ms")
+        p50, p95 = time_queries(store)
+        print(f"search with unpacked postings: p50 {p50:.2f} ms, p95 {p95:.2f} ms")
+
+        # Another process opening the same log: the index snapshot covers all but the newest articles
+        start = time.perf_counter()
+        replica = NewsStore(path)
+        print(f"replay log in a new process, with the index snapshot: {time.perf_counter() - start:.1f}s")
+        os.remove(f"{path}.index.npz")
+        start = time.perf_counter()
+        rebuilt = NewsStore(path)
+        print(f"replay log in a new process, rebuilding the index: {time.perf_counter() - start:.1f}s")
+        same = all(
+            [a["id"] for a, _ in other.search(query)] == [a["id"] for a, _ in store.search(query)]
+            for other in (replica, rebuilt) for query in QUERIES
+        )
+        print(f"replicas return the same results: {same}")
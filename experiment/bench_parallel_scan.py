@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.screener import get_scan_pool, scan_universe
+
+from bench_screener import make_universe
+
+SYMBOLS = 5000
+REPEATS = 3
+
+
+def max_drawdown(universe):
+    """Custom criterion in plain Python: worst peak-to-trough fall over the whole history, in %"""
+    result = np.full(len(universe), np.nan)
+    for row, closes in enumerate(universe.close):
+        peak, worst = np.nan, 0.0
+        for close in closes.tolist():
+            if close != close:  # NaN before listing
+                continue
+            if not peak >= close:
+                peak = close
+            worst = min(worst, (close - peak) / peak * 100)
+        result[row] = worst
+    return result
+
+
+def best_of(fn):
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times), result
+
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    # Worker counts up to the core count, or as given on the command line
+    worker_counts = [int(arg) for arg in sys.argv[1:]] or sorted({1, 2, 4, 8, 16, cores} & set(range(1, cores + 1)))
+    universe = make_universe(SYMBOLS)
+    columns = {"max_drawdown": max_drawdown}
+    print(f"{SYMBOLS} symbols x {universe.close.shape[1]} bars, {cores} CPU core(s)\n")
+    if cores == 1:
+        print("Only one core: sharded scans run in-process, so this host cannot show scaling.\n")
+
+    for label, criteria in (("indicators only", None), ("with Python criterion", columns)):
+        serial, expected = best_of(lambda: scan_universe(universe, columns=criteria))
+        print(f"{label}: in-process {serial:.0f} ms")
+        print(f"{'workers':>8} {'scan (ms)':>10} {'speedup':>8}  identical")
+        for workers in worker_counts:
+            if workers > 1:
+                # Spawn the pool outside the timing, as a long-running app would already have it
+                list(get_scan_pool(workers).map(abs, range(workers)))
+            elapsed, result = best_of(lambda: scan_universe(universe, workers=workers, columns=criteria))
+            identical = result.equals(expected) and (result.index == expected.index).all()
+            print(f"{workers:>8} {elapsed:>10.0f} {serial / elapsed:>7.2f}x  {identical}")
+        print()
+
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print(result[["close", "rsi_14", "signal", "max_drawdown"]].head())
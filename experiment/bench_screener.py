@@ -0,0 +1,77 @@
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.providers import MockProvider, period_to_range, _session_index
+from core.screener import LiveScan, Universe, scan_universe
+from core.screener_filters import FilterTable
+from core.paged_table import style_page, threshold_colors, value_colors
+
+UNIVERSE_SIZES = [500, 2000, 5000]
+
+
+def make_universe(count):
+    """Offline universe of mock symbols with a year of daily bars each"""
+    start, end = period_to_range("1y")
+    index = _session_index(start, end, "1d")
+    return Universe.from_frames({f"SYM{i}": MockProvider.generate_bars(f"SYM{i}", index) for i in range(count)})
+
+
+def time_call(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+if __name__ == "__main__":
+    print(f"{'symbols':>8} {'bars':>5} {'scan (ms)':>10}")
+    for count in UNIVERSE_SIZES:
+        universe = make_universe(count)
+        elapsed, result = time_call(lambda: scan_universe(universe))
+        print(f"{count:>8} {universe.close.shape[1]:>5} {elapsed:>10.1f}")
+
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print(result.head())
+
+    # A new daily bar for every symbol: incremental update vs rescanning everything
+    live = LiveScan(universe)
+    next_day = int(universe.last_ts.max()) + 86_400_000_000_000
+    bars = {
+        symbol: {"ts": next_day, "close": close, "high": close, "low": close, "volume": 1e5}
+        for symbol, close in zip(universe.symbols, universe.close[:, -1])
+    }
+    elapsed, _ = time_call(lambda: live.update_bars(bars))
+    print(f"\nnew bar for {len(universe)} symbols: incremental {elapsed:.1f} ms")
+
+    # Slider moves against the largest universe: only the RSI bound changes between runs
+    table = FilterTable(result.reset_index())
+    table.filter("rsi_14 >= 0")
+    naive, compiled = [], []
+    for step in range(200):
+        lo = step * 0.25
+        expression = f"{lo} <= rsi_14 <= 70 and volume_ratio > 1.2 and pct_from_52w_high > -10 and signal in ('Buy', 'Hold')"
+        naive.append(time_call(lambda: result[
+            (result["rsi_14"] >= lo) & (result["rsi_14"] <= 70) & (result["volume_ratio"] > 1.2)
+            & (result["pct_from_52w_high"] > -10) & result["signal"].isin(["Buy", "Hold"])
+        ])[0])
+        compiled.append(time_call(lambda: table.filter(expression))[0])
+    naive.sort()
+    compiled.sort()
+    print(f"\nfilter on {len(result)} symbols: boolean masks {naive[100]:.3f} ms, compiled plan {compiled[100]:.3f} ms (median)")
+
+    # Rendering: per-cell applymap over every match vs vectorized CSS for one sorted page
+    frame = table.frame
+    styles = {
+        "rsi_14": threshold_colors(70, 30),
+        "signal": value_colors({"Buy": "color: green", "Sell": "color: red"}, default="color: gray"),
+    }
+    old_style, _ = time_call(lambda: frame.style
+        .map(lambda val: "color: green" if isinstance(val, float) and val > 70 else "color: red" if isinstance(val, float) and val < 30 else "", subset=["rsi_14"])
+        .map(lambda val: "color: green" if val == "Buy" else "color: red" if val == "Sell" else "color: gray", subset=["signal"])
+        .to_html())
+    page_style, _ = time_call(lambda: style_page(frame.iloc[table.sort(table.filter(""), "rsi_14")[:50]], styles).to_html())
+    print(f"render {len(frame)} rows with applymap: {old_style:.1f} ms, one 50-row page: {page_style:.1f} ms")
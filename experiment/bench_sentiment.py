@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.sentiment import LexiconScorer, SentimentEngine
+
+from bench_news_search import make_records
+
+TEXTS = 50_000
+
+
+def time_call(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+if __name__ == "__main__":
+    texts = [f"{record['title']}. {record['summary']}" for record in make_records(TEXTS)]
+    scorer = LexiconScorer()
+
+    looped, expected = time_call(lambda: np.concatenate([scorer.score([text]) for text in texts]))
+    batched, scores = time_call(lambda: scorer.score(texts))
+    print(f"score {TEXTS} texts: one at a time {looped:.0f} ms, one batch {batched:.0f} ms ({looped / batched:.1f}x)")
+    print(f"identical: {np.array_equal(expected, scores)}")
+
+    engine = SentimentEngine(scorer)
+    first, _ = time_call(lambda: engine.score_batch(texts))
+    again, cached = time_call(lambda: engine.score_batch(texts))
+    print(f"engine: first pass {first:.0f} ms, repeat (all cached) {again:.0f} ms, same scores: {np.array_equal(cached, scores)}")
+    print(engine.stats())
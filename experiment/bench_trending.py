@@ -0,0 +1,48 @@
+import math
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import TRENDING_WINDOWS
+from core.trending import TrendTracker, document_terms
+
+from bench_news_search import make_records
+
+DOCUMENTS = 100_000
+TOP = 10
+
+
+def exact_top(records, tau_ns, now_ns):
+    """Decayed document counts kept for every term, as the sketch approximates them"""
+    counts = {}
+    for record in records:
+        weight = math.exp(-(now_ns - record["published_ns"]) / tau_ns)
+        for term in document_terms(f"{record['title']} {record['summary']}"):
+            counts[term] = counts.get(term, 0.0) + weight
+    return sorted(counts.items(), key=lambda item: -item[1])[:TOP], len(counts)
+
+
+if __name__ == "__main__":
+    records = make_records(DOCUMENTS)
+    tracker = TrendTracker()
+    start = time.perf_counter()
+    for record in records:
+        tracker.add(f"{record['title']} {record['summary']}", record["published_ns"])
+    elapsed = time.perf_counter() - start
+    print(f"{DOCUMENTS} documents: {elapsed * 1e6 / DOCUMENTS:.0f} us each ({len(TRENDING_WINDOWS)} horizons)")
+
+    now_ns = records[-1]["published_ns"]
+    for window, tau in TRENDING_WINDOWS.items():
+        start = time.perf_counter()
+        top = tracker.top(window, TOP, now_ns=now_ns)
+        query_ms = (time.perf_counter() - start) * 1000
+        expected, vocabulary = exact_top(records, pd.Timedelta(tau).value, now_ns)
+        overlap = len({term for term, _ in top} & {term for term, _ in expected})
+        error = max(abs(count - dict(expected).get(term, count)) / dict(expected).get(term, count) for term, count in top)
+        print(f"{window}: query {query_ms:.3f} ms, top-{TOP} overlap with exact {overlap}/{TOP}, "
+              f"max relative error {error:.2%} ({vocabulary} distinct terms, none stored)")
+        print("  ", ", ".join(f"{term} {count:.1f}" for term, count in top[:5]))
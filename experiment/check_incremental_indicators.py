@@ -0,0 +1,86 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.providers import MockProvider, period_to_range, _session_index
+from core.screener import RESULT_COLUMNS, LiveScan, Universe, scan_universe
+
+SYMBOLS = 300
+WARMUP_BARS = 200  # bars in the initial batch scan
+HISTORY = "2y"
+
+
+def make_frames():
+    """
+    Mock daily bars; some symbols list late (before the warm-up ends) so rows
+    have leading NaN, and some report a missing volume on a few bars
+    """
+    start, end = period_to_range(HISTORY)
+    index = _session_index(start, end, "1d")
+    frames = {}
+    for i in range(SYMBOLS):
+        listed = (i % 4) * 40 if i % 5 == 0 else 0
+        frames[f"SYM{i}"] = MockProvider.generate_bars(f"SYM{i}", index[listed:])
+        if i % 7 == 0:
+            frames[f"SYM{i}"].iloc[[-60, -30, -5], frames[f"SYM{i}"].columns.get_loc("Volume")] = np.nan
+    return frames, index
+
+
+def universe_until(frames, index, bars):
+    """Batch universe holding every bar up to index[bars - 1]"""
+    cutoff = index[bars - 1]
+    return Universe.from_frames({symbol: df[df.index <= cutoff] for symbol, df in frames.items()}, max_bars=bars)
+
+
+def assert_same(incremental, batch, label):
+    for column in RESULT_COLUMNS:
+        left, right = incremental[column].to_numpy(), batch[column].to_numpy()
+        same = np.array_equal(left, right) if column == "signal" else np.array_equal(left, right, equal_nan=True)
+        if not same:
+            raise AssertionError(f"{label}: column {column} differs from the batch scan")
+
+
+if __name__ == "__main__":
+    frames, index = make_frames()
+    live = LiveScan(universe_until(frames, index, WARMUP_BARS))
+
+    # Every symbol's bars keyed by day, so the loop below only does dict lookups
+    daily = {
+        symbol: {
+            int(ts): {"ts": int(ts), "close": c, "high": h, "low": l, "volume": v}
+            for ts, c, h, l, v in zip(df.index.asi8, df["Close"], df["High"], df["Low"], df["Volume"])
+        }
+        for symbol, df in frames.items()
+    }
+
+    checked = 0
+    for bars in range(WARMUP_BARS + 1, len(index) + 1):
+        day = int(index[bars - 1].value)
+        todays = {symbol: by_day[day] for symbol, by_day in daily.items() if day in by_day}
+
+        # An intraday revision first (same day, different price and volume), then the final bar
+        live.update_bars({symbol: dict(bar, close=bar["close"] * 0.99, volume=bar["volume"] / 2) for symbol, bar in todays.items()})
+        live.update_bars(todays)
+
+        if bars % 25 == 0 or bars == len(index):
+            assert_same(live.result, scan_universe(universe_until(frames, index, bars)), f"after bar {bars}")
+            checked += 1
+
+    # A missing volume must not leave the volume average NaN for good
+    assert not live.result["volume_ratio"].isna().any(), "volume_ratio stuck at NaN"
+
+    # update_frames() (the engine's refresh path) must land on the same result
+    refreshed = LiveScan(universe_until(frames, index, len(index) - 3))
+    refreshed.update_frames({symbol: df.iloc[-5:] for symbol, df in frames.items()})
+    assert_same(refreshed.result, live.result, "after update_frames")
+
+    # Bars that skip days past the live bar must be reported, not silently applied
+    stale = LiveScan(universe_until(frames, index, len(index) - 10))
+    assert not stale.gaps({symbol: df.iloc[-11:] for symbol, df in frames.items()})
+    assert set(stale.gaps({symbol: df.iloc[-5:] for symbol, df in frames.items()})) == set(frames)
+
+    print(f"OK: incremental results matched the batch scan exactly at {checked} checkpoints "
+          f"({SYMBOLS} symbols, {len(index) - WARMUP_BARS} incremental days)")
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.screener_filters import FilterError, FilterTable, compile_filter
+
+FRAME = pd.DataFrame({
+    "rsi": [10.0, 20.0, 30.0, 40.0, 50.0, np.nan],
+    "sector": ["IT", "Auto", "Auto", None, "IT", "Finance"],
+})
+
+# (expression, expected rows); each is also checked against a plain pandas mask
+CASES = [
+    ("rsi <= 30 and rsi < 30", [0, 1]),
+    ("rsi < 30 and rsi <= 30", [0, 1]),
+    ("rsi >= 20 and rsi > 20", [2, 3, 4]),
+    ("rsi > 20 and rsi >= 20", [2, 3, 4]),
+    ("20 <= rsi <= 40 and rsi > 20 and rsi < 40", [2]),
+    ("rsi == 40 and sector == 'Finance'", []),  # row 3's sector is missing
+    ("rsi >= 30 and sector in ('Auto', 'IT')", [2, 4]),
+    ("rsi >= 0 and sector in ()", []),
+    ("rsi >= 0 and sector not in ('IT',)", [1, 2, 3]),
+]
+INVALID = ["sector in ('IT', ['x'])", "sector in ('IT', {'a': 1})", "sector == ['IT']"]
+
+
+def pandas_rows(expression):
+    """Reference result: the same expression evaluated with boolean masks"""
+    frame = FRAME.assign(sector=FRAME["sector"].astype(object))
+    return list(np.flatnonzero(frame.eval(expression, engine="python").to_numpy(dtype=bool)))
+
+
+if __name__ == "__main__":
+    for expression, expected in CASES:
+        table = FilterTable(FRAME)  # fresh table so test() paths run without cached sub-results
+        table.filter("rsi >= 0")  # warm the rsi index so the sector predicate is tested against candidates
+        rows = list(table.filter(expression))
+        assert rows == expected, f"{expression}: {rows} != {expected}"
+        if "()" not in expression:
+            assert rows == pandas_rows(expression), f"{expression}: {rows} != pandas {pandas_rows(expression)}"
+
+    for expression in INVALID:
+        try:
+            compile_filter(expression)
+        except FilterError:
+            continue
+        raise AssertionError(f"{expression} compiled")
+
+    print(f"OK: {len(CASES)} filter expressions matched, {len(INVALID)} invalid ones raised FilterError")
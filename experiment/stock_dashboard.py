@@ -1,10 +1,20 @@
 import streamlit as st
-import yfinance as yf
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 from datetime import datetime, timedelta
 import time
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.fetch_planner import get_bars
+from core.symbol_picker import symbol_picker
+from core.market_poller import get_market_poller
+from core.bar_aggregator import get_bar_aggregator
+from core.quote_cache import get_cached_fundamentals, get_cached_quote
+from config.settings import MARKET_POLL_INTERVAL
 
 # Page configuration
 st.set_page_config(
@@ -44,38 +54,50 @@ INDIAN_INDICES = {
 }
 
 def get_stock_data(symbol, period="1d", interval="5m"):
-    """Fetch stock data using yfinance"""
+    """Read stock data from the local bar store, fetching from Yahoo only when it is missing"""
     try:
-        stock = yf.Ticker(symbol)
-        data = stock.history(period=period, interval=interval)
-        return data
+        return get_bars(symbol, period=period, interval=interval, provider="yfinance")
     except Exception as e:
         st.error(f"Error fetching data for {symbol}: {str(e)}")
         return None
 
 def get_current_price(symbol):
-    """Get current price and change"""
+    """Get current price and change from a few daily bars (never Ticker.info)"""
     try:
-        stock = yf.Ticker(symbol)
-        info = stock.info
-        current_price = info.get('currentPrice', 0)
-        previous_close = info.get('previousClose', 0)
-        
-        if current_price == 0:
-            # Fallback to recent data
-            data = stock.history(period="2d", interval="1d")
-            if not data.empty:
-                current_price = data['Close'].iloc[-1]
-                previous_close = data['Close'].iloc[-2] if len(data) > 1 else current_price
-        
-        change = current_price - previous_close
-        change_percent = (change / previous_close) * 100 if previous_close != 0 else 0
-        
-        return current_price, change, change_percent
+        quote = get_cached_quote(symbol)
+        if quote is None:
+            return 0, 0, 0
+        return quote["price"], quote["change"], quote["change_percent"]
     except Exception as e:
         st.error(f"Error getting current price for {symbol}: {str(e)}")
         return 0, 0, 0
 
+def show_fundamentals(symbol):
+    """Fundamentals are only requested once the user opens them"""
+    if not st.toggle("Show fundamentals", key=f"fundamentals_{symbol}"):
+        return
+    try:
+        fundamentals = get_cached_fundamentals(symbol)
+    except Exception as e:
+        st.error(f"Error getting fundamentals for {symbol}: {str(e)}")
+        return
+    if not fundamentals:
+        st.info("No fundamentals available for this symbol")
+        return
+
+    if fundamentals.get("name"):
+        st.caption(" · ".join(str(fundamentals[k]) for k in ("name", "sector", "industry") if fundamentals.get(k)))
+    metrics = [
+        ("Market Cap", fundamentals.get("market_cap"), lambda v: f"₹{v / 1e7:,.0f} Cr"),
+        ("P/E", fundamentals.get("pe_ratio"), lambda v: f"{v:.2f}"),
+        ("EPS", fundamentals.get("eps"), lambda v: f"₹{v:.2f}"),
+        ("52W High", fundamentals.get("fifty_two_week_high"), lambda v: f"₹{v:,.2f}"),
+        ("52W Low", fundamentals.get("fifty_two_week_low"), lambda v: f"₹{v:,.2f}"),
+    ]
+    cols = st.columns(len(metrics))
+    for col, (label, value, fmt) in zip(cols, metrics):
+        col.metric(label, fmt(value) if value is not None else "—")
+
 def format_price_display(price, change, change_percent):
     """Format price display with colors"""
     color = "positive" if change >= 0 else "negative"
@@ -158,11 +180,8 @@ col1, col2 = st.columns([2, 1])
 with col1:
     st.header("🔍 Stock Search")
     
-    # Search input
-    search_symbol = st.text_input(
-        "Enter stock symbol (e.g., RELIANCE.NS, TCS.NS, HDFCBANK.NS)",
-        placeholder="Type stock symbol..."
-    )
+    # Search across the full instrument master
+    search_symbol = symbol_picker("Stock symbol", key="dashboard_symbol")
     
     if search_symbol:
         # Clean the symbol
@@ -181,9 +200,13 @@ with col1:
                 format_price_display(current_price, change, change_percent),
                 unsafe_allow_html=True
             )
+            show_fundamentals(symbol)
             
-            # Get historical data for chart
-            chart_data = get_stock_data(symbol, period=time_period, interval="1h" if time_period == "1d" else "1d")
+            # Get historical data for chart, plus the live bar still being built from polled quotes
+            chart_interval = "1h" if time_period == "1d" else "1d"
+            chart_data = get_stock_data(symbol, period=time_period, interval=chart_interval)
+            get_market_poller().subscribe("yahoo", [symbol])
+            chart_data = get_bar_aggregator("yahoo").with_partial_bar(chart_data, symbol, chart_interval)
             
             if chart_data is not None and not chart_data.empty:
                 # Create and display candlestick chart
@@ -197,23 +220,32 @@ with col1:
 
 with col2:
     st.header("📈 Indian Market Indices")
-    
-    # Display indices in a container
-    indices_container = st.container()
-    
-    with indices_container:
+
+    market_poller = get_market_poller()
+    index_symbols = list(INDIAN_INDICES.values())
+
+    # Index cards only read the poller's latest snapshot and refresh on their own
+    @st.fragment(run_every=MARKET_POLL_INTERVAL)
+    def show_indices():
+        market_poller.subscribe("yahoo", index_symbols)
+        quotes = market_poller.latest("yahoo", index_symbols)
+
         for index_name, symbol in INDIAN_INDICES.items():
             with st.expander(f"{index_name}", expanded=True):
-                current_price, change, change_percent = get_current_price(symbol)
-                
-                if current_price > 0:
+                quote = quotes.get(symbol)
+
+                if quote is None:
+                    st.info("Waiting for market data...")
+                elif quote["price"] > 0:
                     st.markdown(
-                        format_price_display(current_price, change, change_percent),
+                        format_price_display(quote["price"], quote["change"], quote["change_percent"]),
                         unsafe_allow_html=True
                     )
                 else:
                     st.warning(f"Data not available for {index_name}")
 
+    show_indices()
+
 # Auto refresh functionality
 if auto_refresh:
     time.sleep(30)
@@ -1,6 +1,5 @@
 # home.py
 import streamlit as st
-import yfinance as yf
 import plotly.graph_objs as go
 import pandas as pd
 import random
@@ -8,6 +7,12 @@ import os
 import time
 from core.logo import show_logo_sidebar_top
 from core.search_bar import setup_stock_search_bar
+from core.market_poller import get_market_poller
+from core.news import get_latest_news, get_news_ingestor, time_ago
+from core.sentiment import get_overall_sentiment, get_symbol_sentiment
+from core.trending import get_trending_keywords
+from core.predictions import MODELS, get_forecast_engine
+from config.settings import DASHBOARD_NEWS_ITEMS, DASHBOARD_WATCHLIST, FORECAST_MODEL, MARKET_POLL_INTERVAL
 # Set Page Config
 st.set_page_config(page_title="IndexIQ Dashboard", layout="wide")
 
@@ -54,26 +59,41 @@ st.markdown("A modern, data-driven dashboard with sentiment, prediction & financ
 # Market Overview
 # -------------------------
 st.subheader("🌐 Market Overview with Sentiment")
-cols = st.columns(3)
+# "news" is the symbol stories are tagged with; indices without coverage show the market-wide mood
 index_data = {
-    "Nifty 50": {"symbol": "^NSEI", "sentiment": random.choice(["Bullish", "Bearish"])},
-    "Sensex": {"symbol": "^BSESN", "sentiment": random.choice(["Bullish", "Bearish"])},
-    "Nifty 100": {"symbol": "^CNX100", "sentiment": random.choice(["Bullish", "Bearish"])},
-    # "Nasdaq": {"symbol": "^IXIC", "sentiment": random.choice(["Bullish", "Bearish"])}
+    "Nifty 50": {"symbol": "^NSEI", "news": "NIFTY50"},
+    "Sensex": {"symbol": "^BSESN", "news": "SENSEX"},
+    "Nifty 100": {"symbol": "^CNX100", "news": None},
+    # "Nasdaq": {"symbol": "^IXIC", "news": None}
 }
+index_symbols = [info["symbol"] for info in index_data.values()]
+market_poller = get_market_poller()
 
 
-for i, (name, info) in enumerate(index_data.items()):
-    index = yf.Ticker(info["symbol"])
-    df = index.history(period="1d")
-    price = df["Close"].iloc[-1]
-    change = price - df["Open"].iloc[-1]
-    pct_change = (change / df["Open"].iloc[-1]) * 100
-    sentiment_color = "green" if info["sentiment"] == "Bullish" else "red"
+# Tiles only read the poller's latest snapshot and refresh on their own
+@st.fragment(run_every=MARKET_POLL_INTERVAL)
+def show_index_tiles():
+    market_poller.subscribe("yahoo", index_symbols)
+    quotes = market_poller.latest("yahoo", index_symbols)
+    cols = st.columns(3)
 
-    with cols[i]:
-        st.metric(label=f"{name}", value=f"{price:,.2f}", delta=f"{pct_change:.2f}%", delta_color="normal")
-        st.markdown(f"Sentiment: **:{sentiment_color}[{info['sentiment']}]**")
+    market_label = get_overall_sentiment()[1]
+
+    for i, (name, info) in enumerate(index_data.items()):
+        quote = quotes.get(info["symbol"])
+        coverage = get_symbol_sentiment(info["news"]) if info["news"] else None
+        sentiment = coverage["label"] if coverage else market_label
+        sentiment_color = {"Bullish": "green", "Bearish": "red"}.get(sentiment, "gray")
+
+        with cols[i]:
+            if quote is None:
+                st.info(f"{name}: waiting for market data...")
+                continue
+            # Price, change and percent change all come from the poller's single batched download
+            st.metric(label=f"{name}", value=f"{quote['price']:,.2f}", delta=f"{quote['change_percent']:.2f}%", delta_color="normal")
+            st.markdown(f"Sentiment: **:{sentiment_color}[{sentiment}]**")
+
+show_index_tiles()
 
 # -------------------------
 # Portfolio Performance
@@ -95,38 +115,47 @@ st.subheader("🧠 Sentiment Analysis (From Social & News)")
 col1, col2 = st.columns(2)
 
 with col1:
-    st.metric(label="Sentiment Score", value="76%", delta="Bullish")
-    st.markdown("Based on Twitter, Reddit & financial news sentiment.")
+    sentiment_score, sentiment = get_overall_sentiment()
+    st.metric(
+        label="Sentiment Score",
+        value=f"{sentiment_score}%",
+        delta=sentiment,
+        delta_color={"Bullish": "normal", "Bearish": "inverse"}.get(sentiment, "off"),
+    )
+    st.markdown("Based on financial news sentiment, weighted towards the latest stories.")
 with col2:
     st.write("**Trending Keywords**")
-    st.markdown("`investors` `market` `growth` `earnings` `rise` `outlook` `stock`")
+    keywords = get_trending_keywords("hour")
+    if keywords:
+        st.markdown(" ".join(f"`{keyword}`" for keyword in keywords))
+    else:
+        st.caption("No stories in the last hour")
 
 # -------------------------
 # AI Stock Predictions
 # -------------------------
 st.subheader("🔮 AI Stock Prediction")
+# One vectorized fit covers the whole watchlist; forecasts are cached per latest bar
+forecasts = get_forecast_engine().get_many(DASHBOARD_WATCHLIST, FORECAST_MODEL)
 pred_col = st.columns(3)
-predictions = [
-    {"ticker": "INFY", "prediction": "+3.2%", "confidence": "87%"},
-    {"ticker": "TCS", "prediction": "+1.1%", "confidence": "73%"},
-    {"ticker": "HDFCBANK", "prediction": "-0.8%", "confidence": "68%"},
-]
 
-for i, pred in enumerate(predictions):
-    with pred_col[i]:
-        st.metric(f"{pred['ticker']}", pred["prediction"], help=f"Confidence: {pred['confidence']}")
+for i, forecast in enumerate(forecasts.values()):
+    summary = forecast.summary()
+    with pred_col[i % 3]:
+        st.metric(
+            forecast.symbol,
+            f"₹{summary['Forecast Price (₹)'].iloc[0]:,.2f}",
+            f"{summary['Change %'].iloc[0]:+.2f}%",
+            help=f"Next-day {MODELS[FORECAST_MODEL].label} forecast · Confidence: {summary['Confidence'].iloc[0]}",
+        )
 
 # -------------------------
 # News Section
 # -------------------------
 st.subheader("🗞️ Financial News")
-news = [
-    {"source": "Reuters", "title": "U.S. Fed declines to cut rates", "time": "2h ago"},
-    {"source": "MarketWatch", "title": "Amazon hit with EU antitrust case", "time": "3h ago"},
-    {"source": "Bloomberg", "title": "Gold gains as inflation rises", "time": "4h ago"}
-]
-for article in news:
-    st.markdown(f"- **{article['source']}** · {article['title']} _(Posted {article['time']})_")
+get_news_ingestor()  # polls the feeds in the background; the dashboard reads the stored stories
+for article in get_latest_news(DASHBOARD_NEWS_ITEMS):
+    st.markdown(f"- **{article['source']}** · {article['title']} _(Posted {time_ago(article['published_ns'])})_")
 
 # -------------------------
 # Footer
@@ -3,7 +3,8 @@ import pandas as pd
 import plotly.graph_objs as go
 import time
 from core.portfolio import get_user_holdings, calculate_portfolio_metrics
-from core.angel_api import get_live_price
+from core.market_poller import get_market_poller
+from config.settings import MARKET_POLL_INTERVAL
 
 from core.logo import show_logo_sidebar_top 
 from core.search_bar import setup_stock_search_bar
@@ -52,47 +53,61 @@ if not holdings:
     st.warning("No holdings found. Start paper trading to build your portfolio.")
     st.stop()
 
-portfolio_data = []
-
-total_value = 0
-total_invested = 0
-
-for symbol, data in holdings.items():
-    live_price_data = get_live_price(symbol)
-    live_price = live_price_data['price']
-    quantity = data["quantity"]
-    avg_price = data["avg_price"]
-    current_value = live_price * quantity
-    invested = avg_price * quantity
-    pnl = current_value - invested
-    pnl_pct = (pnl / invested) * 100 if invested else 0
-
-    total_value += current_value
-    total_invested += invested
-
-    portfolio_data.append({
-        "Symbol": symbol,
-        "Qty": quantity,
-        "Avg Buy Price": round(avg_price, 2),
-        "Live Price": round(live_price, 2),
-        "Invested (₹)": round(invested, 2),
-        "Current Value (₹)": round(current_value, 2),
-        "PnL (₹)": round(pnl, 2),
-        "PnL (%)": round(pnl_pct, 2)
-    })
-
-df = pd.DataFrame(portfolio_data)
-
-# Metrics
-st.subheader("📊 Portfolio Summary")
-
-col1, col2, col3 = st.columns(3)
-col1.metric("Total Invested", f"₹{total_invested:,.2f}")
-col2.metric("Current Value", f"₹{total_value:,.2f}")
-col3.metric("Total PnL", f"₹{total_value - total_invested:,.2f}", delta=f"{((total_value - total_invested) / total_invested) * 100:.2f}%" if total_invested else "0%")
-
-# Display table
-st.dataframe(df, use_container_width=True)
+market_poller = get_market_poller()
+holding_symbols = [symbol.upper() for symbol in holdings]
+total_invested = sum(data["avg_price"] * data["quantity"] for data in holdings.values())
+
+
+# Live figures only read the poller's latest snapshot and refresh on their own
+@st.fragment(run_every=MARKET_POLL_INTERVAL)
+def show_portfolio_summary():
+    market_poller.subscribe("quotes", holding_symbols)
+    live_prices = market_poller.latest("quotes", holding_symbols)
+
+    if len(live_prices) < len(holding_symbols):
+        st.info("⏳ Waiting for live prices...")
+        return
+
+    portfolio_data = []
+    total_value = 0
+
+    for symbol, data in holdings.items():
+        live_price_data = live_prices[symbol.upper()]
+        live_price = live_price_data['price']
+        quantity = data["quantity"]
+        avg_price = data["avg_price"]
+        current_value = live_price * quantity
+        invested = avg_price * quantity
+        pnl = current_value - invested
+        pnl_pct = (pnl / invested) * 100 if invested else 0
+
+        total_value += current_value
+
+        portfolio_data.append({
+            "Symbol": symbol,
+            "Qty": quantity,
+            "Avg Buy Price": round(avg_price, 2),
+            "Live Price": round(live_price, 2),
+            "Invested (₹)": round(invested, 2),
+            "Current Value (₹)": round(current_value, 2),
+            "PnL (₹)": round(pnl, 2),
+            "PnL (%)": round(pnl_pct, 2)
+        })
+
+    df = pd.DataFrame(portfolio_data)
+
+    # Metrics
+    st.subheader("📊 Portfolio Summary")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Total Invested", f"₹{total_invested:,.2f}")
+    col2.metric("Current Value", f"₹{total_value:,.2f}")
+    col3.metric("Total PnL", f"₹{total_value - total_invested:,.2f}", delta=f"{((total_value - total_invested) / total_invested) * 100:.2f}%" if total_invested else "0%")
+
+    # Display table
+    st.dataframe(df, use_container_width=True)
+
+show_portfolio_summary()
 
 # Trendline (Mocked for now)
 st.subheader("📈 Portfolio Value Over Time")
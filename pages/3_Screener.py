@@ -1,11 +1,17 @@
 # indexiq_screener.py
 import streamlit as st
 import pandas as pd
-import random
+import numpy as np
 import time
+import zlib
 
 from core.logo import show_logo_sidebar_top  # Ensure logo function is defined properly
 from core.search_bar import setup_stock_search_bar
+from core.screener import get_screener
+from core.screener_snapshot import get_snapshot_reader
+from core.screener_filters import FilterError, FilterTable
+from core.paged_table import paged_table, threshold_colors, value_colors
+from config.settings import HISTORY_CACHE_TTL, SCREENER_SNAPSHOT_POLL_INTERVAL
 
 # -------------------------
 # Redirect if Not Logged In
@@ -39,26 +45,56 @@ with st.sidebar:
 
 
 # -------------------------
-# Mock Stock Data (Replace with live data as needed)
+# Stock Data: the end-of-day snapshot when the job has written one, else a live scan
 # -------------------------
-@st.cache_data
-def load_stock_data():
-    symbols = ["RELIANCE", "TCS", "INFY", "HDFCBANK", "ICICIBANK", "ITC", "WIPRO", "LT", "SBIN", "MARUTI"]
-    sectors = ["Energy", "IT", "Finance", "Consumer", "Auto"]
-    data = []
-    for sym in symbols:
-        data.append({
-            "Symbol": sym,
-            "Sector": random.choice(sectors),
-            "Price": round(random.uniform(100, 4000), 2),
-            "Market Cap (Cr)": round(random.uniform(10000, 500000), 2),
-            "Volume": round(random.uniform(0.5, 20), 2),
-            "RSI": round(random.uniform(10, 90), 2),
-            "Signal": random.choice(["Buy", "Hold", "Sell"])
-        })
-    return pd.DataFrame(data)
+SECTORS = ["Energy", "IT", "Finance", "Consumer", "Auto"]
 
-df = load_stock_data()
+def load_stock_data(scan):
+    """Display table from screener results (a snapshot frame or a live scan reset to a Symbol column)"""
+    symbols = scan["Symbol"].to_numpy()
+    # Sector and market cap fall back to mock values (stable per symbol) where no fundamentals were fetched
+    seeds = np.array([zlib.crc32(symbol.encode()) for symbol in symbols], dtype=np.int64)
+    sector = np.array(SECTORS, dtype=object)[seeds % len(SECTORS)]
+    market_cap = (10000 + (seeds % 490000)).astype(float)
+    if "sector" in scan:
+        sector = np.where(scan["sector"].notna().to_numpy(), scan["sector"].to_numpy(dtype=object), sector)
+    if "market_cap" in scan:
+        crores = scan["market_cap"].to_numpy(dtype=np.float64) / 1e7
+        market_cap = np.where(np.isnan(crores), market_cap, crores.round(0))
+    return pd.DataFrame({
+        "Symbol": symbols,
+        "Sector": sector,
+        "Price": scan["close"].round(2).to_numpy(),
+        "Change %": scan["change_pct"].round(2).to_numpy(),
+        "Market Cap (Cr)": market_cap,
+        "Volume": scan["volume"].to_numpy(),
+        "Volume Ratio": scan["volume_ratio"].round(2).to_numpy(),
+        "RSI": scan["rsi_14"].round(2).to_numpy(),
+        "SMA 20": scan["sma_20"].round(2).to_numpy(),
+        "SMA 50": scan["sma_50"].round(2).to_numpy(),
+        "MACD": scan["macd"].round(2).to_numpy(),
+        "52W High": scan["high_52w"].round(2).to_numpy(),
+        "52W Low": scan["low_52w"].round(2).to_numpy(),
+        "Signal": scan["signal"].to_numpy(),
+    })
+
+@st.cache_resource(ttl=HISTORY_CACHE_TTL["1d"], max_entries=2)
+def load_filter_table(snapshot_version, _snapshot=None):
+    # Keyed by the snapshot file identity: a new file from the job builds a new table,
+    # while sessions mid-render keep the one they already hold
+    scan = _snapshot.frame if _snapshot is not None else get_screener().scan().reset_index()
+    return FilterTable(load_stock_data(scan), aliases={"rsi": "RSI", "mcap": "Market Cap (Cr)"})
+
+snapshot = get_snapshot_reader().current()
+table = load_filter_table(snapshot.version if snapshot is not None else None, snapshot)
+df = table.frame
+
+@st.fragment(run_every=SCREENER_SNAPSHOT_POLL_INTERVAL)
+def watch_snapshot(rendered_version):
+    """Rerun the page once the snapshot job replaces the file"""
+    latest = get_snapshot_reader().current()
+    if (latest.version if latest is not None else None) != rendered_version:
+        st.rerun()
 
 #adding search bar
 setup_stock_search_bar(location="sidebar", show_history=True)
@@ -69,6 +105,8 @@ setup_stock_search_bar(location="sidebar", show_history=True)
 st.set_page_config(page_title="IndexIQ Screener", layout="wide")
 st.title("📍 Stock Screener - IndexIQ")
 st.markdown("Use filters below to screen Indian stocks by technical and financial indicators.")
+st.caption(snapshot.describe() if snapshot is not None else "Live scan · no end-of-day snapshot yet (run `python -m core.screener_snapshot`)")
+watch_snapshot(snapshot.version if snapshot is not None else None)
 
 # -------------------------
 # Sidebar Filters
@@ -76,33 +114,65 @@ st.markdown("Use filters below to screen Indian stocks by technical and financia
 with st.sidebar:
     st.header("📊 Screener Filters")
     sector_filter = st.multiselect("Sector", options=df["Sector"].unique(), default=df["Sector"].unique())
-    price_range = st.slider("Price Range", 0.0, 5000.0, (0.0, 5000.0))
+    max_price = float(np.ceil(np.nanmax(df["Price"]))) if len(df) else 5000.0
+    price_range = st.slider("Price Range", 0.0, max_price, (0.0, max_price))
     mcap_range = st.slider("Market Cap Range (Cr)", 0.0, 500000.0, (0.0, 500000.0))
     rsi_range = st.slider("RSI Range", 0.0, 100.0, (0.0, 100.0))
     signal_filter = st.multiselect("Signal", options=["Buy", "Hold", "Sell"], default=["Buy", "Hold", "Sell"])
+    custom_filter = st.text_input(
+        "Custom filter",
+        placeholder='e.g. rsi < 30 and mcap > 50000 and macd > 0',
+        help="Columns: " + ", ".join(sorted(table.columns)),
+    )
 
 # -------------------------
 # Filtered Data
 # -------------------------
-filtered_df = df[
-    (df["Sector"].isin(sector_filter)) &
-    (df["Price"] >= price_range[0]) & (df["Price"] <= price_range[1]) &
-    (df["Market Cap (Cr)"] >= mcap_range[0]) & (df["Market Cap (Cr)"] <= mcap_range[1]) &
-    (df["RSI"] >= rsi_range[0]) & (df["RSI"] <= rsi_range[1]) &
-    (df["Signal"].isin(signal_filter))
+def range_clause(column, selected, bounds):
+    """Skip sliders left at their full range so they cost nothing"""
+    lo, hi = selected
+    if lo <= bounds[0] and hi >= bounds[1]:
+        return None
+    return f"{lo!r} <= {column} <= {hi!r}"
+
+def set_clause(column, selected, options):
+    if set(options) <= set(selected):
+        return None
+    return f"{column} in {tuple(selected)!r}"
+
+clauses = [
+    set_clause("sector", sector_filter, df["Sector"].unique()),
+    range_clause("price", price_range, (0.0, max_price)),
+    range_clause("mcap", mcap_range, (0.0, 500000.0)),
+    range_clause("rsi", rsi_range, (0.0, 100.0)),
+    set_clause("signal", signal_filter, ["Buy", "Hold", "Sell"]),
 ]
+expression = " and ".join(clause for clause in clauses if clause)
+
+try:
+    filtered_rows = table.filter(" and ".join(filter(None, [expression, f"({custom_filter})" if custom_filter.strip() else None])))
+except FilterError as e:
+    st.error(f"Invalid custom filter: {e}")
+    filtered_rows = table.filter(expression)
 
 # -------------------------
-# Display Data Table
+# Display Data Table (sorted and paginated server-side, only the visible page is sent)
 # -------------------------
 st.subheader("📈 Screened Stocks")
-st.dataframe(filtered_df.style
-    .applymap(lambda val: 'color: green' if isinstance(val, float) and val > 70 else 'color: red' if isinstance(val, float) and val < 30 else '', subset=['RSI'])
-    .applymap(lambda val: 'color: green' if val == 'Buy' else 'color: red' if val == 'Sell' else 'color: gray', subset=['Signal']),
-    use_container_width=True
+paged_table(
+    table,
+    filtered_rows,
+    key="screener",
+    cell_styles={
+        "RSI": threshold_colors(70, 30),
+        "Change %": threshold_colors(0, 0),
+        "Signal": value_colors({"Buy": "color: green", "Sell": "color: red"}, default="color: gray"),
+    },
+    default_sort="Market Cap (Cr)",
+    descending=True,
 )
 
-st.markdown(f"Showing **{filtered_df.shape[0]}** of **{df.shape[0]}** stocks.")
+st.markdown(f"Showing **{len(filtered_rows)}** of **{df.shape[0]}** stocks.")
 
 # -------------------------
 # Footer
@@ -4,8 +4,10 @@ import streamlit as st
 import pandas as pd
 import time
 import plotly.graph_objects as go
-from core.predictions import get_prediction_for_stock, get_prediction_summary
+from config.settings import FORECAST_MODEL, FORECAST_POLL_INTERVAL
+from core.predictions import MODELS, get_forecast_engine, historical_frame
 from core.search_bar import setup_stock_search_bar
+from core.symbol_picker import symbol_picker
 
 from core.logo import show_logo_sidebar_top  # Ensure logo function is defined properly
 
@@ -53,33 +55,78 @@ st.markdown("AI/ML-based stock price forecasting for key stocks and indexes.")
 # -------------------------
 # Stock Selector
 # -------------------------
-selected_stock = st.selectbox("📈 Choose a stock or index", ["RELIANCE", "INFY", "HDFCBANK", "ICICIBANK", "NIFTY 50"])
+selected_stock = symbol_picker("📈 Choose a stock or index", ["RELIANCE", "INFY", "HDFCBANK", "ICICIBANK", "NIFTY 50"], key="prediction_symbol")
 
-# -------------------------
-# Prediction Data
-# -------------------------
-historical_df, forecast_df = get_prediction_for_stock(selected_stock)
+if selected_stock is None:
+    st.info("Pick a stock to see its forecast.")
+    st.stop()
+
+model_names = list(MODELS)
+selected_model = st.selectbox(
+    "🧮 Model",
+    model_names,
+    index=model_names.index(FORECAST_MODEL),
+    format_func=lambda name: MODELS[name].label,
+    key="prediction_model",
+)
 
 # -------------------------
-# Line Chart
-# -------------------------
-st.subheader(f"📊 Predicted vs Historical Price - {selected_stock}")
+# Forecast (served from the engine's cache; refits run in the background and
+# this section re-renders on its own once they finish)
+# -------------------------
+@st.fragment(run_every=FORECAST_POLL_INTERVAL)
+def show_forecast(symbol, model):
+    engine = get_forecast_engine()
+    bars = engine.history(symbol)
+    if bars.empty:
+        st.warning(f"No price history available for {symbol}.")
+        return
+    if len(bars) < MODELS[model].min_bars:
+        st.warning(f"{MODELS[model].label} needs at least {MODELS[model].min_bars} daily bars; {symbol} has {len(bars)}.")
+        return
+    forecast, fresh = engine.get(symbol, model, bars=bars)
+    if forecast is None:
+        with st.spinner("Fitting model..."):
+            forecast, fresh = engine.get(symbol, model, bars=bars, wait=True)
+    if forecast is None:
+        st.warning(f"Could not fit {MODELS[model].label} to {symbol}'s price history.")
+        return
 
-fig = go.Figure()
-fig.add_trace(go.Scatter(x=historical_df['Date'], y=historical_df['Price'], name="Historical", mode="lines"))
-fig.add_trace(go.Scatter(x=forecast_df['Date'], y=forecast_df['Forecast'], name="Forecast", mode="lines", line=dict(dash='dash')))
-fig.update_layout(height=400, margin=dict(l=20, r=20, t=40, b=10))
-st.plotly_chart(fig, use_container_width=True)
+    historical_df = historical_frame(bars)
+    forecast_df = forecast.frame()
 
-# -------------------------
-# Prediction Summary Table
-# -------------------------
-st.subheader("📋 Prediction Summary")
-summary_df = get_prediction_summary(selected_stock)
-st.dataframe(summary_df, use_container_width=True)
+    # -------------------------
+    # Line Chart
+    # -------------------------
+    st.subheader(f"📊 Predicted vs Historical Price - {symbol}")
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=historical_df['Date'], y=historical_df['Price'], name="Historical", mode="lines"))
+    fig.add_trace(go.Scatter(
+        x=list(forecast_df['Date']) + list(forecast_df['Date'][::-1]),
+        y=list(forecast_df['Upper']) + list(forecast_df['Lower'][::-1]),
+        fill="toself", fillcolor="rgba(99, 110, 250, 0.15)", line=dict(width=0),
+        name="95% band", hoverinfo="skip",
+    ))
+    fig.add_trace(go.Scatter(x=forecast_df['Date'], y=forecast_df['Forecast'], name="Forecast", mode="lines", line=dict(dash='dash')))
+    fig.update_layout(height=400, margin=dict(l=20, r=20, t=40, b=10))
+    st.plotly_chart(fig, use_container_width=True)
+
+    if fresh:
+        st.caption(f"Fitted {'incrementally' if forecast.warm_started else 'from scratch'} in {forecast.fit_seconds * 1000:.0f} ms")
+    else:
+        st.caption("⏳ Showing the previous forecast while the model refits on the latest bar...")
+
+    # -------------------------
+    # Prediction Summary Table
+    # -------------------------
+    st.subheader("📋 Prediction Summary")
+    st.dataframe(forecast.summary(), use_container_width=True, hide_index=True)
+
+show_forecast(selected_stock, selected_model)
 
 # -------------------------
 # Footer
 # -------------------------
 st.markdown("---")
-st.caption("Predictions are generated using mock models. You can replace with real ML models (e.g., LSTM, Prophet).")
+st.caption("Statistical forecasts from daily closes, for information only. Bands show the 95% range of past one-step errors.")
@@ -4,7 +4,14 @@ import streamlit as st
 import pandas as pd
 import time
 import plotly.express as px
-from core.sentiment import get_overall_sentiment, get_sentiment_trends, get_trending_keywords
+from core.sentiment import (
+    get_overall_sentiment,
+    get_scored_headlines,
+    get_sentiment_trends,
+    get_symbol_sentiment_table,
+    get_window_sentiment,
+)
+from core.trending import get_trending_keywords
 
 from core.logo import show_logo_sidebar_top  # Ensure logo function is defined properly
 from core.search_bar import setup_stock_search_bar
@@ -45,24 +52,68 @@ setup_stock_search_bar(location="sidebar", show_history=True)
 # -------------------------
 st.set_page_config(page_title="Sentiment Analysis | IndexIQ", layout="wide")
 st.title("🧠 Sentiment Analysis")
-st.markdown("Live market sentiment from social media and financial news.")
+st.markdown("Live market sentiment scored from the stored financial news feed.")
 
 # -------------------------
 # Overall Sentiment Summary
 # -------------------------
 sentiment_score, sentiment_label = get_overall_sentiment()
 
-st.metric(label="Overall Market Sentiment", value=f"{sentiment_score}%", delta=sentiment_label)
+st.metric(
+    label="Overall Market Sentiment",
+    value=f"{sentiment_score}%",
+    delta=sentiment_label,
+    delta_color={"Bullish": "normal", "Bearish": "inverse"}.get(sentiment_label, "off"),
+)
+
+# -------------------------
+# Sentiment by Symbol
+# -------------------------
+st.subheader("🏷️ Sentiment by Symbol")
+
+symbol_table = get_symbol_sentiment_table()
+if symbol_table.empty:
+    st.info("No scored stories yet, waiting for the news feed...")
+else:
+    st.dataframe(
+        symbol_table[["symbol", "percent", "label", "articles", "bullish_pct", "bearish_pct"]].rename(columns={
+            "symbol": "Symbol", "percent": "Sentiment (%)", "label": "Mood", "articles": "Stories",
+            "bullish_pct": "Bullish %", "bearish_pct": "Bearish %",
+        }).round(1),
+        hide_index=True,
+        use_container_width=True,
+    )
 
 # -------------------------
-# Sentiment Trend (Mock Data from NLP or API)
+# Sentiment Trend
 # -------------------------
 st.subheader("📊 Sentiment Over Time")
 
-trend_data = get_sentiment_trends()
+# Period -> (window, rollup resolution); charts read pre-aggregated buckets, never raw scores
+TREND_RANGES = {
+    "Last 24 hours": ("1D", "1h"),
+    "Last 7 days": ("7D", "1D"),
+    "Last 30 days": ("30D", "1D"),
+    "Last 90 days": ("90D", "1D"),
+}
+range_col, scope_col = st.columns(2)
+trend_range = range_col.selectbox("Period", list(TREND_RANGES), index=1, key="sentiment_range")
+trend_scope = scope_col.selectbox("Scope", ["Market"] + list(symbol_table["symbol"]), key="sentiment_scope")
+window, resolution = TREND_RANGES[trend_range]
+scope_symbol = None if trend_scope == "Market" else trend_scope
+
+trend_data = get_sentiment_trends(window, resolution, symbol=scope_symbol).dropna(subset=["Sentiment Score"])
+period_summary = get_window_sentiment(window, symbol=scope_symbol)
+st.caption(
+    f"{trend_scope} · {trend_range.lower()}: {period_summary['percent']}% {period_summary['label']} "
+    f"from {period_summary['articles']} stories"
+)
 
-fig = px.line(trend_data, x="Date", y="Sentiment Score", title="7-Day Sentiment Trend", markers=True)
-fig.update_layout(margin=dict(l=20, r=20, t=40, b=10), height=350)
+fig = px.line(
+    trend_data, x="Date", y="Sentiment Score", hover_data=["Stories"],
+    title=f"{trend_scope} Sentiment Trend ({trend_range})", markers=True,
+)
+fig.update_layout(margin=dict(l=20, r=20, t=40, b=10), height=350, yaxis_range=[0, 100])
 st.plotly_chart(fig, use_container_width=True)
 
 # -------------------------
@@ -70,23 +121,26 @@ st.plotly_chart(fig, use_container_width=True)
 # -------------------------
 st.subheader("🔥 Trending Financial Keywords")
 
-keywords = get_trending_keywords()
-
-st.markdown(
-    " ".join([f"`{kw}`" for kw in keywords])
-)
+hour_col, day_col = st.columns(2)
+for column, window, label in ((hour_col, "hour", "Last hour"), (day_col, "day", "Last day")):
+    with column:
+        st.write(f"**{label}**")
+        keywords = get_trending_keywords(window, 10)
+        if keywords:
+            st.markdown(" ".join([f"`{kw}`" for kw in keywords]))
+        else:
+            st.caption("No recent stories")
 
 # -------------------------
 # Example Tweets / Headlines (Optional Section)
 # -------------------------
-with st.expander("📰 Sample News & Tweets"):
-    st.write("- \"Markets expected to rebound as earnings season starts.\"")
-    st.write("- \"Retail investors showing strong bullish behavior this week.\"")
-    st.write("- \"Volatility spikes as FIIs exit positions.\"")
+with st.expander("📰 Latest Scored Headlines"):
+    for headline in get_scored_headlines(10):
+        st.write(f"- {headline['title']} ({headline['source']}) · **{headline['label']}** {headline['percent']}%")
 
 # -------------------------
 # Footer
 # -------------------------
 st.markdown("---")
-st.caption("Sentiment data is AI-processed from real-time sources like news, Reddit, Twitter.")
+st.caption("Sentiment is scored with a financial word lexicon over the ingested news feeds.")
 
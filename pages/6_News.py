@@ -2,7 +2,8 @@
 
 import streamlit as st
 import time
-from core.news import get_latest_news
+from config.settings import NEWS_PAGE_REFRESH_INTERVAL, NEWS_PAGE_SIZE
+from core.news import get_latest_news, get_news_ingestor, get_news_store, search_news
 
 from core.logo import show_logo_sidebar_top  # Ensure logo function is defined properly
 from core.search_bar import setup_stock_search_bar
@@ -49,10 +50,30 @@ st.markdown("Stay updated with real-time financial and stock market headlines.")
 # -------------------------
 # News Section
 # -------------------------
-news_items = get_latest_news()
+# The background ingestor polls the feeds; this page only reads the store
+ingestor = get_news_ingestor()
+search_col, symbol_col = st.columns([3, 1])
+query = search_col.text_input("Search news", key="news_query", placeholder="e.g. rate cut, Infosys guidance")
+symbol = symbol_col.selectbox("Filter by symbol", ["All"] + get_news_store().symbols(), key="news_symbol")
 
-for article in news_items:
-    st.markdown(f"### [{article['title']}]({article['url']})")
-    st.markdown(f"**Source:** {article['source']} &nbsp; | &nbsp; 🕒 {article['published']}")
-    st.markdown(article["summary"])
-    st.markdown("---")
+@st.fragment(run_every=NEWS_PAGE_REFRESH_INTERVAL)
+def show_news(query, symbol):
+    symbol = None if symbol == "All" else symbol
+    if query.strip():
+        news_items = search_news(query, NEWS_PAGE_SIZE, symbol=symbol)
+    else:
+        news_items = get_latest_news(NEWS_PAGE_SIZE, symbol=symbol)
+    if ingestor.last_poll is not None:
+        st.caption(f"{len(ingestor.store)} stories · feeds last polled {ingestor.last_poll:%H:%M:%S}")
+    if not news_items:
+        st.info("No matching stories." if query.strip() else "No stories yet, waiting for the first feed poll...")
+
+    for article in news_items:
+        st.markdown(f"### [{article['title']}]({article['url']})")
+        st.markdown(f"**Source:** {article['source']} &nbsp; | &nbsp; 🕒 {article['published']}")
+        if article["also"]:
+            st.caption(f"Also reported by {', '.join(article['also'])}")
+        st.markdown(article["summary"])
+        st.markdown("---")
+
+show_news(query, symbol)
@@ -6,6 +6,7 @@ from core.trading import place_order, get_holdings, get_trade_history
 
 from core.logo import show_logo_sidebar_top  # Ensure logo function is defined properly
 from core.search_bar import setup_stock_search_bar
+from core.symbol_picker import symbol_picker
 
 # Show Logo at Top of Sidebar
 show_logo_sidebar_top()
@@ -54,7 +55,7 @@ st.subheader("🛒 Place an Order")
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    symbol = st.selectbox("Select Stock", ["RELIANCE", "TCS", "INFY", "SBIN", "ICICIBANK", "NIFTY 50"])
+    symbol = symbol_picker("Select Stock", ["RELIANCE", "TCS", "INFY", "SBIN", "ICICIBANK", "NIFTY 50"], key="trade_symbol")
 with col2:
     action = st.radio("Action", ["Buy", "Sell"], horizontal=True)
 with col3:
@@ -62,7 +63,7 @@ with col3:
 
 price = st.number_input("Price (₹)", min_value=1.0, value=1000.0, step=0.5)
 
-if st.button("🚀 Execute Order"):
+if st.button("🚀 Execute Order", disabled=symbol is None):
     result = place_order(symbol, action, quantity, price)
     st.success(result)
 